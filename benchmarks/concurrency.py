@@ -0,0 +1,166 @@
+"""
+Runs greenlets that read and write items at the same time against SQLite.
+
+Every profile gets a fresh database in a temporary directory, filled with
+generated items. Each greenlet then runs a mix of reads (listing pages and
+fetching items) and writes (adding items, renaming items and editing a
+template). Writes yield to the other greenlets between flushing and
+committing, like handlers that emit socket messages or read tags while their
+session is open.
+
+"plain" is the engine without any options, "tuned" applies the engine options
+and SQLite settings from metatube/engine.py. Both wait the same busy timeout.
+
+The plain engine takes minutes with many greenlets, as every locked write
+blocks all greenlets for up to the busy timeout.
+
+Usage: python benchmarks/concurrency.py [greenlets, default 1,4,16] [operations per greenlet, default 50] [busy timeout in ms, default 1000]
+"""
+
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gevent
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from metatube import create_app, db
+from metatube.database import Database, Templates
+
+ITEMS = 10000
+WRITE_RATIO = 0.2
+
+FILL = """
+WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count)
+INSERT INTO "database" (filepath, name, artist, album, length, cover)
+SELECT '/music/' || i || '.mp3', 'Song ' || i, 'Artist ' || (i % 100),
+    'Album ' || (i % 800), 200, ''
+FROM n
+"""
+
+
+class BenchConfig(Config):
+    TESTING = True
+    INIT_DB = False
+    LOG_LEVEL = 40
+
+
+def read(count) -> None:
+    if random.random() < 0.5:
+        Database.page("name", limit=50)
+    else:
+        Database.fetch_item(random.randint(1, count))
+
+
+def write(count, number) -> None:
+    kind = random.random()
+    if kind < 0.5:
+        item = Database(filepath=f"/new/{number}.mp3", name="New", cover="")
+        db.session.add(item)
+    elif kind < 0.8:
+        Database.fetch_item(random.randint(1, count)).name = f"Renamed {number}"
+    else:
+        Templates.fetch_template(0).output_name = f"%(title)s {number}.%(ext)s"
+    db.session.flush()
+    # Other greenlets run while the transaction is open
+    gevent.sleep(0.001)
+    db.session.commit()
+
+
+def worker(app, count, operations, number, results) -> None:
+    with app.app_context():
+        for i in range(operations):
+            writing = random.random() < WRITE_RATIO
+            start = time.perf_counter()
+            try:
+                if writing:
+                    write(count, f"{number}-{i}")
+                else:
+                    read(count)
+            except OperationalError:
+                db.session.rollback()
+                results["errors"] += 1
+                continue
+            results["writes" if writing else "reads"].append(
+                time.perf_counter() - start
+            )
+        db.session.remove()
+
+
+def fill(count) -> None:
+    db.session.execute(text(FILL), {"count": count})
+    db.session.add(
+        Templates(id=0, name="Default", type="Audio", output_name="%(title)s")
+    )
+    db.session.commit()
+
+
+def percentile(timings, fraction) -> float:
+    if len(timings) < 1:
+        return 0.0
+    return sorted(timings)[int(len(timings) * fraction)] * 1000
+
+
+def run(profile, greenlets, operations, busy_timeout) -> None:
+    directory = tempfile.mkdtemp()
+    BenchConfig.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(
+        directory, "bench.db"
+    )
+    BenchConfig.DATABASE_TUNING = profile == "tuned"
+    BenchConfig.DATABASE_BUSY_TIMEOUT = busy_timeout
+    plain = {"connect_args": {"timeout": busy_timeout / 1000}}
+    BenchConfig.SQLALCHEMY_ENGINE_OPTIONS = {} if profile == "tuned" else plain
+    app = create_app(BenchConfig)
+    random.seed(greenlets)
+    try:
+        with app.app_context():
+            db.create_all()
+            fill(ITEMS)
+            db.session.remove()
+        results = {"reads": [], "writes": [], "errors": 0}
+        start = time.perf_counter()
+        gevent.joinall(
+            [
+                gevent.spawn(worker, app, ITEMS, operations, number, results)
+                for number in range(greenlets)
+            ],
+            raise_error=True,
+        )
+        elapsed = time.perf_counter() - start
+        done = len(results["reads"]) + len(results["writes"])
+        print(
+            f"{profile:<8}{greenlets:>10}{done / elapsed:>10.0f}/s"
+            f"{statistics.median(results['reads'] or [0]) * 1000:>10.2f}ms"
+            f"{percentile(results['writes'], 0.5):>10.2f}ms"
+            f"{percentile(results['writes'], 0.95):>10.2f}ms"
+            f"{results['errors']:>8}"
+        )
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    counts = sys.argv[1] if len(sys.argv) > 1 else "1,4,16"
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    busy_timeout = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    print(
+        f"{'profile':<8}{'greenlets':>10}{'ops':>12}{'read p50':>12}"
+        f"{'write p50':>12}{'write p95':>12}{'locked':>8}"
+    )
+    for greenlets in counts.split(","):
+        for profile in ("plain", "tuned"):
+            run(profile, int(greenlets), operations, busy_timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Times the hot item lookups with and without the secondary indexes.
+
+Every size gets a fresh SQLite database in a temporary directory, filled with
+generated items. The queries are timed once without the ix_database_* indexes,
+which is what databases created before the indexes look like, and once more
+after creating them. The full-text index isn't used by these lookups, so it's
+dropped to speed up filling the table.
+
+Usage: python benchmarks/lookups.py [sizes, default 10000,100000,1000000]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from config import Config
+from metatube import create_app, db
+from metatube.database import SEARCH_TABLE, Database
+
+INDEXES = ["audio_id", "name", "artist", "album", "date"]
+REPEAT = 20
+
+FILL = """
+WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count)
+INSERT INTO "database" (filepath, name, artist, album, date, length, cover, audio_id)
+SELECT
+    '/music/' || i || '.mp3',
+    'Song ' || hex(randomblob(4)),
+    'Artist ' || (abs(random()) % (:count / 10 + 1)),
+    'Album ' || (abs(random()) % (:count / 12 + 1)),
+    datetime('1960-01-01', '+' || (abs(random()) % 20000) || ' days'),
+    200,
+    '',
+    lower(hex(randomblob(16)))
+FROM n
+"""
+
+
+class BenchConfig(Config):
+    TESTING = True
+    INIT_DB = False
+    LOG_LEVEL = 40
+
+
+def fill(count) -> None:
+    db.session.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+    for trigger in ("insert", "delete", "update"):
+        db.session.execute(text(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{trigger}"))
+    db.session.execute(text(FILL), {"count": count})
+    db.session.commit()
+
+
+def set_indexes(enabled) -> float:
+    start = time.perf_counter()
+    for column in INDEXES:
+        if enabled:
+            statement = f'CREATE INDEX ix_database_{column} ON "database" ({column})'
+        else:
+            statement = f"DROP INDEX IF EXISTS ix_database_{column}"
+        db.session.execute(text(statement))
+    db.session.commit()
+    db.session.execute(text('ANALYZE "database"'))
+    return time.perf_counter() - start
+
+
+def queries(count) -> dict:
+    middle = db.session.get(Database, count // 2)
+    _, cursor = Database.page("name", None, count // 2)
+    return {
+        "check_trackid": lambda: Database.check_trackid(middle.audio_id),
+        "merge check (2 lookups)": lambda: (
+            Database.check_trackid(middle.audio_id),
+            Database.check_trackid("missing"),
+        ),
+        "merge check (check_trackids)": lambda: Database.check_trackids(
+            middle.audio_id, "missing"
+        ),
+        "album filter": lambda: Database.filter_records(album=middle.album),
+        "date range": lambda: Database.filter_records(
+            date_from=datetime(1990, 1, 1), date_to=datetime(1990, 12, 31)
+        ),
+        "page by name": lambda: Database.page("name", cursor),
+        "newest first": lambda: Database.page("-date"),
+    }
+
+
+def measure(query) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        query()
+        timings.append(time.perf_counter() - start)
+        db.session.expunge_all()
+    return statistics.median(timings) * 1000
+
+
+def run(count) -> None:
+    directory = tempfile.mkdtemp()
+    BenchConfig.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(
+        directory, "bench.db"
+    )
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            db.create_all()
+            start = time.perf_counter()
+            fill(count)
+            print(f"\n{count:,} items, filled in {time.perf_counter() - start:.1f}s")
+            set_indexes(False)
+            checks = queries(count)
+            before = {name: measure(query) for name, query in checks.items()}
+            print(f"Indexes created in {set_indexes(True):.2f}s")
+            print(f"{'query':<30}{'before':>12}{'after':>12}")
+            for name, query in checks.items():
+                after = measure(query)
+                print(f"{name:<30}{before[name]:>10.2f}ms{after:>10.2f}ms")
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    sizes = sys.argv[1] if len(sys.argv) > 1 else "10000,100000,1000000"
+    for count in sizes.split(","):
+        run(int(count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Compares the bytes written by the old two-save tag writer with TagWriter.
+
+Fixtures are generated with FFmpeg (taken from $FFMPEG or the PATH). Every file
+is tagged twice: once fresh from FFmpeg and once more with the same tags, which
+is what editing an existing item looks like. Bytes written are read from the
+`wchar` counter in /proc/self/io, so this only runs on Linux. Mutagen moves data
+with plain read()/write() calls, so every rewritten byte shows up there.
+
+Usage: python benchmarks/tag_writes.py [seconds of audio, default 60]
+"""
+
+import base64
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mutagen.easyid3 import EasyID3
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import APIC, ID3
+from mutagen.oggopus import OggOpus
+from mutagen.oggvorbis import OggVorbis
+
+from metatube.cover import Cover
+from metatube.tagwriter import TagWriter
+from metatube.track import TrackMetadata
+
+FORMATS = {
+    "MP3": ["-c:a", "libmp3lame", "-b:a", "192k"],
+    "FLAC": ["-c:a", "flac"],
+    "OGG": ["-c:a", "libvorbis"],
+    "OPUS": ["-c:a", "libopus"],
+    "M4A": ["-c:a", "aac"],
+}
+
+
+def bytes_written():
+    with open("/proc/self/io") as file:
+        for line in file:
+            if line.startswith("wchar:"):
+                return int(line.split()[1])
+    return 0
+
+
+def legacy_write(data):
+    """The tag writer as it was before TagWriter: text tags and cover saved separately."""
+    filename = data["filename"]
+    if data["extension"] == "MP3":
+        audio = EasyID3(filename)
+    elif data["extension"] == "FLAC":
+        audio = FLAC(filename)
+    elif data["extension"] == "OPUS":
+        audio = OggOpus(filename)
+    elif data["extension"] == "OGG":
+        audio = OggVorbis(filename)
+    else:
+        return TagWriter.write(data)
+    audio["album"] = data["album"]
+    audio["artist"] = data["artists"]
+    audio["barcode"] = data["barcode"]
+    audio["language"] = data["language"]
+    audio["tracknumber"] = str(data["tracknr"])
+    audio["title"] = data["title"]
+    audio["date"] = data["release_date"]
+    audio["genre"] = data["genres"]
+    audio.save()
+
+    if data["extension"] == "MP3":
+        cover = ID3(filename)
+        cover["APIC"] = APIC(
+            encoding=3, mime=data["cover_mime_type"], type=3, desc="Cover", data=data["image"]
+        )
+        cover.save()
+    else:
+        cover = Picture()
+        cover.data = data["image"]
+        cover.type = 3
+        cover.mime = data["cover_mime_type"]
+        cover.desc = "Front cover"
+        if data["extension"] == "FLAC":
+            # The old writer added the picture after saving and never saved again
+            audio.add_picture(cover)
+        else:
+            audio["metadata_block_picture"] = [
+                base64.b64encode(cover.write()).decode("ascii")
+            ]
+            audio.save()
+
+
+def make_fixtures(ffmpeg, directory, seconds):
+    fixtures = {}
+    cover = os.path.join(directory, "cover.jpg")
+    subprocess.run(
+        [ffmpeg, "-y", "-v", "error", "-f", "lavfi", "-i", "testsrc=size=1000x1000",
+         "-frames:v", "1", "-q:v", "2", cover],
+        check=True,
+    )
+    for extension, codec in FORMATS.items():
+        path = os.path.join(directory, "fixture." + extension.lower())
+        subprocess.run(
+            [ffmpeg, "-y", "-v", "error", "-f", "lavfi", "-i",
+             f"sine=frequency=440:duration={seconds}", *codec, path],
+            check=True,
+        )
+        fixtures[extension] = path
+    with open(cover, "rb") as file:
+        return fixtures, file.read()
+
+
+def tag_data(filename, extension, image):
+    return {
+        "filename": filename,
+        "extension": extension,
+        "album": "Whenever You Need Somebody",
+        "artists": ["Rick Astley"],
+        "barcode": "",
+        "language": "eng",
+        "tracknr": "1",
+        "total_tracks": "10",
+        "title": "Never Gonna Give You Up",
+        "release_date": "1987-11-12",
+        "genres": "Pop",
+        "isrc": "GBARL9300135",
+        "source": "Spotify",
+        "track_id": "4cOdK2wGLETKBW3PvgPWqT",
+        "album_id": "6N9PS4QXF1D0OWPk0Sxtb4",
+        "cover_mime_type": "image/jpeg",
+        "image": image,
+    }
+
+
+def typed_write(data):
+    cover = Cover(data["filename"], data["image"], data["cover_mime_type"])
+    return TagWriter.write(TrackMetadata.from_dict(data, cover=cover))
+
+
+def measure(writer, fixture, extension, image):
+    path = fixture + ".work"
+    shutil.copyfile(fixture, path)
+    results = []
+    for _ in range(2):
+        before = bytes_written()
+        writer(tag_data(path, extension, image))
+        results.append(bytes_written() - before)
+    os.unlink(path)
+    return os.path.getsize(fixture), results
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    ffmpeg = os.environ.get("FFMPEG") or shutil.which("ffmpeg")
+    if ffmpeg is None:
+        sys.exit("FFmpeg is required to generate the fixtures")
+    directory = tempfile.mkdtemp()
+    try:
+        fixtures, image = make_fixtures(ffmpeg, directory, seconds)
+        print(f"Cover: {len(image) / 1024:.0f} KiB, {seconds}s of audio per fixture\n")
+        print(f"{'format':<7}{'file':>10}{'old first':>12}{'new first':>12}{'old again':>12}{'new again':>12}")
+        for extension, path in fixtures.items():
+            size, old = measure(legacy_write, path, extension, image)
+            _, new = measure(typed_write, path, extension, image)
+            print(
+                f"{extension:<7}{size / 1024:>8.0f}Ki"
+                + "".join(f"{value / 1024:>10.0f}Ki" for value in (old[0], new[0], old[1], new[1]))
+            )
+        print(
+            "\nThe old writer added the FLAC picture after saving and never saved it,"
+            " so its FLAC numbers leave out the cover."
+        )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
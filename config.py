@@ -17,6 +17,12 @@ class Config(object):
         "DATABASE_URL", "sqlite:///" + os.path.join(basedir, "metatube/app.db")
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DATABASE_TUNING = os.environ.get("DATABASE_TUNING", True)
+    DATABASE_BUSY_TIMEOUT = os.environ.get("DATABASE_BUSY_TIMEOUT", 5000)
+    DATABASE_MMAP_SIZE = os.environ.get("DATABASE_MMAP_SIZE", 256 * 1024 * 1024)
+    DATABASE_POOL_SIZE = os.environ.get("DATABASE_POOL_SIZE", 10)
+    DATABASE_POOL_TIMEOUT = os.environ.get("DATABASE_POOL_TIMEOUT", 30)
+    DATABASE_POOL_RECYCLE = os.environ.get("DATABASE_POOL_RECYCLE", 1800)
     TEMPLATES_AUTO_RELOAD = True
     FLASK_DEBUG = False
     FLASK_ENV = "production"
@@ -32,4 +38,29 @@ class Config(object):
     VIDEO_EXTENSIONS = ["MP4", "M4A", "FLV", "WEBM", "OGG", "MKV", "AVI"]
     AUDIO_EXTENSIONS = ["AAC", "FLAC", "MP3", "M4A", "OPUS", "VORBIS", "WAV"]
     INIT_DB = os.environ.get("INIT_DB", True)
+    METADATA_TIMEOUT = os.environ.get("METADATA_TIMEOUT", 10)
+    METADATA_BREAKER_THRESHOLD = os.environ.get("METADATA_BREAKER_THRESHOLD", 3)
+    METADATA_BREAKER_RESET = os.environ.get("METADATA_BREAKER_RESET", 60)
+    TAG_CACHE_SIZE = os.environ.get("TAG_CACHE_SIZE", 512)
+    TAG_READ_WORKERS = os.environ.get("TAG_READ_WORKERS", 4)
+    TAG_WRITE_WORKERS = os.environ.get("TAG_WRITE_WORKERS", 4)
+    AUTO_MATCH_THRESHOLD = os.environ.get("AUTO_MATCH_THRESHOLD", 0.85)
+    AUTO_MATCH_CONCURRENCY = os.environ.get("AUTO_MATCH_CONCURRENCY", 4)
+    AUTO_MATCH_REVIEW_SIZE = os.environ.get("AUTO_MATCH_REVIEW_SIZE", 500)
+    COVER_MAX_SIZE = os.environ.get("COVER_MAX_SIZE", 1200)
+    COVER_QUALITY = os.environ.get("COVER_QUALITY", 90)
+    COVER_CACHE_SIZE = os.environ.get("COVER_CACHE_SIZE", 64)
+    COVER_CACHE_BYTES = os.environ.get("COVER_CACHE_BYTES", 32 * 1024 * 1024)
+    REFRESH_RATES = os.environ.get(
+        "REFRESH_RATES", "deezer:5;spotify:5;musicbrainz:1;genius:2"
+    )
+    REFRESH_BATCH_SIZE = os.environ.get("REFRESH_BATCH_SIZE", 50)
+    REFRESH_CONCURRENCY = os.environ.get("REFRESH_CONCURRENCY", 4)
+    SCAN_ROOTS = os.environ.get("SCAN_ROOTS", "")
+    WATCH_FILES = os.environ.get("WATCH_FILES", True)
+    WATCH_POLL_INTERVAL = os.environ.get("WATCH_POLL_INTERVAL", 30)
+    WATCH_FLUSH_INTERVAL = os.environ.get("WATCH_FLUSH_INTERVAL", 1)
+    MEDIA_URL_MAX_AGE = os.environ.get("MEDIA_URL_MAX_AGE", 21600)
+    USE_X_SENDFILE = os.environ.get("USE_X_SENDFILE", False)
+    ITEMS_PAGE_SIZE = os.environ.get("ITEMS_PAGE_SIZE", 50)
     TESTING = False
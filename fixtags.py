@@ -0,0 +1,202 @@
+"""
+Normalizes the tags of all audio files below one or more directories.
+
+Directories are walked recursively, tags are read on a pool of threads and
+only files whose tags actually change are saved. This script deliberately
+doesn't import the metatube package, which monkey-patches the standard
+library for gevent as soon as it's imported.
+
+Usage: python fixtags.py [--fix artists whitespace tracknumber] [--dry-run]
+                         [--report report.json] [--workers 8] directory [...]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from mutagen.easyid3 import EasyID3
+from mutagen.flac import FLAC
+from mutagen.id3 import ID3NoHeaderError
+from mutagen.oggopus import OggOpus
+from mutagen.oggvorbis import OggVorbis
+
+FILETYPES = {"MP3": EasyID3, "OPUS": OggOpus, "FLAC": FLAC, "OGG": OggVorbis}
+
+# Tags that can hold several people, which used to be written as one "a; b" value
+PEOPLE_KEYS = ("artist", "albumartist")
+
+TRACKNUMBER = re.compile(r"^\s*0*(\d+)(?:\.0+)?\s*(?:/\s*0*(\d+)(?:\.0+)?)?\s*$")
+
+
+def split_artists(tags) -> dict:
+    """Splits artists stored as one 'artist 1; artist 2' value into separate values."""
+    changes = {}
+    for key in PEOPLE_KEYS:
+        values = tags.get(key, [])
+        if any("; " in value for value in values):
+            changes[key] = [
+                artist for value in values for artist in value.split("; ") if artist
+            ]
+    return changes
+
+
+def trim_whitespace(tags) -> dict:
+    """Strips whitespace around every value and drops values that are empty."""
+    changes = {}
+    for key, values in tags.items():
+        trimmed = [value.strip() for value in values if value.strip()]
+        if trimmed != values and len(trimmed) > 0:
+            changes[key] = trimmed
+    return changes
+
+
+def fix_tracknumber(tags) -> dict:
+    """Rewrites track numbers like '03', '3.0' or ' 3 / 12' as '3' or '3/12'."""
+    values = tags.get("tracknumber", [])
+    if len(values) != 1:
+        return {}
+    match = TRACKNUMBER.match(values[0])
+    if match is None:
+        return {}
+    number, total = match.groups()
+    fixed = number if total is None else f"{number}/{total}"
+    return {"tracknumber": [fixed]} if fixed != values[0] else {}
+
+
+FIXES = {
+    "artists": split_artists,
+    "whitespace": trim_whitespace,
+    "tracknumber": fix_tracknumber,
+}
+
+
+def walk(directory):
+    """Yields the paths of all supported files below a directory, recursively."""
+    try:
+        entries = list(os.scandir(directory))
+    except OSError as e:
+        print(f"Can't read {directory}: {e}", file=sys.stderr)
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk(entry.path)
+        elif entry.is_file() and extension(entry.name) in FILETYPES:
+            yield entry.path
+
+
+def extension(filename) -> str:
+    return filename.split(".")[-1].upper()
+
+
+def plan(tags, fixes) -> dict:
+    """Applies the fixes in order and returns the new values of every tag that changes."""
+    current = {key: list(values) for key, values in tags.items()}
+    changes = {}
+    for fix in fixes:
+        for key, values in fix(current).items():
+            current[key] = values
+            changes[key] = values
+    return {key: values for key, values in changes.items() if values != tags.get(key)}
+
+
+def fix_file(path, fixes, dry_run=False) -> dict:
+    """Reads a file, works out what changes and saves it only if something does."""
+    result = {"path": path, "changes": {}, "saved": False}
+    try:
+        audio = FILETYPES[extension(path)](path)
+    except ID3NoHeaderError:
+        return result
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+    tags = {key: list(audio[key]) for key in audio.keys()}
+    changes = plan(tags, fixes)
+    if len(changes) < 1:
+        return result
+    result["changes"] = {key: [tags.get(key), values] for key, values in changes.items()}
+    if not dry_run:
+        try:
+            for key, values in changes.items():
+                audio[key] = values
+            audio.save()
+            result["saved"] = True
+        except Exception as e:
+            result["error"] = str(e)
+    return result
+
+
+def run(directories, fixes, dry_run=False, workers=8, verbose=True) -> dict:
+    paths = [path for directory in directories for path in walk(directory)]
+    report = {"scanned": len(paths), "changed": 0, "saved": 0, "errors": 0, "files": []}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(lambda path: fix_file(path, fixes, dry_run), paths):
+            if "error" in result:
+                report["errors"] += 1
+                print(f"{result['path']}: {result['error']}", file=sys.stderr)
+            if len(result["changes"]) > 0:
+                report["changed"] += 1
+                report["saved"] += int(result["saved"])
+                if verbose:
+                    action = "Would fix" if dry_run else "Fixed"
+                    print(f"{action} {', '.join(result['changes'])} of {result['path']}")
+            if "error" in result or len(result["changes"]) > 0:
+                report["files"].append(result)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Normalize the tags of all audio files below a directory."
+    )
+    parser.add_argument("directories", nargs="+", help="directories to scan")
+    parser.add_argument(
+        "--fix",
+        nargs="+",
+        choices=list(FIXES),
+        default=list(FIXES),
+        help="normalizations to apply, all by default",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report what would change"
+    )
+    parser.add_argument(
+        "--report", help="write a JSON report to this file, or '-' for stdout"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="number of files read at the same time"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="only print the summary"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    fixes = [FIXES[name] for name in args.fix]
+    report = run(
+        args.directories,
+        fixes,
+        args.dry_run,
+        args.workers,
+        verbose=not args.quiet and args.report != "-",
+    )
+    if args.report == "-":
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        if args.report:
+            with open(args.report, "w") as file:
+                json.dump(report, file, indent=2)
+        print(
+            f"Scanned {report['scanned']} files: {report['changed']} "
+            f"{'need' if args.dry_run else 'needed'} fixing, {report['saved']} saved, "
+            f"{report['errors']} errors"
+        )
+    return 1 if report["errors"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,7 @@ console.setFormatter(fmt=log_format)
 logger = logging.Logger("default")
 logger.addHandler(console)
 
+from metatube import database, engine, typeahead, watcher
 from metatube.init import init as init_db
 from metatube.overview import bp as bp_overview
 from metatube.routes import error
@@ -40,6 +41,7 @@ def create_app(config_class=Config) -> Flask:
 
     app.config.from_object(config_class)
     app.config.update(FLASK_DEBUG=False, FLASK_ENV="production")
+    app.config.update(USE_X_SENDFILE=str2bool(str(app.config["USE_X_SENDFILE"])))
 
     app.register_error_handler(Exception, error)
 
@@ -51,8 +53,16 @@ def create_app(config_class=Config) -> Flask:
         logger if str2bool(str(app.config["SOCKET_LOG"])) == 1 else False
     )
 
+    tuning = str2bool(str(app.config["DATABASE_TUNING"]))
+    if tuning:
+        engine.configure(app)
     db.init_app(app)
-    migrate.init_app(app, db, compare_type=True, ping_interval=60)
+    if tuning:
+        with app.app_context():
+            engine.install(db.engine, app.config)
+    migrate.init_app(
+        app, db, compare_type=True, ping_interval=60, include_name=database.include_name
+    )
     socketio.init_app(
         app,
         json=json,
@@ -65,4 +75,9 @@ def create_app(config_class=Config) -> Flask:
     app.register_blueprint(bp_settings)
     if app.config.get("INIT_DB") is True:
         init_db(app)
+    if app.config["TESTING"] is False:
+        with app.app_context():
+            typeahead.build()
+            if str2bool(str(app.config["WATCH_FILES"])):
+                watcher.start()
     return app
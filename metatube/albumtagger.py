@@ -0,0 +1,152 @@
+import metatube.isrc as isrc_mapping
+import metatube.musicbrainz as musicbrainz
+from metatube import logger, sockets
+from metatube.cover import DEFAULT_COVER
+from metatube.database import Database
+from metatube.deezer import Deezer
+from metatube.fanout import normalize, similarity
+from metatube.metadata import MetaData
+from metatube.spotify import SpotifyMetadata as Spotify
+from metatube.tagwriter import TagWriter
+
+# Files scoring lower than this against every track of the album are left alone
+MATCH_THRESHOLD = 0.5
+
+
+class AlbumTagger:
+    """
+    Tags a set of library items with the tracks of one album.
+
+    The album is fetched with a single lookup, every item is matched onto one
+    of its tracks, the tags are written on a pool of native threads and all
+    database rows are updated in one transaction.
+    """
+
+    @staticmethod
+    def fetch(source, album_id, credentials=None):
+        """Returns the tracks of an album as TrackMetadata, in album order."""
+        if source == "Spotify":
+            spotify = Spotify(credentials[1], credentials[0])
+            return MetaData.get_spotify_album_data(spotify.fetch_album(album_id))
+        elif source == "Musicbrainz":
+            release = musicbrainz.search_id_release(album_id)
+            if isinstance(release, str):
+                raise LookupError(release)
+            cover = musicbrainz.front_cover(album_id) or DEFAULT_COVER
+            return MetaData.get_musicbrainz_album_data(release, cover)
+        elif source == "Deezer":
+            return MetaData.get_deezer_album_data(Deezer.search_album(album_id))
+        raise ValueError(f"Tagging albums from {source} is not supported")
+
+    @staticmethod
+    def score(track, item, tags) -> float:
+        """Scores how likely it is that an item is a recording of a track."""
+        tags = tags or {}
+        if len(track.isrc or "") > 0 and tags.get("isrc") == track.isrc:
+            return 2.0
+        title = normalize(track.title)
+        score = max(
+            similarity(track.title, tags.get("title")),
+            similarity(track.title, item.name),
+            # YouTube titles usually contain the track title next to the artist
+            0.9 if len(title) > 0 and title in normalize(item.name) else 0.0,
+        )
+        try:
+            if abs(float(track.length) - float(tags["length"])) <= 3:
+                score += 0.2
+        except (KeyError, TypeError, ValueError):
+            pass
+        return score
+
+    @staticmethod
+    def match(tracks, items, tags):
+        """
+        Assigns every item to at most one track, best scoring pairs first.
+
+        Returns the (track, item) pairs and the items that didn't match.
+        """
+        scores = sorted(
+            (
+                (AlbumTagger.score(track, item, tags.get(item.filepath)), i, j)
+                for i, track in enumerate(tracks)
+                for j, item in enumerate(items)
+            ),
+            reverse=True,
+        )
+        used_tracks, used_items, pairs = set(), set(), []
+        for score, i, j in scores:
+            if score < MATCH_THRESHOLD:
+                break
+            if i in used_tracks or j in used_items:
+                continue
+            used_tracks.add(i)
+            used_items.add(j)
+            pairs.append((tracks[i], items[j]))
+        unmatched = [item for j, item in enumerate(items) if j not in used_items]
+        return pairs, unmatched
+
+    @staticmethod
+    def tag(source, album_id, item_ids, credentials=None, workers=None):
+        try:
+            tracks = AlbumTagger.fetch(source, album_id, credentials)
+        except Exception as e:
+            logger.error("Fetching %s album %s failed: %s", source, album_id, str(e))
+            sockets.overview({"msg": f"{source} album not found!"})
+            return False
+        # Musicbrainz metadata is fetched by release, the other providers by track
+        isrc_mapping.remember(
+            source,
+            {
+                track.isrc: album_id if source == "Musicbrainz" else track.track_id
+                for track in tracks
+            },
+        )
+        items = [
+            item
+            for item in Database.fetch_items(item_ids)
+            if MetaData.can_tag(item.filepath)
+        ]
+        tags = MetaData.read_metadata_batch([item.filepath for item in items])
+        pairs, unmatched = AlbumTagger.match(tracks, items, tags)
+        if len(pairs) < 1:
+            sockets.overview({"msg": "None of the selected items match the album"})
+            return False
+
+        # All tracks of an album share one cover, which is loaded once up front
+        try:
+            for track, _ in pairs:
+                track.cover.load()
+        except Exception:
+            sockets.overview({"msg": "Cover URL is invalid!"})
+            return False
+        for track, item in pairs:
+            track.filename = item.filepath
+            track.extension = item.filepath.split(".")[-1].upper()
+            track.source = source
+            track.goal = "edit"
+            track.item_id = item.id
+
+        written = TagWriter.write_many([track for track, _ in pairs], workers)
+        updates = []
+        for (track, item), ok in zip(pairs, written, strict=True):
+            track.cover.release()
+            if not ok:
+                unmatched.append(item)
+                continue
+            updates.append((item, track.row()))
+        Database.update_many(updates)
+        logger.info(
+            "Tagged %d items with %s album %s, %d left unchanged",
+            len(updates),
+            source,
+            album_id,
+            len(unmatched),
+        )
+        if len(unmatched) > 0:
+            sockets.overview(
+                {
+                    "msg": "Couldn't tag "
+                    + ", ".join(str(item.name) for item in unmatched)
+                }
+            )
+        return True
@@ -0,0 +1,299 @@
+from collections import OrderedDict
+
+from gevent.pool import Pool
+
+import metatube.isrc as isrc_mapping
+import metatube.musicbrainz as musicbrainz
+from metatube import Config, logger, sockets
+from metatube.cover import DEFAULT_COVER
+from metatube.database import Database
+from metatube.fanout import MetadataSearch, candidate, normalize
+from metatube.metadata import NO_USERDATA, MetaData
+from metatube.tagwriter import TagWriter
+from metatube.tasks import bind
+
+# Weights of the signals a candidate is scored on; missing signals are left out
+WEIGHTS = {"title": 0.5, "artist": 0.3, "duration": 0.2}
+
+# A duration difference of this many seconds or more scores 0
+DURATION_TOLERANCE = 15.0
+
+# Items and downloads that scored below the threshold, waiting for someone to
+# pick a result. The oldest entries are dropped beyond AUTO_MATCH_REVIEW_SIZE.
+review_queue: OrderedDict = OrderedDict()
+
+
+def bigrams(text) -> set:
+    text = normalize(text)
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+class Query:
+    """
+    What is known about a file before it is matched.
+
+    Titles and artists are compared with the Dice coefficient of their
+    character bigrams, which is far cheaper than `difflib` and just as good
+    for short strings. The bigrams of the query are only computed once.
+    """
+
+    __slots__ = ("title", "artist", "duration", "isrc", "_title", "_artist")
+
+    def __init__(self, title, artist="", duration=None, isrc="") -> None:
+        self.title = title or ""
+        self.artist = artist or ""
+        self.duration = duration
+        self.isrc = isrc or ""
+        self._title = bigrams(self.title)
+        self._artist = bigrams(self.artist)
+
+    @staticmethod
+    def from_info(info) -> "Query":
+        """Builds a query from a yt-dlp info dict."""
+        title = info.get("track") or info.get("title", "")
+        artist = info.get("artist") or info.get("creator") or ""
+        if len(artist) < 1 and " - " in title:
+            # Most music videos are titled 'Artist - Title (Official Video)'
+            artist, title = title.split(" - ", 1)
+        if len(artist) < 1:
+            artist = info.get("uploader", "").removesuffix(" - Topic")
+        return Query(title, artist, info.get("duration"), info.get("isrc", ""))
+
+    @staticmethod
+    def from_item(item, tags) -> "Query":
+        """Builds a query from a library item and the tags of its file."""
+        tags = tags or {}
+        info = {
+            "track": tags.get("title"),
+            "title": item.name,
+            "artist": tags.get("artists"),
+            "duration": tags.get("length") or item.length,
+            "isrc": tags.get("isrc", ""),
+        }
+        return Query.from_info(info)
+
+    @staticmethod
+    def ratio(query, text, floor) -> float:
+        other = bigrams(text)
+        a, b = len(query), len(other)
+        # Two bigram sets can't share more bigrams than the smaller one has
+        if a + b == 0 or 2 * min(a, b) / (a + b) < floor:
+            return 0.0
+        return 2 * len(query & other) / (a + b)
+
+    def score(self, candidate, floor=0.0) -> float:
+        """
+        Scores a candidate between 0 and 1.
+
+        Candidates that can't reach `floor` may get a lower score than they
+        would otherwise, which saves computing the full ratios.
+        """
+        if len(self.isrc) > 0 and candidate.get("isrc") == self.isrc:
+            return 1.0
+        signals = {}
+        if len(self.artist) > 0:
+            artists = " ".join(candidate.get("artists") or [])
+            signals["artist"] = artists
+        duration = None
+        if self.duration and candidate.get("duration"):
+            delta = abs(float(self.duration) - float(candidate["duration"]))
+            duration = max(0.0, 1.0 - delta / DURATION_TOLERANCE)
+        total = WEIGHTS["title"] + (WEIGHTS["artist"] if "artist" in signals else 0)
+        total += WEIGHTS["duration"] if duration is not None else 0
+        # Title score needed to reach the floor if every other signal is perfect
+        title_floor = (floor * total - (total - WEIGHTS["title"])) / WEIGHTS["title"]
+        score = WEIGHTS["title"] * self.ratio(
+            self._title, candidate.get("title"), title_floor
+        )
+        if "artist" in signals:
+            score += WEIGHTS["artist"] * self.ratio(self._artist, signals["artist"], 0)
+        if duration is not None:
+            score += WEIGHTS["duration"] * duration
+        return round(score / total, 4)
+
+    def best(self, candidates):
+        """Returns the best scoring candidate and its score."""
+        best, best_score = None, 0.0
+        for item in candidates:
+            score = self.score(item, best_score)
+            if score > best_score:
+                best, best_score = item, score
+        return best, best_score
+
+
+class AutoMatch:
+    """
+    Matches library items and downloads onto provider results without user interaction.
+
+    Every item is searched for on all configured providers concurrently.
+    Matches scoring at least AUTO_MATCH_THRESHOLD are written to the files
+    and the database; the rest is put in the review queue. Downloads are
+    matched on the yt-dlp info of their video.
+    """
+
+    def __init__(self, sources, max_results, spotify_credentials=None) -> None:
+        # Genius has no track metadata to match on
+        self.sources = [source for source in sources.split(";") if source != "genius"]
+        self.max_results = max_results
+        self.spotify_credentials = spotify_credentials
+        self.threshold = float(Config.AUTO_MATCH_THRESHOLD)
+
+    def search(self, query):
+        data = {"title": query.title, "artist": query.artist, "max": self.max_results}
+        search = MetadataSearch(data, self.sources, self.spotify_credentials, emit=False)
+        return search.run()["results"]
+
+    def resolve(self, query):
+        """Looks the ISRC of the query up on the providers, without searching."""
+        for source in self.sources:
+            _id = isrc_mapping.resolve(
+                query.isrc, source.capitalize(), self.spotify_credentials
+            )
+            if _id is not None:
+                return candidate(source.capitalize(), _id, query.title, [query.artist])
+        return None
+
+    def find(self, query, name):
+        """Returns the candidates for a query, the best one and its score."""
+        if len(query.isrc) > 0:
+            best = self.resolve(query)
+            if best is not None:
+                return [best], best, 1.0
+        try:
+            candidates = self.search(query)
+        except Exception as e:
+            logger.error("Searching metadata for %s failed: %s", name, str(e))
+            candidates = []
+        best, score = query.best(candidates)
+        return candidates, best, score
+
+    def match(self, job):
+        item, query = job
+        return item, query, *self.find(query, item.name)
+
+    def build(self, filepath, best):
+        cover = best["cover"] or DEFAULT_COVER
+        if best["source"] == "Musicbrainz":
+            cover = musicbrainz.front_cover(best["id"]) or DEFAULT_COVER
+        track = MetaData.from_source(
+            best["source"],
+            filepath,
+            NO_USERDATA,
+            best["id"],
+            cover,
+            self.spotify_credentials,
+        )
+        if not track:
+            return None
+        track.extension = filepath.split(".")[-1].upper()
+        track.source = best["source"]
+        return track
+
+    def apply(self, filepath, best, score):
+        """Builds the track metadata of a confident match with its cover, or returns None."""
+        if best is None or score < self.threshold:
+            return None
+        try:
+            track = self.build(filepath, best)
+            if track is not None:
+                track.cover.load()
+            return track
+        except Exception as e:
+            logger.error("Fetching %s has failed: %s", best["id"], str(e))
+            return None
+
+    def run(self, items):
+        tags = MetaData.read_metadata_batch([item.filepath for item in items])
+        jobs = [(item, Query.from_item(item, tags.get(item.filepath))) for item in items]
+        pool = Pool(int(Config.AUTO_MATCH_CONCURRENCY))
+        # Resolving ISRCs and searching both use the ISRC mapping table
+        match = bind(self.match)
+        matched, review = [], []
+        for result in pool.imap_unordered(match, jobs):
+            item, query, candidates, best, score = result
+            track = self.apply(item.filepath, best, score)
+            if track is not None:
+                track.goal = "edit"
+                track.item_id = item.id
+                logger.info("Matched %s with %s (%.2f)", item.name, best["id"], score)
+                matched.append((track, result))
+            else:
+                review.append(AutoMatch.queue(*result))
+
+        written = TagWriter.write_many([track for track, _ in matched])
+        updates = []
+        for (track, result), ok in zip(matched, written, strict=True):
+            track.cover.release()
+            if ok:
+                review_queue.pop(result[0].id, None)
+                updates.append((result[0], track.row()))
+            else:
+                review.append(AutoMatch.queue(*result))
+        if len(updates) > 0:
+            Database.update_many(updates)
+        logger.info(
+            "Auto-matched %d of %d items, %d queued for review",
+            len(updates),
+            len(items),
+            len(review),
+        )
+        if len(review) > 0:
+            sockets.auto_match_review(review)
+        return updates, review
+
+    @staticmethod
+    def review(key, query, candidates, score, **fields) -> dict:
+        """Puts an entry in the review queue, dropping the oldest ones beyond its size."""
+        candidates = [
+            dict(candidate, score=query.score(candidate)) for candidate in candidates
+        ]
+        entry = {
+            **fields,
+            "query": {"title": query.title, "artist": query.artist},
+            "score": score,
+            "candidates": sorted(
+                candidates, key=lambda candidate: candidate["score"], reverse=True
+            )[:5],
+        }
+        review_queue.pop(key, None)
+        review_queue[key] = entry
+        while len(review_queue) > int(Config.AUTO_MATCH_REVIEW_SIZE):
+            review_queue.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def queue(item, query, candidates, best, score) -> dict:
+        return AutoMatch.review(item.id, query, candidates, score, item_id=item.id)
+
+    def download(self, filepath, info):
+        """Tags a finished download with its best match, or queues it for review."""
+        query = Query.from_info(info)
+        candidates, best, score = self.find(query, filepath)
+        track = self.apply(filepath, best, score)
+        if track is not None and Database.check_trackids(track.track_id) is not None:
+            logger.info("%s is in the library already", track.track_id)
+            track.cover.release()
+            track = None
+        if track is not None:
+            track.goal = "add"
+            logger.info("Matched %s with %s (%.2f)", filepath, best["id"], score)
+            if MetaData.merge(track):
+                return track
+        entry = AutoMatch.review(filepath, query, candidates, score, filepath=filepath)
+        sockets.auto_match_review([entry])
+        return None
+
+    @staticmethod
+    def match_download(filepath, info, sources, max_results, spotify_credentials=None):
+        return AutoMatch(sources, max_results, spotify_credentials).download(
+            filepath, info
+        )
+
+    @staticmethod
+    def match_items(item_ids, sources, max_results, spotify_credentials=None):
+        items = [
+            item
+            for item in Database.fetch_items(item_ids)
+            if MetaData.can_tag(item.filepath)
+        ]
+        return AutoMatch(sources, max_results, spotify_credentials).run(items)
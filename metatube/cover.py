@@ -0,0 +1,116 @@
+import os
+from io import BytesIO
+
+import gevent
+import requests
+
+from metatube import Config, logger, mime
+from metatube.cache import LRUCache
+from metatube.singleflight import coalesce
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+DEFAULT_COVER = os.path.join(Config.BASE_DIR, "metatube/static/images/empty_cover.png")
+
+# Normalized covers, keyed on their URL or path. Covers that couldn't be
+# normalized are cached as they are, so the cache is bounded in bytes as well.
+cover_cache = LRUCache(
+    Config.COVER_CACHE_SIZE,
+    maxbytes=Config.COVER_CACHE_BYTES,
+    sizeof=lambda cover: len(cover[0]),
+)
+
+
+def download(url):
+    response = requests.get(url)
+    image = response.content
+    return image, mime.from_buffer(image)
+
+
+def normalize(image, mime_type):
+    """
+    Scales a cover down to COVER_MAX_SIZE and re-encodes it as a JPEG of COVER_QUALITY.
+
+    Covers with transparency are only scaled down and stay PNGs. Covers that
+    already fit and are JPEGs are returned as they are, as is every cover if
+    Pillow isn't installed or normalization is disabled.
+    """
+    max_size = int(Config.COVER_MAX_SIZE)
+    if Image is None or max_size <= 0:
+        return image, mime_type
+    try:
+        picture = Image.open(BytesIO(image))
+        fits = max(picture.size) <= max_size
+        transparent = picture.has_transparency_data
+        if fits and (transparent or mime_type == "image/jpeg"):
+            return image, mime_type
+        picture.thumbnail((max_size, max_size), Image.LANCZOS)
+        output = BytesIO()
+        if transparent:
+            picture.save(output, "PNG", optimize=True)
+            normalized_type = "image/png"
+        else:
+            picture.convert("RGB").save(
+                output, "JPEG", quality=int(Config.COVER_QUALITY), optimize=True
+            )
+            normalized_type = "image/jpeg"
+    except Exception as e:
+        logger.warning("Normalizing cover failed, embedding it as is: %s", str(e))
+        return image, mime_type
+    normalized = output.getvalue()
+    if fits and len(normalized) >= len(image):
+        return image, mime_type
+    logger.debug("Normalized cover from %d to %d bytes", len(image), len(normalized))
+    return normalized, normalized_type
+
+
+@coalesce("cover")
+def load(path):
+    cover = cover_cache.get(path)
+    if cover is None:
+        if path == DEFAULT_COVER:
+            with open(path, "rb") as file:
+                cover = file.read(), "image/png"
+        else:
+            cover = download(path)
+        # Pillow releases the GIL while resizing and encoding
+        cover = gevent.get_hub().threadpool.apply(normalize, cover)
+        cover_cache.put(path, cover)
+    return cover
+
+
+class Cover:
+    """
+    Reference to a cover image that is only loaded when it is written to a file.
+
+    Holding the path instead of the image keeps track metadata small while it
+    is passed around; the bytes are fetched right before the tags are written
+    and can be released right after.
+    """
+
+    __slots__ = ("path", "_data", "_mime")
+
+    def __init__(self, path=DEFAULT_COVER, data=None, mime=None) -> None:
+        self.path = path or DEFAULT_COVER
+        self._data = data
+        self._mime = mime
+
+    def load(self) -> "Cover":
+        if self._data is None:
+            self._data, self._mime = load(self.path)
+        return self
+
+    @property
+    def data(self) -> bytes:
+        return self.load()._data  # type: ignore
+
+    @property
+    def mime(self) -> str:
+        return self.load()._mime  # type: ignore
+
+    def release(self) -> None:
+        self._data = None
+        self._mime = None
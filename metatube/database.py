@@ -1,9 +1,41 @@
+import base64
+import dataclasses
+import json
+import re
+from datetime import datetime
+
 from dateutil import parser
+from sqlalchemy import delete, event, insert, or_, select, text, tuple_, update
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.orm import Session, object_session
 from sqlalchemy.sql import expression
 
 from metatube import db, logger, sockets
 
 
+@dataclasses.dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable copy of the configuration row, see `Config.snapshot`."""
+
+    version: int
+    ffmpeg_directory: str | None = None
+    amount: int | None = None
+    hardware_transcoding: str | None = None
+    metadata_sources: str | None = None
+    spotify_api: str | None = None
+    genius_api: str | None = None
+    auth: bool | None = None
+    auth_username: str | None = None
+    auth_password: str | None = None
+
+
+# Key in a session's `info` set when it changed the configuration row
+CONFIG_CHANGED = "config_changed"
+config_snapshot: ConfigSnapshot | None = None
+# Bumped on every invalidation, a snapshot carries the version it was read at
+config_version = 1
+
+
 class Config(db.Model):
     key = db.Column(db.Integer, primary_key=True)
     ffmpeg_directory = db.Column(db.String(128))
@@ -21,14 +53,45 @@ class Config(db.Model):
         db.session.commit()
         logger.info("Set FFmpeg path to %s", ffmpeg_path)
 
+    @staticmethod
+    def snapshot() -> ConfigSnapshot:
+        """
+        Returns the settings as they were last committed.
+
+        The row is read once and the snapshot is shared until a commit changes
+        the row, which swaps in a new one with a higher version. Callers holding
+        the old snapshot keep a consistent copy of the settings.
+        """
+        global config_snapshot
+        snapshot = config_snapshot
+        if snapshot is not None:
+            return snapshot
+        version = config_version
+        row = db.session.get(Config, 1)
+        if row is None:
+            return ConfigSnapshot(version=0)
+        names = [field.name for field in dataclasses.fields(ConfigSnapshot)[1:]]
+        values = {name: getattr(row, name) for name in names}
+        snapshot = ConfigSnapshot(version=version, **values)
+        # Don't publish a row that was changed while it was being read
+        if version == config_version:
+            config_snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drops the snapshot, the next `snapshot()` reads the row again."""
+        global config_snapshot, config_version
+        config_version += 1
+        config_snapshot = None
+
     @staticmethod
     def get_ffmpeg():
-        # return db.session.get(Config, 1).ffmpeg_directory
-        return db.session.get(Config, 1).ffmpeg_directory  # type: ignore
+        return Config.snapshot().ffmpeg_directory
 
     @staticmethod
     def get_hwt():
-        return db.session.get(Config, 1).hardware_transcoding  # type: ignore
+        return Config.snapshot().hardware_transcoding
 
     def set_amount(self, amount):
         self.amount = int(amount)
@@ -57,19 +120,19 @@ class Config(db.Model):
 
     @staticmethod
     def get_metadata_sources():
-        return db.session.get(Config, 1).metadata_sources  # type: ignore
+        return Config.snapshot().metadata_sources
 
     @staticmethod
     def get_spotify():
-        return db.session.get(Config, 1).spotify_api  # type: ignore
+        return Config.snapshot().spotify_api
 
     @staticmethod
     def get_genius():
-        return db.session.get(Config, 1).genius_api  # type: ignore
+        return Config.snapshot().genius_api
 
     @staticmethod
     def get_max():
-        return db.session.get(Config, 1).amount  # type: ignore
+        return Config.snapshot().amount
 
 
 class Templates(db.Model):
@@ -165,21 +228,124 @@ class Templates(db.Model):
         logger.info("Edited template %s", data["name"])
 
 
+# Keys and columns of the paginated item listing
+LIST_SORTS = ("id", "name", "artist", "album", "date")
+LIST_FIELDS = (
+    "id",
+    "name",
+    "artist",
+    "album",
+    "date",
+    "length",
+    "filepath",
+    "cover",
+    "audio_id",
+    "youtube_id",
+)
+
+# SQLite full-text index of the items, kept in sync by triggers. The table
+# only stores the index; the text is read from the items table itself.
+SEARCH_TABLE = "database_fts"
+SEARCH_DDL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        name, artist, album, content='database', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert
+        AFTER INSERT ON "database" BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, artist, album)
+        VALUES (new.id, new.name, new.artist, new.album);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete
+        AFTER DELETE ON "database" BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, artist, album)
+        VALUES ('delete', old.id, old.name, old.artist, old.album);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update
+        AFTER UPDATE OF name, artist, album ON "database" BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, artist, album)
+        VALUES ('delete', old.id, old.name, old.artist, old.album);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, artist, album)
+        VALUES (new.id, new.name, new.artist, new.album);
+        END""",
+)
+# Names weigh more than artists, artists more than albums
+SEARCH_RANK = f"bm25({SEARCH_TABLE}, 10.0, 5.0, 2.0)"
+# Key of the items a session changed in its `info`, see `changed_items`
+CHANGED_ITEMS = "changed_items"
+# Rows per statement of the bulk operations
+CHUNK_SIZE = 500
+
+
 class Database(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filepath = db.Column(db.String(64), unique=True)
-    name = db.Column(db.String(64))
-    artist = db.Column(db.String(64))
-    album = db.Column(db.String(64))
-    date = db.Column(db.DateTime)
+    name = db.Column(db.String(64), index=True)
+    artist = db.Column(db.String(64), index=True)
+    album = db.Column(db.String(64), index=True)
+    date = db.Column(db.DateTime, index=True)
     length = db.Column(db.Integer)
     cover = db.Column(db.String(256))
-    audio_id = db.Column(db.String(128))
+    audio_id = db.Column(db.String(128), index=True)
     youtube_id = db.Column(db.String(16), unique=True)
 
     @staticmethod
-    def search_records(query):
-        return Database.query.filter(Database.name.like(query + "%")).all()
+    def search_records(query, limit=50):
+        """
+        Returns the items whose name, artist or album contain words starting
+        with every word of the query, best matches first.
+        """
+        words = re.findall(r"\w+", query)
+        if len(words) < 1:
+            return []
+        if db.engine.dialect.name == "sqlite":
+            match = " ".join(f'"{word}"*' for word in words)
+            statement = text(
+                f'SELECT "database".* FROM {SEARCH_TABLE} '
+                f'JOIN "database" ON "database".id = {SEARCH_TABLE}.rowid '
+                f"WHERE {SEARCH_TABLE} MATCH :match "
+                f"ORDER BY {SEARCH_RANK} LIMIT :limit"
+            )
+            try:
+                return (
+                    Database.query.from_statement(statement)
+                    .params(match=match, limit=limit)
+                    .all()
+                )
+            except OperationalError as e:
+                # SQLite without FTS5, or a database without the index
+                logger.debug("Full-text search is unavailable: %s", str(e))
+        query = Database.query
+        for word in words:
+            query = query.filter(
+                or_(
+                    Database.name.icontains(word, autoescape=True),
+                    Database.artist.icontains(word, autoescape=True),
+                    Database.album.icontains(word, autoescape=True),
+                )
+            )
+        return query.order_by(Database.name).limit(limit).all()
+
+    @staticmethod
+    def create_search_index(connection=None) -> bool:
+        """Creates the full-text index of the items on SQLite and fills a new one."""
+        connection = connection or db.session.connection()
+        if connection.dialect.name != "sqlite":
+            return False
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+            {"name": SEARCH_TABLE},
+        ).first()
+        try:
+            for statement in SEARCH_DDL:
+                connection.execute(text(statement))
+            if exists is None:
+                connection.execute(
+                    text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+                )
+        except OperationalError as e:
+            logger.warning("The search index can't be created: %s", str(e))
+            return False
+        return True
 
     @staticmethod
     def item_to_dict(item):
@@ -196,6 +362,16 @@ class Database(db.Model):
     def fetch_item(input_id):
         return Database.query.filter_by(id=input_id).first()
 
+    @staticmethod
+    def fetch_items(ids) -> list:
+        """Returns the items with the IDs in the same order, skipping missing ones."""
+        ids = [int(id) for id in ids]
+        found = {}
+        for i in range(0, len(ids), CHUNK_SIZE):
+            query = Database.query.filter(Database.id.in_(ids[i : i + CHUNK_SIZE]))
+            found.update((item.id, item) for item in query)
+        return [found[id] for id in ids if id in found]
+
     @staticmethod
     def check_file(filepath_input):
         return Database.query.filter_by(filepath=filepath_input).first()
@@ -208,6 +384,144 @@ class Database(db.Model):
     def check_trackid(release_id_input):
         return Database.query.filter_by(audio_id=release_id_input).first()
 
+    @staticmethod
+    def check_trackids(*release_ids):
+        """Returns an item with any of the release IDs, ignoring empty IDs."""
+        release_ids = [release_id for release_id in release_ids if release_id]
+        if len(release_ids) < 1:
+            return None
+        return Database.query.filter(Database.audio_id.in_(release_ids)).first()
+
+    @staticmethod
+    def filter_records(album=None, date_from=None, date_to=None, after_id=0, limit=50):
+        """Returns the next `limit` items after `after_id` in ID order, optionally filtered."""
+        query = Database.query.filter(Database.id > after_id)
+        if album:
+            query = query.filter(Database.album == album)
+        if date_from is not None:
+            query = query.filter(Database.date >= date_from)
+        if date_to is not None:
+            query = query.filter(Database.date <= date_to)
+        return query.order_by(Database.id).limit(limit).all()
+
+    @staticmethod
+    def encode_cursor(sort, value, id) -> str:
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        data = json.dumps([sort, value, id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(sort, cursor) -> tuple:
+        try:
+            key, value, id = json.loads(base64.urlsafe_b64decode(cursor))
+            if not isinstance(id, int) or isinstance(id, bool):
+                raise TypeError("the ID of a cursor is a number")
+            if key == sort and sort.lstrip("-") == "date" and value is not None:
+                value = datetime.fromisoformat(value)
+        except (ValueError, TypeError) as e:
+            raise ValueError("The cursor is invalid") from e
+        if key != sort:
+            raise ValueError("The cursor belongs to another sort order")
+        return value, id
+
+    @staticmethod
+    def page(sort="id", after=None, limit=50, fields=None) -> tuple:
+        """
+        Returns a page of items and the cursor of the next one, or None.
+
+        Pages are sorted by `sort`, descending when it starts with '-', and
+        the ID. The cursor holds the sort key of the last item, so a page is
+        a range of the column's index instead of skipping all items before
+        it. Items without a value come first, or last when descending, in ID
+        order. Only the requested columns are loaded.
+        """
+        key = sort.lstrip("-")
+        if key not in LIST_SORTS:
+            raise ValueError(f"Items can't be sorted by '{key}'")
+        descending = sort.startswith("-")
+        fields = list(fields or LIST_FIELDS)
+        for field in fields:
+            if field not in LIST_FIELDS:
+                raise ValueError(f"'{field}' isn't a field of items")
+        column = getattr(Database, key)
+        columns = [getattr(Database, field) for field in fields if field != "id"]
+        # Whether every part of the listing holds the items without a value
+        parts = [False] if key == "id" else [descending is False, descending]
+        value, id = None, None
+        if after is not None:
+            value, id = Database.decode_cursor(sort, after)
+            parts = parts[parts.index(value is None) :]
+        rows: list = []
+        for nulls in parts:
+            query = select(Database.id, *columns, column.label("sort_key"))
+            if nulls:
+                query = query.where(column.is_(None))
+                if id is not None:
+                    after_id = Database.id < id if descending else Database.id > id
+                    query = query.where(after_id)
+                order = [Database.id]
+            else:
+                if key != "id":
+                    query = query.where(column.is_not(None))
+                if id is not None:
+                    # A row value comparison is a single range of the index
+                    keys, bound = tuple_(column, Database.id), tuple_(value, id)
+                    query = query.where(keys < bound if descending else keys > bound)
+                order = [column, Database.id]
+            if descending:
+                order = [part.desc() for part in order]
+            query = query.order_by(*order).limit(limit + 1 - len(rows))
+            rows += db.session.execute(query).all()
+            # Only the first part starts after the cursor
+            id = None
+            if len(rows) > limit:
+                break
+        cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            cursor = Database.encode_cursor(sort, rows[-1].sort_key, rows[-1].id)
+        items = []
+        for row in rows:
+            item = dict(row._mapping)
+            del item["sort_key"]
+            items.append(item)
+        return items, cursor
+
+    @staticmethod
+    def insert_many(rows) -> list:
+        """
+        Inserts items with a single multi-row statement and commits them.
+
+        `rows` are dicts of column values. Changes the session holds already
+        are committed with them, even without any rows. Returns the rows with
+        their new IDs, the client is notified once for all items.
+        """
+        if len(rows) < 1:
+            db.session.commit()
+            return []
+        statement = insert(Database).returning(
+            Database.id, sort_by_parameter_order=True
+        )
+        ids = db.session.execute(statement, rows).scalars().all()
+        rows = [dict(row, id=id) for row, id in zip(rows, ids, strict=True)]
+        changes = changed_items(db.session)
+        for row in rows:
+            changes[row["id"]] = (row.get("name"), row.get("artist"), row.get("album"))
+        db.session.commit()
+        logger.info("Inserted %d items into database", len(rows))
+        items = [
+            dict(
+                row,
+                image=row.get("cover"),
+                date=row["date"].strftime("%Y-%m-%d") if row.get("date") else None,
+                ytid=row.get("youtube_id"),
+            )
+            for row in rows
+        ]
+        sockets.overview({"msg": "inserted_songs", "data": items})
+        return rows
+
     @staticmethod
     def insert(data):
         row = Database(
@@ -240,6 +554,32 @@ class Database(db.Model):
         data["date"] = data["date"].strftime("%d-%m-%Y")
         sockets.overview({"msg": "changed_metadata_db", "data": data})
 
+    @staticmethod
+    def update_many(updates):
+        """
+        Updates the metadata of several items in one transaction.
+
+        `updates` is a list of (item, data) tuples, with data like the dict
+        `update` takes. The client is notified once for all items.
+        """
+        for item, data in updates:
+            item.name = data["name"]
+            item.artist = data["artist"]
+            item.album = data["album"]
+            item.date = data["date"]
+            item.length = data["length"]
+            item.cover = data["image"]
+            item.audio_id = data["track_id"]
+        db.session.commit()
+        logger.info("Updated %d items", len(updates))
+        response = []
+        for item, data in updates:
+            data["item_id"] = item.id
+            data["filepath"] = item.filepath
+            data["date"] = data["date"].strftime("%d-%m-%Y")
+            response.append(data)
+        sockets.overview({"msg": "changed_metadata_items", "data": response})
+
     def update_filepath(self, filepath):
         self.filepath = filepath
         db.session.commit()
@@ -248,7 +588,287 @@ class Database(db.Model):
             {"msg": "updated_filepath", "filepath": filepath, "item": self.id}
         )
 
+    @staticmethod
+    def update_filepaths(renames):
+        """
+        Moves the items of renamed files in one transaction.
+
+        `renames` maps old file paths onto new ones, paths that aren't in the
+        database are ignored. The items are updated by primary key in one
+        statement without loading them. The client is notified once for all
+        items.
+        """
+        old_paths = list(renames)
+        rows = []
+        for i in range(0, len(old_paths), CHUNK_SIZE):
+            rows += db.session.execute(
+                select(Database.id, Database.filepath).where(
+                    Database.filepath.in_(old_paths[i : i + CHUNK_SIZE])
+                )
+            ).all()
+        if len(rows) < 1:
+            return []
+        response = [
+            {"item": id, "filepath": renames[filepath]} for id, filepath in rows
+        ]
+        db.session.execute(
+            update(Database),
+            [{"id": row["item"], "filepath": row["filepath"]} for row in response],
+        )
+        db.session.commit()
+        logger.info("Updated the file paths of %d moved items", len(response))
+        sockets.overview({"msg": "updated_filepaths", "data": response})
+        return response
+
+    @staticmethod
+    def delete_many(ids) -> list:
+        """
+        Deletes items in one transaction and returns their (id, filepath) rows.
+
+        IDs that aren't in the database are ignored. The client is notified
+        once for all items.
+        """
+        ids = [int(id) for id in ids]
+        rows = []
+        for i in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[i : i + CHUNK_SIZE]
+            rows += db.session.execute(
+                select(Database.id, Database.filepath).where(Database.id.in_(chunk))
+            ).all()
+            db.session.execute(
+                delete(Database)
+                .where(Database.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+        changes = changed_items(db.session)
+        for row in rows:
+            changes[row.id] = None
+        db.session.commit()
+        logger.info("Deleted %d items", len(rows))
+        deleted = [row.id for row in rows]
+        message = f"Deleted {len(deleted)} item{'s' if len(deleted) != 1 else ''}"
+        sockets.overview({"msg": "delete_items", "data": message, "items": deleted})
+        return rows
+
     def delete(self):
         db.session.delete(self)
         db.session.commit()
         logger.info("Deleted item %s", self.name)
+
+
+@event.listens_for(Database.__table__, "after_create")
+def create_search_index(target, connection, **kwargs):
+    Database.create_search_index(connection)
+
+
+@event.listens_for(Database.__table__, "before_drop")
+def drop_search_index(target, connection, **kwargs):
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+
+
+def changed_items(session) -> dict:
+    """
+    Returns the items a session changed since its last commit, mapping their
+    IDs onto (name, artist, album), or None when they were deleted. Listeners
+    of the session's `after_commit` event, like the search index, take them
+    from there.
+    """
+    return session.info.setdefault(CHANGED_ITEMS, {})
+
+
+@event.listens_for(Database, "after_insert")
+@event.listens_for(Database, "after_update")
+def item_changed(mapper, connection, target):
+    changed_items(object_session(target))[target.id] = (
+        target.name,
+        target.artist,
+        target.album,
+    )
+
+
+@event.listens_for(Database, "after_delete")
+def item_deleted(mapper, connection, target):
+    changed_items(object_session(target))[target.id] = None
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_changes(session):
+    session.info.pop(CHANGED_ITEMS, None)
+    session.info.pop(CONFIG_CHANGED, None)
+
+
+@event.listens_for(Config, "after_insert")
+@event.listens_for(Config, "after_update")
+@event.listens_for(Config, "after_delete")
+def config_changed(mapper, connection, target):
+    object_session(target).info[CONFIG_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def publish_config(session):
+    # Readers only see the new settings once they're committed
+    if session.info.pop(CONFIG_CHANGED, False):
+        Config.invalidate()
+
+
+@event.listens_for(Config.__table__, "after_create")
+@event.listens_for(Config.__table__, "before_drop")
+def reset_config(target, connection, **kwargs):
+    Config.invalidate()
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Keeps the search index tables out of autogenerated migrations."""
+    return not (type_ == "table" and name.startswith(SEARCH_TABLE))
+
+
+class IsrcMapping(db.Model):
+    """The IDs the metadata providers use for a recording, keyed by its ISRC."""
+
+    isrc = db.Column(db.String(12), primary_key=True)
+    spotify_id = db.Column(db.String(64))
+    deezer_id = db.Column(db.String(64))
+    musicbrainz_id = db.Column(db.String(64))
+
+    # Column that holds the ID of every provider
+    COLUMNS = {
+        "Spotify": "spotify_id",
+        "Deezer": "deezer_id",
+        "Musicbrainz": "musicbrainz_id",
+    }
+
+    @staticmethod
+    def fetch(isrc):
+        return db.session.get(IsrcMapping, isrc)
+
+    @staticmethod
+    def lookup(isrc, source):
+        row = IsrcMapping.fetch(isrc)
+        return getattr(row, IsrcMapping.COLUMNS[source]) if row is not None else None
+
+    @staticmethod
+    def record(source, ids):
+        """
+        Stores the IDs of one provider, given as a dict mapping ISRCs onto IDs.
+
+        A failed write is rolled back before it's raised, so the session stays
+        usable for the caller.
+        """
+        column = IsrcMapping.COLUMNS[source]
+        changed = 0
+        try:
+            for isrc, _id in ids.items():
+                row = IsrcMapping.fetch(isrc)
+                if row is None:
+                    row = IsrcMapping(isrc=isrc)  # type: ignore
+                    db.session.add(row)
+                if getattr(row, column) != str(_id):
+                    setattr(row, column, str(_id))
+                    changed += 1
+            if changed > 0:
+                db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        if changed > 0:
+            logger.debug("Mapped %d ISRCs to %s IDs", changed, source)
+
+
+class Lyrics(db.Model):
+    """Lyrics scraped from Genius, keyed by the Genius song ID."""
+
+    song_id = db.Column(db.String(32), primary_key=True)
+    # An empty string means Genius has no lyrics for the song
+    lyrics = db.Column(db.Text)
+    fetched = db.Column(db.DateTime)
+
+    @staticmethod
+    def fetch(song_id):
+        row = db.session.get(Lyrics, str(song_id))
+        return row.lyrics if row is not None else None
+
+    @staticmethod
+    def store(song_id, lyrics):
+        row = db.session.get(Lyrics, str(song_id))
+        if row is None:
+            row = Lyrics(song_id=str(song_id))  # type: ignore
+            db.session.add(row)
+        row.lyrics = lyrics
+        row.fetched = datetime.now()
+        db.session.commit()
+        logger.debug("Stored the lyrics of Genius song %s", song_id)
+
+
+class RefreshJob(db.Model):
+    """Progress of a library refresh, so an interrupted refresh can resume where it stopped."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    # The filters of the refresh as JSON, used to find the job again
+    filters = db.Column(db.Text)
+    last_id = db.Column(db.Integer, default=0)
+    processed = db.Column(db.Integer, default=0)
+    changed = db.Column(db.Integer, default=0)
+    failed = db.Column(db.Integer, default=0)
+    finished = db.Column(db.Boolean, server_default=expression.false())
+    updated = db.Column(db.DateTime)
+
+    @staticmethod
+    def fetch(job_id):
+        return db.session.get(RefreshJob, job_id)
+
+    @staticmethod
+    def find(filters):
+        """Returns the unfinished job with exactly these filters, if there is one."""
+        return (
+            RefreshJob.query.filter_by(filters=filters, finished=False)
+            .order_by(RefreshJob.id.desc())
+            .first()
+        )
+
+    @staticmethod
+    def start(filters):
+        row = RefreshJob(
+            filters=filters, last_id=0, processed=0, changed=0, failed=0
+        )  # type: ignore
+        row.updated = datetime.now()
+        db.session.add(row)
+        db.session.commit()
+        logger.info("Started library refresh %d", row.id)
+        return row
+
+    def checkpoint(self, last_id, processed, changed, failed):
+        self.last_id = last_id
+        self.processed += processed
+        self.changed += changed
+        self.failed += failed
+        self.updated = datetime.now()
+        db.session.commit()
+
+    def finish(self):
+        self.finished = True
+        self.updated = datetime.now()
+        db.session.commit()
+        logger.info(
+            "Finished library refresh %d: %d items checked, %d changed, %d failed",
+            self.id,
+            self.processed,
+            self.changed,
+            self.failed,
+        )
+
+
+class ScanIndex(db.Model):
+    """Size and modification time of every file the library scanner has read."""
+
+    path = db.Column(db.String(512), primary_key=True)
+    size = db.Column(db.BigInteger)
+    mtime = db.Column(db.BigInteger)
+
+    @staticmethod
+    def load():
+        """Returns the whole index as a dict mapping paths onto (size, mtime) tuples."""
+        rows = db.session.execute(
+            db.select(ScanIndex.path, ScanIndex.size, ScanIndex.mtime)
+        )
+        return {path: (size, mtime) for path, size, mtime in rows}
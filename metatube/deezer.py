@@ -1,25 +1,91 @@
+from itertools import islice
+
 import deezer
+from deezer.pagination import PaginatedList
 
 from metatube import sockets
+from metatube.singleflight import coalesce
+
+
+def field(resource, name, default=""):
+    """
+    Returns a field of a resource as it was received.
+
+    Reading a missing attribute of a resource fetches the whole resource, so a
+    field that isn't in the payload would cost a request per search result.
+    """
+    return vars(resource).get(name, default) if resource is not None else default
 
 
 class Deezer:
 
     @staticmethod
-    def socket_search(data):
+    def project(track) -> dict:
+        """
+        Only keep the fields of a search result that the web UI and the ranking use.
+
+        Search results don't include the ISRC, it's left empty instead of
+        fetching every track.
+        """
+        artist = field(track, "artist", None)
+        album = field(track, "album", None)
+        return {
+            "id": track.id,
+            "title": field(track, "title"),
+            "link": field(track, "link"),
+            "duration": field(track, "duration", None),
+            "isrc": field(track, "isrc"),
+            "artist": {"name": field(artist, "name")},
+            "album": {
+                "title": field(album, "title"),
+                "type": field(album, "type"),
+                "cover_medium": field(album, "cover_medium"),
+            },
+        }
+
+    @staticmethod
+    def search(data):
+        max_results = int(data["max"])
+        query = data["title"]
+        if data.get("artist"):
+            query += f' artist:"{data["artist"]}"'
         client = deezer.Client()
-        search_results = client.search(data["title"], artist=data["artist"])
-        result_list = []
-        for item in search_results:
-            result_list.append(item.as_dict())
-        max_list = result_list[0 : int(data["max"])]
-        max_list.append(data["title"])
-        sockets.deezer_search(max_list)
-
-    def search_id(self, _id):
+        # Ask for a single page of `max` items and stop iterating once it's full,
+        # so the paginated list never requests the next page
+        search_results = PaginatedList(client, "search", q=query, limit=max_results)
+        return [
+            Deezer.project(item) for item in islice(search_results, max_results)
+        ]
+
+    @staticmethod
+    def emit_results(result_list, query):
+        sockets.deezer_search(result_list + [query])
+
+    @staticmethod
+    def socket_search(data):
+        Deezer.emit_results(Deezer.search(data), data["title"])
+
+    @staticmethod
+    @coalesce("deezer.track")
+    def search_id(_id):
         client = deezer.Client()
         return client.get_track(_id).as_dict()
 
-    def sockets_track(self, track_id) -> None:
+    @staticmethod
+    @coalesce("deezer.isrc")
+    def search_isrc(isrc):
+        client = deezer.Client()
+        return client.request("GET", f"track/isrc:{isrc}").as_dict()
+
+    @staticmethod
+    @coalesce("deezer.album")
+    def search_album(_id):
         client = deezer.Client()
-        sockets.deezer_track(client.get_track(track_id).as_dict())
+        album = client.get_album(_id)
+        response = album.as_dict()
+        response["tracks"] = [track.as_dict() for track in album.get_tracks()]
+        return response
+
+    @staticmethod
+    def sockets_track(track_id) -> None:
+        sockets.deezer_track(Deezer.search_id(track_id))
@@ -0,0 +1,127 @@
+import re
+
+import gevent
+from gevent.lock import Semaphore
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Key in a connection's `info` set while it holds the write lock
+WRITE_LOCKED = "write_locked"
+WRITE = re.compile(r"\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.I)
+
+
+def is_memory(url) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in database
+
+
+def engine_options(config) -> dict:
+    """
+    Returns the engine options for the configured database.
+
+    SQLite files get a connection pool that greenlets wait on cooperatively,
+    as the pool's queue uses the patched threading primitives. Server databases
+    get a bounded pool that checks connections before handing them out, so
+    connections dropped by the server don't surface as errors.
+    """
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    pool = {
+        "pool_size": int(config["DATABASE_POOL_SIZE"]),
+        "pool_timeout": int(config["DATABASE_POOL_TIMEOUT"]),
+    }
+    if url.get_backend_name() != "sqlite":
+        return {
+            **pool,
+            "pool_pre_ping": True,
+            "pool_recycle": int(config["DATABASE_POOL_RECYCLE"]),
+        }
+    # In-memory databases keep their single connection
+    return {} if is_memory(url) else pool
+
+
+def configure(app) -> None:
+    """Adds the engine options to the app, options set by hand take precedence."""
+    options = engine_options(app.config)
+    options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+class WriteLock:
+    """
+    Lets one greenlet at a time write to an SQLite database.
+
+    SQLite allows a single writer, and a connection that finds the database
+    locked sleeps in the busy handler. That sleep blocks the whole hub, so the
+    greenlet holding the lock can't commit and the waiter runs into "database
+    is locked". Waiting on this lock yields to the other greenlets instead.
+    The busy timeout still applies to other processes, such as migrations.
+    """
+
+    def __init__(self, timeout) -> None:
+        self.timeout = timeout
+        self.semaphore = Semaphore()
+        self.owner = None
+        self.count = 0
+
+    def acquire(self) -> bool:
+        current = gevent.getcurrent()
+        if self.owner is not current:
+            if not self.semaphore.acquire(timeout=self.timeout):
+                # Leave it to the busy handler, like without the lock
+                return False
+            self.owner = current
+        self.count += 1
+        return True
+
+    def release(self) -> None:
+        self.count -= 1
+        if self.count < 1:
+            self.owner = None
+            self.count = 0
+            self.semaphore.release()
+
+
+def install(engine, config) -> WriteLock | None:
+    """Sets the SQLite pragmas on every new connection and serializes writers."""
+    if engine.dialect.name != "sqlite":
+        return None
+    busy_timeout = int(config["DATABASE_BUSY_TIMEOUT"])
+    pragmas = {"busy_timeout": busy_timeout}
+    if not is_memory(engine.url):
+        pragmas.update(
+            journal_mode="WAL",
+            synchronous="NORMAL",
+            mmap_size=int(config["DATABASE_MMAP_SIZE"]),
+        )
+    lock = WriteLock(busy_timeout / 1000)
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def lock_writes(connection, cursor, statement, parameters, context, executemany):
+        # The first write of a transaction waits for the others to commit
+        if connection.info.get(WRITE_LOCKED) or not WRITE.match(statement):
+            return
+        if lock.acquire():
+            connection.info[WRITE_LOCKED] = True
+
+    def unlock(info) -> None:
+        if info.pop(WRITE_LOCKED, False):
+            lock.release()
+
+    @event.listens_for(engine, "commit")
+    @event.listens_for(engine, "rollback")
+    def end_transaction(connection):
+        unlock(connection.info)
+
+    @event.listens_for(engine, "reset")
+    def reset(dbapi_connection, connection_record, reset_state):
+        # Connections returned to the pool without ending their transaction
+        unlock(connection_record.info)
+
+    return lock
@@ -0,0 +1,286 @@
+import re
+import time
+from difflib import SequenceMatcher
+
+import gevent
+from gevent.queue import Queue
+
+import metatube.isrc as isrc_mapping
+import metatube.musicbrainz as musicbrainz
+from metatube import Config as env
+from metatube import logger, sockets
+from metatube.deezer import Deezer
+from metatube.genius import Genius
+from metatube.spotify import SpotifyMetadata as Spotify
+
+
+class CircuitBreaker:
+    """
+    Keeps track of consecutive failures of a metadata provider.
+
+    After `threshold` consecutive failures the breaker opens and the provider is
+    skipped until `reset_timeout` seconds have passed. The next call is then let
+    through as a trial: a success closes the breaker, a failure opens it again.
+    """
+
+    def __init__(self, name, threshold, reset_timeout) -> None:
+        self.name = name
+        self.threshold = int(threshold)
+        self.reset_timeout = float(reset_timeout)
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning("Circuit breaker for %s has opened", self.name)
+            self.opened_at = time.monotonic()
+
+
+breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name) -> CircuitBreaker:
+    if name not in breakers:
+        breakers[name] = CircuitBreaker(
+            name, env.METADATA_BREAKER_THRESHOLD, env.METADATA_BREAKER_RESET
+        )
+    return breakers[name]
+
+
+def normalize(text) -> str:
+    """Lowercases a title or artist and strips bracketed parts and punctuation."""
+    text = re.sub(r"[\(\[].*?[\)\]]", " ", str(text or "").lower())
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+def similarity(a, b) -> float:
+    a, b = normalize(a), normalize(b)
+    if len(a) < 1 or len(b) < 1:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def candidate(source, _id, title, artists, album="", cover="", duration=None, isrc=""):
+    return {
+        "source": source,
+        "id": str(_id),
+        "title": title or "",
+        "artists": artists,
+        "album": album or "",
+        "cover": cover or "",
+        "duration": duration,
+        "isrc": isrc or "",
+    }
+
+
+def musicbrainz_candidates(release_list) -> list:
+    candidates = []
+    for release in release_list:
+        artists = [
+            credit["artist"]["name"]
+            for credit in release.get("artist-credit", [])
+            if isinstance(credit, dict) and "artist" in credit
+        ]
+        cover = release.get("cover")
+        cover_url = ""
+        if isinstance(cover, dict) and len(cover.get("images", [])) > 0:
+            cover_url = cover["images"][0].get("thumbnails", {}).get("small", "")
+        candidates.append(
+            candidate(
+                "Musicbrainz",
+                release["id"],
+                release.get("title"),
+                artists,
+                release.get("release-group", {}).get("title", ""),
+                cover_url,
+            )
+        )
+    return candidates
+
+
+def spotify_candidates(search_results) -> list:
+    candidates = []
+    for track in search_results["tracks"]["items"]:
+        images = track["album"].get("images", [])
+        candidates.append(
+            candidate(
+                "Spotify",
+                track["id"],
+                track["name"],
+                [artist["name"] for artist in track["artists"]],
+                track["album"]["name"],
+                images[0]["url"] if len(images) > 0 else "",
+                int(track["duration_ms"]) / 1000,
+                track.get("external_ids", {}).get("isrc", ""),
+            )
+        )
+    return candidates
+
+
+def deezer_candidates(result_list) -> list:
+    candidates = []
+    for track in result_list:
+        candidates.append(
+            candidate(
+                "Deezer",
+                track["id"],
+                track["title"],
+                [track["artist"]["name"]],
+                track["album"]["title"],
+                track["album"].get("cover_medium", ""),
+                track.get("duration"),
+                track.get("isrc", ""),
+            )
+        )
+    return candidates
+
+
+def genius_candidates(search_results) -> list:
+    candidates = []
+    for hit in search_results["hits"]:
+        song = hit["result"]
+        artists = [song["primary_artist"]["name"]]
+        artists.extend(artist["name"] for artist in song.get("featured_artists", []))
+        candidates.append(
+            candidate(
+                "Genius",
+                song["id"],
+                song["title"],
+                artists,
+                cover=song.get("header_image_thumbnail_url", ""),
+            )
+        )
+    return candidates
+
+
+def rank(candidates, title, artist="") -> list:
+    """Scores every candidate against the query and sorts them, best match first."""
+    for item in candidates:
+        score = similarity(title, item["title"])
+        if len(normalize(artist)) > 0:
+            score = 0.6 * score + 0.4 * similarity(artist, " ".join(item["artists"]))
+        item["score"] = round(score, 4)
+    return sorted(candidates, key=lambda item: item["score"], reverse=True)
+
+
+class MetadataSearch:
+    """
+    Searches all configured metadata providers concurrently.
+
+    Every provider runs in its own greenlet with its own deadline. Results are
+    pushed to the client with the provider-specific event as soon as they
+    arrive, after which a single `metadata_results` event with the merged and
+    ranked candidates is sent. With `emit=False` nothing is sent to the client
+    and the candidates are only returned.
+    """
+
+    def __init__(
+        self, data, sources, spotify_credentials=None, genius_token=None, emit=True
+    ):
+        self.data = data
+        self.emit = emit
+        self.deadline = float(env.METADATA_TIMEOUT)
+        self.providers = {}
+        if "musicbrainz" in sources:
+            self.providers["musicbrainz"] = (
+                lambda: musicbrainz.search_with_covers(data),
+                musicbrainz.emit_results,
+                musicbrainz_candidates,
+            )
+        if "spotify" in sources:
+            self.providers["spotify"] = (
+                lambda: Spotify(*spotify_credentials).find(data),
+                sockets.spotify_search,
+                spotify_candidates,
+            )
+        if "deezer" in sources:
+            self.providers["deezer"] = (
+                lambda: Deezer.search(data),
+                lambda results: Deezer.emit_results(results, data["title"]),
+                deezer_candidates,
+            )
+        if "genius" in sources and data.get("type") == "lyrics":
+            self.providers["genius"] = (
+                lambda: Genius(genius_token).find(data),
+                sockets.genius_search,
+                genius_candidates,
+            )
+
+    def call(self, name, fetch, queue) -> None:
+        breaker = get_breaker(name)
+        started = time.monotonic()
+        try:
+            with gevent.Timeout(self.deadline):
+                result = fetch()
+            breaker.record_success()
+            queue.put((name, "ok", result, time.monotonic() - started))
+        except gevent.Timeout:
+            breaker.record_failure()
+            logger.warning("%s did not respond within %ss", name, self.deadline)
+            queue.put((name, "timeout", None, time.monotonic() - started))
+        except Exception as e:
+            breaker.record_failure()
+            logger.error("Searching %s has failed: %s", name, str(e))
+            queue.put((name, "error", None, time.monotonic() - started))
+
+    def run(self) -> dict:
+        queue = Queue()
+        status = {}
+        pending = 0
+        for name, (fetch, _, _) in self.providers.items():
+            if get_breaker(name).allow():
+                gevent.spawn(self.call, name, fetch, queue)
+                pending += 1
+            else:
+                logger.info("Skipping %s, its circuit breaker is open", name)
+                status[name] = "skipped"
+
+        candidates = []
+        for _ in range(pending):
+            name, outcome, result, elapsed = queue.get()
+            status[name] = outcome
+            logger.debug("%s finished with '%s' after %.2fs", name, outcome, elapsed)
+            if outcome != "ok" or result is None:
+                continue
+            _, emit, to_candidates = self.providers[name]
+            if self.emit:
+                emit(result)
+            try:
+                found = to_candidates(result)
+            except (KeyError, TypeError) as e:
+                logger.error("Unexpected %s response: %s", name, str(e))
+                continue
+            isrc_mapping.remember(
+                name.capitalize(), {item["isrc"]: item["id"] for item in found}
+            )
+            candidates.extend(found)
+
+        response = {
+            "query": self.data["title"],
+            "results": rank(candidates, self.data["title"], self.data.get("artist", "")),
+            "providers": status,
+        }
+        if self.emit:
+            sockets.metadata_results(response)
+        return response
+
+    @staticmethod
+    def search(data, sources, spotify_credentials=None, genius_token=None) -> dict:
+        return MetadataSearch(data, sources, spotify_credentials, genius_token).run()
@@ -1,6 +1,7 @@
 from lyricsgenius import Genius as genius_obj
 
 from metatube import logger, sockets
+from metatube.singleflight import coalesce
 
 
 class Genius:
@@ -10,19 +11,24 @@ class Genius:
         except TypeError as e:
             logger.error("Genius API failed: %s", str(e))
 
-    def search(self, data):
+    def find(self, data):
         search = self.genius.search_songs(data["title"], data["max"])
-        sockets.genius_search(search)
         logger.info("Searched Genius for track '%s' ", data["title"])
+        return search
+
+    def search(self, data):
+        sockets.genius_search(self.find(data))
 
     @staticmethod
     def search_song(data, token):
         genius = Genius(token)
         genius.search(data)
 
+    @coalesce("genius.song", key=lambda self, _id: _id)
     def fetch_song(self, _id):
         return self.genius.song(_id)
 
+    @coalesce("genius.lyrics", key=lambda self, url: url)
     def fetch_lyrics(self, url):
         return self.genius.lyrics(url)
 
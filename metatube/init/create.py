@@ -8,7 +8,7 @@ from flask_migrate import init, migrate, stamp, upgrade
 from metatube import Config as env
 from metatube import db, logger
 from metatube import migrate as metatube_migrate
-from metatube.database import Config, Templates
+from metatube.database import Config, Database, Templates
 from metatube.ffmpeg import ffmpeg
 
 
@@ -18,7 +18,7 @@ class Default:
         if app.config["TESTING"] is False:
             app.app_context().push()
         self._url = url
-        self._methods = ["config", "templates"]
+        self._methods = ["config", "templates", "search_index"]
         self._ffmpeg = app.config["FFMPEG"]
         self._downloads = app.config["DOWNLOADS"]
 
@@ -69,6 +69,12 @@ class Default:
         logger.info("Created default rows for the Templates table")
         return True
 
+    def search_index(self):
+        # Migrations don't create the full-text index and its triggers
+        Database.create_search_index()
+        db.session.commit()
+        return True
+
     def init_db(self, migrations=True):
         if migrations is False:
             directory = os.path.join(env.BASE_DIR, "migrations")
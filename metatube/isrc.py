@@ -0,0 +1,69 @@
+import re
+
+import metatube.musicbrainz as musicbrainz
+from metatube import logger
+from metatube.database import IsrcMapping
+from metatube.deezer import Deezer
+from metatube.spotify import SpotifyMetadata as Spotify
+
+ISRC_PATTERN = re.compile(r"^[A-Z]{2}[A-Z0-9]{3}[0-9]{7}$")
+
+
+def clean(isrc):
+    """Returns the ISRC in its canonical form, or None if it isn't a valid ISRC."""
+    isrc = str(isrc or "").replace("-", "").strip().upper()
+    return isrc if ISRC_PATTERN.match(isrc) else None
+
+
+def remember(source, ids) -> None:
+    """
+    Stores provider IDs found in a lookup, given as a dict mapping ISRCs onto IDs.
+
+    Invalid ISRCs are skipped and failures are logged as warnings, so a lookup
+    never fails because its IDs couldn't be stored. The caller provides the
+    application context, see `metatube.tasks.bind`.
+    """
+    valid = {clean(isrc): _id for isrc, _id in ids.items() if clean(isrc) and _id}
+    if len(valid) < 1 or source not in IsrcMapping.COLUMNS:
+        return
+    try:
+        IsrcMapping.record(source, valid)
+    except Exception as e:
+        logger.warning("Storing the %s ISRC mapping has failed: %r", source, e)
+
+
+def fetch_id(isrc, source, spotify_credentials=None):
+    """Asks a provider for the ID of an ISRC with a single request."""
+    if source == "Deezer":
+        return Deezer.search_isrc(isrc)["id"]
+    elif source == "Spotify":
+        spotify = Spotify(spotify_credentials[1], spotify_credentials[0])
+        track = spotify.find_isrc(isrc)
+        return track["id"] if track is not None else None
+    elif source == "Musicbrainz":
+        return musicbrainz.search_isrc(isrc)
+    return None
+
+
+def resolve(isrc, source, spotify_credentials=None):
+    """
+    Returns the ID a provider uses for an ISRC, or None.
+
+    Known ISRCs are answered from the mapping table without any request,
+    unknown ones with one direct ISRC request, whose answer is stored.
+    """
+    isrc = clean(isrc)
+    if isrc is None or source not in IsrcMapping.COLUMNS:
+        return None
+    _id = IsrcMapping.lookup(isrc, source)
+    if _id is not None:
+        return _id
+    try:
+        _id = fetch_id(isrc, source, spotify_credentials)
+    except Exception as e:
+        logger.debug("%s doesn't know ISRC %s: %s", source, isrc, str(e))
+        return None
+    if _id is not None:
+        remember(source, {isrc: _id})
+        return str(_id)
+    return None
@@ -0,0 +1,81 @@
+import gevent
+
+from metatube import logger
+from metatube.database import Config, Lyrics
+from metatube.genius import Genius
+from metatube.tagwriter import TagWriter
+from metatube.tasks import start_task
+
+# Genius song IDs whose lyrics are being fetched
+in_flight = set()
+# Tracks whose tags were written before their lyrics arrived, by song ID
+waiting: dict = {}
+
+
+def cached(song_id):
+    """
+    Returns the cached lyrics of a Genius song, or None if they weren't fetched yet.
+
+    An empty string means Genius has no lyrics for the song.
+    """
+    return Lyrics.fetch(song_id)
+
+
+def prefetch(song_id, token=None):
+    """
+    Starts fetching the lyrics of a Genius song in the background, unless they're
+    known already. Returns the task, or None.
+    """
+    song_id = str(song_id)
+    if song_id in in_flight or cached(song_id) is not None:
+        return None
+    in_flight.add(song_id)
+    return start_task(fetch, song_id, token or Config.get_genius())
+
+
+def fetch(song_id, token) -> None:
+    """Scrapes and caches the lyrics of a song, then writes them to the files waiting on them."""
+    lyrics = None
+    try:
+        genius = Genius(token)
+        song = genius.fetch_song(song_id)
+        lyrics = genius.fetch_lyrics(song["song"]["url"]) or ""
+        Lyrics.store(song_id, lyrics)
+        logger.info("Fetched the lyrics of Genius song %s", song_id)
+    except Exception as e:
+        logger.error("Fetching the lyrics of Genius song %s failed: %s", song_id, str(e))
+    finally:
+        in_flight.discard(song_id)
+    for track in waiting.pop(song_id, []):
+        if lyrics:
+            write(track, lyrics)
+
+
+def write(track, lyrics) -> bool:
+    """Writes the lyrics to a file whose other tags have already been written."""
+    track.lyrics = lyrics
+    try:
+        gevent.get_hub().threadpool.apply(TagWriter.write_lyrics, (track,))
+    except Exception as e:
+        logger.error("Writing lyrics to %s failed: %s", track.filename, str(e))
+        return False
+    logger.info("Added lyrics to %s", track.title)
+    return True
+
+
+def write_later(track) -> None:
+    """
+    Writes the lyrics of a track as soon as they're available.
+
+    Called after the tags of the track were written without lyrics. If the
+    lyrics arrived in the meantime they're written right away, otherwise the
+    track waits for the running (or a new) prefetch.
+    """
+    song_id = str(track.lyrics_id)
+    lyrics = cached(song_id)
+    if lyrics is not None:
+        if len(lyrics) > 0:
+            write(track, lyrics)
+        return
+    waiting.setdefault(song_id, []).append(track)
+    prefetch(song_id)
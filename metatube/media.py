@@ -0,0 +1,130 @@
+import os
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
+
+from flask import Response, current_app, send_file, url_for
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from metatube import Config as env
+from metatube import mime
+
+SALT = "metatube.media"
+ARCHIVE_SALT = "metatube.media.archive"
+# Bytes read from a file at once while it's added to an archive
+CHUNK_SIZE = 64 * 1024
+
+
+def serializer(salt=SALT) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(current_app.config["SECRET_KEY"], salt=salt)
+
+
+def sign(item_id, download=False) -> str:
+    """Returns a URL that streams (or downloads) an item until it expires."""
+    token = serializer().dumps({"id": int(item_id), "download": bool(download)})
+    return url_for("overview.stream_item", token=token)
+
+
+def sign_items(item_ids) -> str:
+    """Returns a URL that downloads a ZIP archive of items until it expires."""
+    token = serializer(ARCHIVE_SALT).dumps([int(id) for id in item_ids])
+    return url_for("overview.stream_items", token=token)
+
+
+def verify(token, salt=SALT):
+    """Returns the data a URL was signed with, or None."""
+    try:
+        return serializer(salt).loads(token, max_age=int(env.MEDIA_URL_MAX_AGE))
+    except BadSignature:
+        return None
+
+
+def send(item, download=False):
+    """
+    Serves the file of an item.
+
+    `conditional` makes Flask answer Range requests with 206 responses and
+    If-None-Match / If-Modified-Since with 304 responses, so players can seek
+    without fetching the whole file. The file is streamed in chunks from disk,
+    or handed to the front-end server when USE_X_SENDFILE is set.
+    """
+    path = item.filepath
+    extension = path.split(".")[-1]
+    return send_file(
+        path,
+        mimetype=mime.from_file(path),
+        as_attachment=download,
+        download_name=f"{item.name}.{extension}",
+        conditional=True,
+        etag=True,
+        last_modified=os.stat(path).st_mtime,
+        max_age=int(env.MEDIA_URL_MAX_AGE),
+    )
+
+
+class ZipStream:
+    """Write-only file object that holds what ZipFile wrote until it's drained."""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def write(self, data) -> int:
+        self.buffer += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        """Returns and forgets everything written since the last call."""
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def archive_names(paths) -> list:
+    """Returns the name of every file in the archive, numbering duplicates."""
+    names, seen = [], set()
+    for path in paths:
+        name = os.path.basename(path)
+        stem, extension = os.path.splitext(name)
+        count = 1
+        while name in seen:
+            count += 1
+            name = f"{stem} ({count}){extension}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def zip_stream(paths):
+    """
+    Yields a ZIP archive of files while it's written.
+
+    ZipFile writes data descriptors when its file object can't seek, so no
+    temporary file is needed. Audio is compressed already, so the files are
+    stored as they are and at most one chunk is held in memory at a time.
+    """
+    stream = ZipStream()
+    with ZipFile(stream, "w", ZIP_STORED) as archive:
+        for path, name in zip(paths, archive_names(paths), strict=True):
+            try:
+                source = open(path, "rb")
+            except OSError:
+                continue
+            info = ZipInfo.from_file(path, name)
+            with source, archive.open(info, "w") as target:
+                # The local header goes out before the file is read
+                yield stream.drain()
+                while chunk := source.read(CHUNK_SIZE):
+                    target.write(chunk)
+                    yield stream.drain()
+    yield stream.drain()
+
+
+def send_items(items, filename="items.zip") -> Response:
+    paths = [item.filepath for item in items if os.path.isfile(item.filepath)]
+    return Response(
+        zip_stream(paths),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        direct_passthrough=True,
+    )
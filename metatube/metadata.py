@@ -1,49 +1,41 @@
-import base64
 import json
 import os
-from datetime import datetime
-from re import M
 
-import requests
-from magic import Magic
-from mutagen.aac import AAC
+import mutagen
+from gevent.threadpool import ThreadPoolExecutor
 from mutagen.easyid3 import EasyID3
-from mutagen.flac import FLAC, Picture
-from mutagen.id3 import (  # Meaning of the various frames: https://mutagen.readthedocs.io/en/latest/api/id3_frames.html
-    APIC,
-    ID3,
-    TALB,
-    TCON,
-    TIT2,
-    TLAN,
-    TPE1,
-    TRCK,
-    TSRC,
-    TXXX,
-)
-from mutagen.mp3 import MP3
-from mutagen.mp4 import MP4, MP4Cover
-from mutagen.oggopus import OggOpus
-from mutagen.oggvorbis import OggVorbis
-from mutagen.wave import WAVE
+from mutagen.mp4 import MP4
 
+import metatube.isrc as isrc_mapping
+import metatube.lyrics as lyrics_cache
+import metatube.musicbrainz as musicbrainz
 from metatube import Config, logger, sockets
+from metatube.cache import LRUCache
+from metatube.cover import DEFAULT_COVER, Cover
+from metatube.deezer import Deezer
+from metatube.genius import Genius
+from metatube.spotify import SpotifyMetadata as Spotify
+from metatube.tagwriter import TagWriter
+from metatube.track import TrackMetadata
+
+tag_cache = LRUCache(Config.TAG_CACHE_SIZE)
+# Lets the library refresh tell Deezer track IDs from Genius song IDs in MP3s
+EasyID3.RegisterTXXXKey("deezer_trackid", "deezer_trackid")
+
+# Form data without any overrides, for building metadata without the metadata form
+NO_USERDATA = {
+    "album": "",
+    "trackid": "",
+    "albumid": "",
+    "album_releasedate": "",
+    "album_tracknr": "",
+    "cover": "",
+    "title": "",
+    "artists": '[""]',
+}
 
 
 class MetaData:
-    @staticmethod
-    def get_response(data):
-        return {
-            "filepath": os.path.join(Config.BASE_DIR, data["filename"]),
-            "name": data["title"],
-            "artist": data["artists"],
-            "album": data["album"],
-            "date": data["release_date"],
-            "length": data["length"],
-            "image": data["cover_path"],
-            "track_id": data["track_id"],
-        }
-
     @staticmethod
     def get_musicbrainz_data(filename, metadata_user, metadata_source, cover_source):
         logger.info("Getting Musicbrainz metadata")
@@ -93,23 +85,6 @@ class MetaData:
         cover_path = (
             cover_source if len(metadata_user["cover"]) < 1 else metadata_user["cover"]
         )
-        magic = Magic(mime=True)
-        if cover_path != os.path.join(
-            Config.BASE_DIR, "metatube/static/images/empty_cover.png"
-        ):
-            try:
-                response: Response = requests.get(cover_path)
-                image = response.content
-                magic = Magic(mime=True)
-                cover_mime_type = magic.from_buffer(image)
-            except Exception:
-                sockets.metadata_error("Cover URL is invalid!")
-                return False
-        else:
-            cover_mime_type = "image/png"
-            file = open(cover_path, "rb")
-            image = file.read()
-
         total_tracks = len(metadata_source["release"]["medium-list"][0]["track-list"])
 
         for track in metadata_source["release"]["medium-list"][0]["track-list"]:
@@ -166,26 +141,24 @@ class MetaData:
             if len(metadata_user["title"]) < 1
             else metadata_user["title"]
         )
-        data = {
-            "filename": filename,
-            "album": album,
-            "artists": artist_list,
-            "language": language,
-            "track_id": mbp_releaseid,
-            "album_id": mbp_albumid,
-            "mbp_trackid": mbp_trackid,
-            "barcode": barcode,
-            "release_date": release_date,
-            "tracknr": tracknr,
-            "total_tracks": total_tracks,
-            "isrc": isrc,
-            "length": length,
-            "cover_path": cover_path,
-            "cover_mime_type": cover_mime_type,
-            "image": image,
-            "title": title,
-            "genres": genres,
-        }
+        data = TrackMetadata(
+            filename=filename,
+            album=album,
+            artists=artist_list,
+            language=language,
+            track_id=mbp_releaseid,
+            album_id=mbp_albumid,
+            mbp_trackid=mbp_trackid,
+            barcode=barcode,
+            release_date=release_date,
+            tracknr=tracknr,
+            total_tracks=total_tracks,
+            isrc=isrc,
+            length=length,
+            cover=Cover(cover_path),
+            title=title,
+            genres=genres,
+        )
         return data
 
     @staticmethod
@@ -223,9 +196,6 @@ class MetaData:
             if "total_tracks" in metadata_source
             else "1"
         )
-        default_cover = os.path.join(
-            Config.BASE_DIR, "metatube/static/images/empty_cover.png"
-        )
         cover_path = (
             metadata_source["album"]["images"][0]["url"]
             if len(metadata_user["cover"]) < 1
@@ -245,38 +215,23 @@ class MetaData:
             if json.loads(metadata_user["artists"]) == [""]
             else json.loads(metadata_user["artists"])
         )
-        if cover_path != default_cover:
-            try:
-                response: Response = requests.get(cover_path)
-                image = response.content
-                magic = Magic(mime=True)
-                cover_mime_type = magic.from_buffer(image)
-            except Exception:
-                sockets.metadata_error("Cover URL is invalid!")
-                return False
-        else:
-            cover_mime_type = "image/png"
-            file = open(cover_path, "rb")
-            image = file.read()
-        data = {
-            "filename": filename,
-            "album": album,
-            "artists": artists,
-            "barcode": "",
-            "language": "Unknown",
-            "track_id": trackid,
-            "album_id": albumid,
-            "release_date": release_date,
-            "tracknr": tracknr,
-            "total_tracks": total_tracks,
-            "isrc": isrc,
-            "length": length,
-            "cover_path": cover_path,
-            "cover_mime_type": cover_mime_type,
-            "image": image,
-            "title": title,
-            "genres": genres,
-        }
+        data = TrackMetadata(
+            filename=filename,
+            album=album,
+            artists=artists,
+            barcode="",
+            language="Unknown",
+            track_id=trackid,
+            album_id=albumid,
+            release_date=release_date,
+            tracknr=tracknr,
+            total_tracks=total_tracks,
+            isrc=isrc,
+            length=length,
+            cover=Cover(cover_path),
+            title=title,
+            genres=genres,
+        )
         return data
 
     @staticmethod
@@ -309,11 +264,8 @@ class MetaData:
             else metadata_user["album_tracknr"]
         )
         total_tracks = 1
-        default_cover = os.path.join(
-            Config.BASE_DIR, "metatube/static/images/empty_cover.png"
-        )
         cover_path = (
-            metadata_source["album"].get("cover_xl", default_cover)
+            metadata_source["album"].get("cover_xl", DEFAULT_COVER)
             if len(metadata_user["cover"]) < 1
             else metadata_user["cover"]
         )
@@ -331,40 +283,109 @@ class MetaData:
             if json.loads(metadata_user["artists"]) == [""]
             else json.loads(metadata_user["artists"])
         )
-        if cover_path != default_cover:
-            try:
-                response: Response = requests.get(cover_path)
-                image = response.content
-                magic = Magic(mime=True)
-                cover_mime_type = magic.from_buffer(image)
-            except Exception:
-                sockets.metadata_error("Cover URL is invalid!")
-                return False
-        else:
-            file = open(cover_path, "rb")
-            image = file.read()
-            cover_mime_type = "image/png"
-        data = {
-            "filename": filename,
-            "album": album,
-            "artists": artists,
-            "barcode": "",
-            "language": "Unknown",
-            "track_id": trackid,
-            "album_id": albumid,
-            "release_date": release_date,
-            "tracknr": tracknr,
-            "total_tracks": total_tracks,
-            "isrc": isrc,
-            "length": length,
-            "cover_path": cover_path,
-            "cover_mime_type": cover_mime_type,
-            "image": image,
-            "title": title,
-            "genres": "",
-        }
+        data = TrackMetadata(
+            filename=filename,
+            album=album,
+            artists=artists,
+            barcode="",
+            language="Unknown",
+            track_id=trackid,
+            album_id=albumid,
+            release_date=release_date,
+            tracknr=tracknr,
+            total_tracks=total_tracks,
+            isrc=isrc,
+            length=length,
+            cover=Cover(cover_path),
+            title=title,
+            genres="",
+        )
         return data
 
+    @staticmethod
+    def get_musicbrainz_album_data(metadata_source, cover_source):
+        logger.info("Getting Musicbrainz album metadata")
+        release = metadata_source["release"]
+        release_group = release["release-group"]
+        artists = [
+            artist["artist"]["name"]
+            for artist in release["artist-credit"]
+            if isinstance(artist, dict)
+        ]
+        language = release.get("text-representation", {}).get("language", "")
+        release_date = release_group.get("first-release-date", release.get("date", ""))
+        genres = "; ".join(tag["name"] for tag in release_group.get("tag-list", []))
+        cover = Cover(cover_source)
+        tracks = []
+        for medium in release["medium-list"]:
+            for track in medium["track-list"]:
+                recording = track["recording"]
+                tracks.append(
+                    TrackMetadata(
+                        album=release_group["title"],
+                        artists=artists,
+                        language=language,
+                        track_id=track["id"],
+                        album_id=release_group["id"],
+                        mbp_trackid=recording["id"],
+                        barcode=release.get("barcode", ""),
+                        release_date=release_date,
+                        tracknr=track.get("number") or track["position"],
+                        total_tracks=str(len(medium["track-list"])),
+                        isrc=recording.get("isrc-list", [""])[0],
+                        length=(
+                            str(int(recording["length"]) // 1000)
+                            if "length" in recording
+                            else ""
+                        ),
+                        cover=cover,
+                        title=recording["title"],
+                        genres=genres,
+                    )
+                )
+        return tracks
+
+    @staticmethod
+    def get_spotify_album_data(metadata_source):
+        logger.info("Getting Spotify album metadata")
+        tracks = []
+        for track in metadata_source["tracks"]["items"]:
+            data = MetaData.get_spotify_data("", NO_USERDATA, track)
+            data.total_tracks = metadata_source["total_tracks"]
+            data.genres = "; ".join(metadata_source.get("genres", []))
+            if len(tracks) > 0:
+                data.cover = tracks[0].cover
+            tracks.append(data)
+        return tracks
+
+    @staticmethod
+    def get_deezer_album_data(metadata_source):
+        logger.info("Getting Deezer album metadata")
+        cover = Cover(metadata_source.get("cover_xl") or DEFAULT_COVER)
+        genres = "; ".join(genre["name"] for genre in metadata_source.get("genres", []))
+        total_tracks = len(metadata_source["tracks"])
+        tracks = []
+        for position, track in enumerate(metadata_source["tracks"], start=1):
+            tracks.append(
+                TrackMetadata(
+                    album=metadata_source["title"],
+                    artists=[track["artist"]["name"]],
+                    barcode=metadata_source.get("upc", ""),
+                    language="Unknown",
+                    track_id=str(track["id"]),
+                    album_id=str(metadata_source["id"]),
+                    release_date=metadata_source.get("release_date", ""),
+                    tracknr=str(track.get("track_position") or position),
+                    total_tracks=total_tracks,
+                    isrc=track.get("isrc", ""),
+                    length=str(track.get("duration", "0")),
+                    cover=cover,
+                    title=track["title"],
+                    genres=genres,
+                )
+            )
+        return tracks
+
     @staticmethod
     def get_genius_data(filename, metadata_user, metadata_source, lyrics):
         logger.info("Getting Genius metadata")
@@ -375,7 +396,7 @@ class MetaData:
         )
         trackid = (
             metadata_source["id"]
-            if len(metadata_user["trackid"] < 1)
+            if len(metadata_user["trackid"]) < 1
             else metadata_user["trackid"]
         )
         albumid = (
@@ -391,9 +412,6 @@ class MetaData:
         length = 0
         tracknr = metadata_user["album_tracknr"]
         total_tracks = 1
-        default_cover = os.path.join(
-            Config.BASE_DIR, "metatube/static/images/empty_cover.png"
-        )
         cover_path = (
             metadata_source["song"]["song_art_image_thumbnail_url"]
             if len(metadata_user["cover"]) < 1
@@ -412,327 +430,166 @@ class MetaData:
             if len(metadata_user["artists"]) < 1
             else metadata_user["artists"]
         )
-        if cover_path != default_cover:
-            try:
-                response = requests.get(cover_path)
-                image = response.content
-                magic = Magic(mime=True)
-                cover_mime_type = magic.from_buffer(image)
-            except Exception:
-                sockets.metadata_error("Cover URL is invalid!")
-                return False
-        else:
-            cover_mime_type = "image/png"
-            file = open(cover_path, "rb")
-            image = file.read()
-
-        data = {
-            "filename": filename,
-            "album": album,
-            "artists": artists,
-            "barcode": "",
-            "language": "Unknown",
-            "track_id": trackid,
-            "album_id": albumid,
-            "release_date": release_date,
-            "tracknr": tracknr,
-            "total_tracks": total_tracks,
-            "isrc": "",
-            "length": length,
-            "cover_path": cover_path,
-            "cover_mime_type": cover_mime_type,
-            "image": image,
-            "title": title,
-            "genres": "",
-            "lyrics": lyrics,
-        }
+        data = TrackMetadata(
+            filename=filename,
+            album=album,
+            artists=artists,
+            barcode="",
+            language="Unknown",
+            track_id=trackid,
+            album_id=albumid,
+            release_date=release_date,
+            tracknr=tracknr,
+            total_tracks=total_tracks,
+            isrc="",
+            length=length,
+            cover=Cover(cover_path),
+            title=title,
+            genres="",
+            lyrics=lyrics,
+        )
         return data
 
     @staticmethod
     def only_userdata(filename, metadata_user):
-        if metadata_user["cover"] != "":
-            try:
-                cover_path = metadata_user["cover"]
-                response = requests.get(metadata_user["cover"])
-                image = response.content
-                magic = Magic(mime=True)
-                cover_mime_type = magic.from_buffer(image)
-            except Exception:
-                sockets.metadata_error("Cover URL is invalid!")
-                return False
-        else:
-            cover_path = os.path.join(
-                Config.BASE_DIR, "metatube/static/images/empty_cover.png"
-            )
-            file = open(cover_path, "rb")
-            image = file.read()
-            cover_mime_type = "image/png"
-
-        data = {
-            "filename": filename,
-            "album": metadata_user.get("album", ""),
-            "artists": metadata_user.get("artists", ""),
-            "barcode": "",
-            "language": "Unknown",
-            "track_id": metadata_user.get("trackid", ""),
-            "album_id": metadata_user.get("albumid", ""),
-            "release_date": metadata_user.get("album_releasedate", ""),
-            "tracknr": metadata_user.get("album_tracknr", "1"),
-            "total_tracks": metadata_user.get("album_tracknr", "1"),
-            "isrc": "",
-            "length": "",
-            "cover_path": cover_path,
-            "cover_mime_type": cover_mime_type,
-            "image": image,
-            "title": metadata_user.get("title", ""),
-            "genres": "",
-        }
+        cover_path = (
+            metadata_user["cover"] if metadata_user["cover"] != "" else DEFAULT_COVER
+        )
+        data = TrackMetadata(
+            filename=filename,
+            album=metadata_user.get("album", ""),
+            artists=metadata_user.get("artists", ""),
+            barcode="",
+            language="Unknown",
+            track_id=metadata_user.get("trackid", ""),
+            album_id=metadata_user.get("albumid", ""),
+            release_date=metadata_user.get("album_releasedate", ""),
+            tracknr=metadata_user.get("album_tracknr", "1"),
+            total_tracks=metadata_user.get("album_tracknr", "1"),
+            isrc="",
+            length="",
+            cover=Cover(cover_path),
+            title=metadata_user.get("title", ""),
+            genres="",
+        )
         return data
 
     @staticmethod
-    def merge_audio_data(data):
-        """
-        Valid fields for EasyID3:
-            "album",
-            "bpm",
-            "compilation",
-            "composer",
-            "copyright",
-            "encodedby",
-            "lyricist",
-            "length",
-            "media",
-            "mood",
-            "title",
-            "version",
-            "artist",
-            "albumartist",
-            "conductor",
-            "arranger",
-            "discnumber",
-            "organization",
-            "tracknumber",
-            "author",
-            "albumartistsort",
-            "albumsort",
-            "composersort",
-            "artistsort",
-            "titlesort",
-            "isrc",
-            "discsubtitle",
-            "language",
-            "genre",
-            "date",
-            "originaldate",
-            "performer:*",
-            "musicbrainz_trackid",
-            "website",
-            "replaygain_*_gain",
-            "replaygain_*_peak",
-            "musicbrainz_artistid",
-            "musicbrainz_albumid",
-            "musicbrainz_albumartistid",
-            "musicbrainz_trmid",
-            "musicip_puid",
-            "musicip_fingerprint",
-            "musicbrainz_albumstatus",
-            "musicbrainz_albumtype",
-            "releasecountry",
-            "musicbrainz_discid",
-            "asin",
-            "performer",
-            "barcode",
-            "catalognumber",
-            "musicbrainz_releasetrackid",
-            "musicbrainz_releasegroupid",
-            "musicbrainz_workid",
-            "acoustid_fingerprint",
-            "acoustid_id"
+    def from_source(
+        source,
+        filename,
+        metadata_user,
+        release_id,
+        cover_source,
+        spotify_credentials=None,
+        genius_token=None,
+    ):
         """
-        if data["extension"] == "MP3":
-            audio = EasyID3(data["filename"])
-            if data.get("source", "") == "Spotify":
-                audio.RegisterTXXXKey("spotify_trackid", data["track_id"])
-                audio.RegisterTXXXKey("spotify_albumid", data["album_id"])
-            elif data.get("source", "") == "Deezer":
-                audio.RegisterTXXXKey("deezer_trackid", data["track_id"])
-                audio.RegisterTXXXKey("deezer_albumid", data["album_id"])
-            if "lyrics" in data:
-                audio.RegisterTextKey("lyrics", "USLT")
-        elif data["extension"] == "FLAC":
-            audio = FLAC(data["filename"])
-        elif data["extension"] == "AAC":
-            audio = AAC(data["filename"])
-        elif data["extension"] == "OPUS":
-            audio = OggOpus(data["filename"])
-        elif data["extension"] == "OGG":
-            audio = OggVorbis(data["filename"])
-        else:
-            return
+        Fetches a track from a metadata provider and builds its metadata.
 
-        audio["album"] = data["album"]
-        audio["artist"] = data["artists"]
-        audio["barcode"] = data["barcode"]
-        audio["language"] = data["language"]
-        audio["tracknumber"] = str(data["tracknr"])
-        audio["title"] = data["title"]
-        audio["date"] = data["release_date"]
-        audio["genre"] = data["genres"]
-        if "lyrics" in data and data["extension"] != "MP3":
-            audio["lyrics"] = data["lyrics"]
-        if data.get("source", "") == "Musicbrainz":
-            audio["musicbrainz_releasetrackid"] = data["track_id"]
-            audio["musicbrainz_releasegroupid"] = data["album_id"]
-            audio["musicbrainz_albumid"] = data["album_id"]
-
-        audio.save()
-
-        if data["extension"] == "MP3":
-            cover = ID3(data["filename"])
-            cover["APIC"] = APIC(
-                encoding=3,
-                mime=data["cover_mime_type"],
-                type=3,
-                desc="Cover",
-                data=data["image"],
+        Returns None if the source is unknown, False if the metadata couldn't
+        be built and the track metadata otherwise. The ISRC of the track is
+        mapped onto the fetched ID on the way.
+        """
+        if source == "Spotify":
+            spotify = Spotify(spotify_credentials[1], spotify_credentials[0])
+            metadata_source = spotify.fetch_track(release_id)
+            data = MetaData.get_spotify_data(filename, metadata_user, metadata_source)
+        elif source == "Musicbrainz":
+            metadata_source = musicbrainz.search_id_release(release_id)
+            data = MetaData.get_musicbrainz_data(
+                filename, metadata_user, metadata_source, cover_source
             )
-            cover.save()
+        elif source == "Deezer":
+            metadata_source = Deezer.search_id(release_id)
+            data = MetaData.get_deezer_data(filename, metadata_user, metadata_source)
+        elif source == "Genius":
+            genius = Genius(genius_token)
+            metadata_source = genius.fetch_song(release_id)
+            # Never wait for the lyrics scrape, they're written once they arrive
+            lyrics = lyrics_cache.cached(release_id)
+            data = MetaData.get_genius_data(
+                filename, metadata_user, metadata_source, lyrics or None
+            )
+            if lyrics is None:
+                data.lyrics_id = str(release_id)
+                lyrics_cache.prefetch(release_id, genius_token)
+            return data
+        elif source == "Unavailable":
+            return MetaData.only_userdata(filename, metadata_user)
         else:
-            cover = Picture()
-            cover.data = data["image"]
-            cover.type = 3
-            cover.mime = data["cover_mime_type"]
-            cover.desc = "Front cover"
-            if data["extension"] == "FLAC":
-                audio.add_picture(cover)
-            else:
-                cover_data = cover.write()
-                audio["metadata_block_picture"] = [
-                    base64.b64encode(cover_data).decode("ascii")
-                ]
-                audio.save()
-        response = MetaData.get_response(data)
-        if data["goal"] == "edit":
-            response["item_id"] = data["item_id"]
-            logger.info("Finished changing metadata of %s", data["title"])
-            sockets.overview({"msg": "changed_metadata", "data": response})
-        elif data["goal"] == "add":
-            logger.info("Finished adding metadata to %s", data["title"])
-            sockets.finished_metadata(response)
+            return None
+        if data:
+            isrc_mapping.remember(source, {data.isrc: release_id})
+        return data
 
     @staticmethod
-    def merge_id3_data(data):
-        if data["extension"] == "WAV":
-            audio = WAVE(data["filename"])
-        else:
-            return
+    def merge(track):
+        """Writes the track metadata to its file and reports the result to the client."""
         try:
-            audio.add_tags()
+            track.cover.load()
         except Exception:
-            pass
-        audio.tags.add(TIT2(encoding=3, text=data["title"]))
-        audio.tags.add(TALB(encoding=3, text=data["album"]))
-        audio.tags.add(TCON(encoding=3, text=data["genres"]))
-        audio.tags.add(TLAN(encoding=3, text=data["language"]))
-        audio.tags.add(TRCK(encoding=3, text=data["tracknr"]))
-        audio.tags.add(TSRC(encoding=3, text=data["isrc"]))
-        audio.tags.add(TPE1(encoding=3, text=data["artists"]))
-        audio.tags.add(
-            TXXX(
-                encoding=3,
-                desc="musicbrainz_releasetrackid",
-                text=data["mbp_releaseid"],
-            )
-        )
-        audio.tags.add(
-            TXXX(
-                encoding=3, desc="musicbrainz_releasegroupid", text=data["mbp_albumid"]
-            )
-        )
-        audio.tags.add(
-            TXXX(encoding=3, desc="musicbrainz_albumid", text=data["mbp_albumid"])
-        )
-        audio.tags.add(
-            APIC(
-                encoding=3,
-                mime=data["cover_mime_type"],
-                type=3,
-                desc="Cover",
-                data=data["image"],
-            )
-        )
-
-        response = MetaData.get_response(data)
-        if data["goal"] == "edit":
-            response["item_id"] = data["item_id"]
-            logger.info("Finished changing metadata of %s", data["title"])
+            sockets.metadata_error("Cover URL is invalid!")
+            return False
+        try:
+            written = TagWriter.write(track)
+        finally:
+            track.cover.release()
+        if not written:
+            return False
+        response = track.response()
+        if track.goal == "edit":
+            response["item_id"] = track.item_id
+            logger.info("Finished changing metadata of %s", track.title)
             sockets.overview({"msg": "changed_metadata", "data": response})
-        elif data["goal"] == "add":
-            logger.info("Finished adding metadata to %s", data["title"])
+        elif track.goal == "add":
+            logger.info("Finished adding metadata to %s", track.title)
             sockets.finished_metadata(response)
+        if track.lyrics is None and track.lyrics_id is not None:
+            lyrics_cache.write_later(track)
+        return True
 
     @staticmethod
-    def merge_video_data(data):
-        if data["extension"] in ["M4A", "MP4"]:
-            video = MP4(data["filename"])
-        else:
-            return
-        dateobj = (
-            datetime.strptime(data["release_date"], "%Y-%m-%d")
-            if len(data["release_date"]) > 0
-            else datetime.now().date()
-        )
-        year = dateobj.year
-        # iTunes metadata list / key values: https://mutagen.readthedocs.io/en/latest/api/mp4.html?highlight=M4A#mutagen.mp4.MP4Tags
-        video["\xa9nam"] = data["title"]
-        video["\xa9alb"] = data["album"]
-        video["\xa9ART"] = data["artists"]
-        video["\xa9gen"] = data["genres"]
-        video["\xa9day"] = str(year)
-        try:
-            video["trkn"] = [(int(data["tracknr"]), int(data["total_tracks"]))]
-        except Exception:
-            pass
-        imageformat = (
-            MP4Cover.FORMAT_PNG
-            if "png" in data["cover_mime_type"]
-            else MP4Cover.FORMAT_JPEG
-        )
-        video["covr"] = [MP4Cover(data["image"], imageformat)]
+    def can_tag(filepath) -> bool:
+        extension = filepath.split(".")[-1].upper()
+        return os.path.isfile(filepath) and extension in Config.META_EXTENSIONS
 
-        video.save()
-        response = MetaData.get_response(data)
+    @staticmethod
+    def file_key(filename):
+        stat = os.stat(filename)
+        return (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
 
-        if data["goal"] == "edit":
-            response["item_id"] = data["item_id"]
-            logger.info("Finished changing metadata of %s", data["title"])
-            sockets.overview({"msg": "changed_metadata", "data": response})
-        elif data["goal"] == "add":
-            logger.info("Finished adding metadata to %s", data["title"])
-            sockets.finished_metadata(response)
+    @staticmethod
+    def read_cached(filename, reader):
+        """
+        Returns the parsed tags of a file, parsing it only if it changed since the last read.
+
+        Entries are keyed on path, size and mtime, so writing tags to a file
+        automatically makes its old entry unreachable. A copy is returned
+        because callers add their own keys to the response.
+        """
+        key = MetaData.file_key(filename)
+        response = tag_cache.get(key)
+        if response is None:
+            response = reader(filename)
+            if response is None:
+                return None
+            tag_cache.put(key, response)
+        return dict(response)
 
     @staticmethod
     def read_audio_metadata(filename):
+        return MetaData.read_cached(filename, MetaData.parse_audio_metadata)
+
+    @staticmethod
+    def parse_audio_metadata(filename):
         logger.info("Reading metadata of %s", filename)
         extension = filename.split(".")[len(filename.split(".")) - 1].upper()
-        if extension == "MP3":
-            audio = EasyID3(filename)
-            data = MP3(filename)
-        elif extension == "FLAC":
-            audio = FLAC(filename)
-            data = FLAC(filename)
-        elif extension == "AAC":
-            audio = AAC(filename)
-            data = FLAC(filename)
-        elif extension == "OPUS":
-            audio = OggOpus(filename)
-            data = OggOpus(filename)
-        elif extension == "OGG":
-            audio = OggVorbis(filename)
-            data = OggVorbis(filename)
-        else:
+        if extension not in ["MP3", "FLAC", "AAC", "OPUS", "OGG"]:
             logger.error("File type not supported")
-            # return
+            return None
+        # One parse gives both the tags (as EasyID3 for MP3) and the stream info
+        audio = mutagen.File(filename, easy=True)
 
         response = {
             "title": audio.get("title", [""])[0],
@@ -747,10 +604,11 @@ class MetaData:
             "mbp_releaseid": audio.get("musicbrainz_releasetrackid", [""])[0],
             "mbp_releasegroupid": audio.get("musicbrainz_releasegroupid", [""])[0],
             "isrc": audio.get("isrc", [""])[0],
+            "deezer_trackid": audio.get("deezer_trackid", [""])[0],
             "tracknr": audio.get("tracknumber", [""])[0],
             "date": audio.get("date", [""])[0],
-            "length": data.info.length,
-            "bitrate": data.info.bitrate,
+            "length": audio.info.length,
+            "bitrate": audio.info.bitrate,
             "output_folder": os.path.dirname(filename),
             "filename": filename,
             "goal": "edit",
@@ -760,6 +618,10 @@ class MetaData:
 
     @staticmethod
     def read_video_metadata(filename):
+        return MetaData.read_cached(filename, MetaData.parse_video_metadata)
+
+    @staticmethod
+    def parse_video_metadata(filename):
         extension = filename.split(".")[len(filename.split(".")) - 1].upper()
         if extension in ["M4A", "MP4"]:
             video = MP4(filename)
@@ -785,6 +647,31 @@ class MetaData:
         }
         return response
 
+    @staticmethod
+    def read_metadata(filename):
+        extension = filename.split(".")[len(filename.split(".")) - 1].upper()
+        try:
+            if extension in ["MP3", "FLAC", "AAC", "OPUS", "OGG"]:
+                return MetaData.read_audio_metadata(filename)
+            elif extension in ["MP4", "M4A"]:
+                return MetaData.read_video_metadata(filename)
+        except Exception as e:
+            logger.error("Reading metadata of %s failed: %s", filename, str(e))
+        return None
+
+    @staticmethod
+    def read_metadata_batch(filenames, workers=None):
+        """
+        Reads the tags of many files on a pool of native threads.
+
+        Returns a dict mapping every filename onto its metadata, or None if
+        the file couldn't be read.
+        """
+        workers = int(workers or Config.TAG_READ_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tags = executor.map(MetaData.read_metadata, filenames)
+            return dict(zip(filenames, tags, strict=True))
+
     @staticmethod
     def FLV(filename):
         pass
@@ -0,0 +1,89 @@
+import os
+from threading import Lock
+
+from magic import Magic
+
+from metatube import Config
+from metatube.cache import LRUCache
+
+# Bytes read from the start of a file to check the signatures below
+HEADER_SIZE = 64
+
+# (offset, signature, MIME type), named the same way libmagic names them
+SIGNATURES = (
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (0, b"ID3", "audio/mpeg"),
+    (0, b"fLaC", "audio/flac"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"PK\x03\x04", "application/zip"),
+)
+
+# RIFF containers are identified by the form type at offset 8
+RIFF_TYPES = {b"WAVE": "audio/x-wav", b"WEBP": "image/webp"}
+
+# ISO base media files are identified by the major brand of their ftyp box
+AUDIO_BRANDS = (b"M4A ", b"M4B ")
+
+_magic = None
+_magic_lock = Lock()
+mime_cache = LRUCache(Config.TAG_CACHE_SIZE)
+
+
+def libmagic() -> Magic:
+    """Returns the shared libmagic detector, which loads its database only once."""
+    global _magic
+    if _magic is None:
+        with _magic_lock:
+            if _magic is None:
+                _magic = Magic(mime=True)
+    return _magic
+
+
+def sniff(header):
+    """Returns the MIME type of the file types we produce ourselves, or None."""
+    for offset, signature, mime in SIGNATURES:
+        if header.startswith(signature, offset):
+            return mime
+    if header.startswith(b"RIFF") and header[8:12] in RIFF_TYPES:
+        return RIFF_TYPES[header[8:12]]
+    if header[4:8] == b"ftyp":
+        return "audio/x-m4a" if header[8:12] in AUDIO_BRANDS else "video/mp4"
+    if len(header) < 2 or header[0] != 0xFF:
+        return None
+    # ADTS frames share the MPEG frame sync, but their layer bits are always 0.
+    # libmagic calls them audio/x-hx-aac-adts, browsers only know audio/aac.
+    if header[1] & 0xF6 == 0xF0:
+        return "audio/aac"
+    # MPEG audio frame sync without an ID3 tag in front of it
+    if header[1] & 0xE0 == 0xE0 and header[1] & 0x06 != 0:
+        return "audio/mpeg"
+    return None
+
+
+def from_buffer(data) -> str:
+    mime = sniff(data[:HEADER_SIZE])
+    if mime is None:
+        mime = libmagic().from_buffer(data)
+    return mime
+
+
+def from_file(path) -> str:
+    """
+    Returns the MIME type of a file.
+
+    The result is cached on path, size and mtime, so a file is only looked at
+    again after it has been written to.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    mime = mime_cache.get(key)
+    if mime is None:
+        with open(path, "rb") as file:
+            mime = sniff(file.read(HEADER_SIZE))
+        if mime is None:
+            mime = libmagic().from_file(path)
+        mime_cache.put(key, mime)
+    return mime
@@ -3,6 +3,7 @@ import musicbrainzngs
 from musicbrainzngs.musicbrainz import NetworkError, ResponseError
 
 from metatube import logger, sockets
+from metatube.singleflight import coalesce
 
 musicbrainzngs.set_useragent("metatube", "0.1", "https://github.com/JVT038/MetaTube")
 
@@ -19,6 +20,7 @@ def search(args):
     return response
 
 
+@coalesce("musicbrainz.search_id_release")
 def search_id_release(_id):
     fields = [
         "artists",
@@ -45,6 +47,21 @@ def search_id_recording(query):
     return response
 
 
+@coalesce("musicbrainz.search_isrc")
+def search_isrc(isrc):
+    """Returns the ID of the first release with a recording of the ISRC, or None."""
+    try:
+        response = musicbrainzngs.get_recordings_by_isrc(isrc, includes=["releases"])
+    except ResponseError:
+        # Musicbrainz answers 404 for unknown ISRCs
+        return None
+    for recording in response["isrc"]["recording-list"]:
+        for release in recording.get("release-list", []):
+            return release["id"]
+    return None
+
+
+@coalesce("musicbrainz.search_id_release_group")
 def search_id_release_group(_id):
     try:
         release_group = musicbrainzngs.search_release_groups(rgid=_id)
@@ -55,6 +72,7 @@ def search_id_release_group(_id):
         return str(e)
 
 
+@coalesce("musicbrainz.get_cover")
 def get_cover(release_id):
     logger.info("Searching for cover of release %s", release_id)
     try:
@@ -70,12 +88,31 @@ def get_cover(release_id):
         return "error"
 
 
-def webui(args):
+def front_cover(release_id):
+    """Returns the URL of the front cover of a release, or None if it has none."""
+    images = get_cover(release_id)
+    if isinstance(images, str):
+        return None
+    for image in images.get("images", []):
+        if image.get("front"):
+            return image["image"]
+    return None
+
+
+def search_with_covers(args):
     releases = search(args)
-    if len(releases["release-list"]) > 0:
-        for release in releases["release-list"]:
-            release["cover"] = get_cover(release["id"])
-        sockets.musicbrainz_results(releases["release-list"])
+    for release in releases["release-list"]:
+        release["cover"] = get_cover(release["id"])
+    return releases["release-list"]
+
+
+def emit_results(release_list):
+    if len(release_list) > 0:
+        sockets.musicbrainz_results(release_list)
         logger.info("Sent musicbrainz release")
     else:
         sockets.search_video("No releases from Musicbrainz have been found!")
+
+
+def webui(args):
+    emit_results(search_with_covers(args))
@@ -1,30 +1,49 @@
 import json
 import os
-import random
 import shutil
-import string
 from datetime import datetime
 from shutil import move
-from tempfile import mkdtemp
-from zipfile import ZipFile
 
-import requests
+import gevent
 from dateutil import parser
-from flask import Blueprint, render_template
-from magic import Magic
+from flask import Blueprint, render_template, request
 from str2bool import str2bool
 
 import metatube.musicbrainz as musicbrainz
 import metatube.sponsorblock as sb
+import metatube.youtube as youtube
 from metatube import Config as env
-from metatube import socketio, sockets
+from metatube import (
+    logger,
+    lyrics,
+    media,
+    mime,
+    socketio,
+    sockets,
+    typeahead,
+    watcher,
+)
+from metatube.albumtagger import AlbumTagger
+from metatube.automatch import AutoMatch, review_queue
+from metatube.cache import LRUCache
+from metatube.cover import Cover
 from metatube.database import Config, Database, Templates
 from metatube.deezer import Deezer
+from metatube.fanout import MetadataSearch
 from metatube.genius import Genius
 from metatube.metadata import MetaData
+from metatube.refresh import LibraryRefresh
+from metatube.scanner import Scanner
 from metatube.spotify import SpotifyMetadata as Spotify
+from metatube.tasks import start_task
+from metatube.track import TrackMetadata
 from metatube.youtube import YouTube as yt
 
+# Maximum number of items the listing API returns at once
+MAX_PAGE_SIZE = 500
+# Rendered metadata forms by the version of the settings they were rendered for
+form_cache = LRUCache(2)
+
 bp = Blueprint(
     "overview",
     __name__,
@@ -42,26 +61,43 @@ def index() -> str:
     Returns:
         str: The rendered HTML template for the overview page.
     """
-    ffmpeg_path: bool = len(Config.query.get(1).ffmpeg_directory) > 0
-    records = Database.get_records()
-    metadata_sources = Config.get_metadata_sources()
-    metadata_form = render_template(
-        "metadata_form.html", metadata_sources=metadata_sources
-    )
-    genius: bool = "genius" in Config.get_metadata_sources().split(";")
+    settings = Config.snapshot()
+    ffmpeg_path: bool = len(settings.ffmpeg_directory) > 0
+    # Only the first page is rendered, the client loads the rest while scrolling
+    records, cursor = Database.page(limit=int(env.ITEMS_PAGE_SIZE))
+    genius: bool = "genius" in settings.metadata_sources.split(";")
     return render_template(
         "overview.html",
         current_page="overview",
         ffmpeg_path=ffmpeg_path,
         records=records,
-        metadata_view=metadata_form,
+        cursor=cursor,
+        metadata_view=metadata_form(),
         genius=genius,
     )
 
 
+def metadata_form() -> str:
+    """Renders the metadata form, once for every version of the settings."""
+    settings = Config.snapshot()
+    form = form_cache.get(settings.version)
+    if form is None:
+        form = render_template(
+            "metadata_form.html", metadata_sources=settings.metadata_sources
+        )
+        form_cache.put(settings.version, form)
+    return form
+
+
 @socketio.on("search_item")
 def search_item(query) -> None:
-    items = Database.search_records(query)
+    ids = typeahead.search(query)
+    if ids is None:
+        items = Database.search_records(query)
+    else:
+        # Only the best matches are read from the database, in their order
+        found = {item.id: item for item in Database.query.filter(Database.id.in_(ids))}
+        items = [found[id] for id in ids if id in found]
     list = []
     for item_data in items:
         item = {
@@ -79,22 +115,46 @@ def search_item(query) -> None:
 
 
 @socketio.on("fetch_all_items")
-def search_item():
-    items = Database.get_records()
-    list = []
-    for item_data in items:
-        item = {
-            "name": item_data.name,
-            "artist": item_data.artist,
-            "album": item_data.album,
-            "date": item_data.date,
-            "filepath": item_data.filepath,
-            "ytid": item_data.youtube_id,
-            "id": item_data.id,
-            "image": item_data.cover,
-        }
-        list.append(item)
-    sockets.search_item(list)
+def search_item(sort="id", after=None):
+    items, cursor = Database.page(sort, after, int(env.ITEMS_PAGE_SIZE))
+    sockets.search_item([list_item(item) for item in items])
+    return cursor
+
+
+def list_item(item) -> dict:
+    """Formats a row of the item listing the way the overview expects it."""
+    item = {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in item.items()
+    }
+    if "cover" in item:
+        item["image"] = item["cover"]
+    if "youtube_id" in item:
+        item["ytid"] = item["youtube_id"]
+    return item
+
+
+@bp.route("/api/items")
+def list_items():
+    """
+    Lists items page by page.
+
+    Query parameters: `sort` (name, artist, album, date or id, descending
+    with a leading '-'), `after` (the `next` cursor of the previous page),
+    `limit` and `fields` (comma-separated columns).
+    """
+    fields = request.args.get("fields")
+    try:
+        limit = min(int(request.args.get("limit", env.ITEMS_PAGE_SIZE)), MAX_PAGE_SIZE)
+        items, cursor = Database.page(
+            request.args.get("sort", "id"),
+            request.args.get("after"),
+            max(limit, 1),
+            fields.split(",") if fields else None,
+        )
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return {"items": [list_item(item) for item in items], "next": cursor}
 
 
 @socketio.on("ytdl_search")
@@ -156,18 +216,12 @@ def search_metadata(data):
     Returns:
         None
     """
-    sources = Config.get_metadata_sources()
-    data["max"] = Config.get_max()
-    if "musicbrainz" in sources:
-        socketio.start_background_task(musicbrainz.webui, data)
-    if "spotify" in sources:
-        credentials = Config.get_spotify().split(";")
-        socketio.start_background_task(Spotify.search_spotify, data, credentials)
-    if "deezer" in sources:
-        socketio.start_background_task(Deezer.socket_search, data)
-    if "genius" in sources and data["type"] == "lyrics":
-        token = Config.get_genius()
-        socketio.start_background_task(Genius.search_song, data, token)
+    settings = Config.snapshot()
+    sources = settings.metadata_sources
+    data["max"] = settings.amount
+    credentials = settings.spotify_api.split(";") if "spotify" in sources else None
+    token = settings.genius_api if "genius" in sources else None
+    start_task(MetadataSearch.search, data, sources, credentials, token)
 
 
 @socketio.on("ytdl_download")
@@ -202,8 +256,9 @@ def download(fileData):
 
     width = fileData["width"] or 1920
     height = fileData["height"] or 1080
-    ffmpeg = Config.get_ffmpeg()
-    hw_transcoding = Config.get_hwt()
+    settings = Config.snapshot()
+    ffmpeg = settings.ffmpeg_directory
+    hw_transcoding = settings.hardware_transcoding
     vaapi_device = hw_transcoding.split(";")[1] if "vaapi" in hw_transcoding else ""
     verbose = str2bool(str(env.LOGGER))
     logger.info("Request to download %s", fileData["url"])
@@ -248,6 +303,76 @@ def fetch_mbp_album(album_id):
 @socketio.on("fetch_spotify_album")
 def fetch_spotify_album(input_id):
     logger.info("Request for Spotify album with id %s", input_id)
+    cred = Config.get_spotify().split(";")
+    spotify = Spotify(cred[1], cred[0])
+    spotify.sockets_album(input_id)
+
+
+@socketio.on("tag_album")
+def tag_album(data):
+    """
+    Tags the selected items with the tracks of an album.
+
+    Args:
+        data (dict): A dictionary containing the following keys:
+            - "source" (str): Spotify, Musicbrainz or Deezer.
+            - "album_id" (str): The ID of the Spotify album, Musicbrainz release or Deezer album.
+            - "items" (list): The IDs of the items to tag.
+    """
+    logger.info("Request to tag %s album %s", data["source"], data["album_id"])
+    credentials = (
+        Config.get_spotify().split(";") if data["source"] == "Spotify" else None
+    )
+    start_task(
+        AlbumTagger.tag, data["source"], data["album_id"], data["items"], credentials
+    )
+    return "OK"
+
+
+@socketio.on("auto_match")
+def auto_match(items):
+    """
+    Searches metadata for the selected items and tags the ones with a confident match.
+
+    Args:
+        items (list): The IDs of the items to match.
+    """
+    logger.info("Request to auto-match %d items", len(items))
+    sources = Config.get_metadata_sources()
+    credentials = Config.get_spotify().split(";") if "spotify" in sources else None
+    start_task(AutoMatch.match_items, items, sources, Config.get_max(), credentials)
+    return "OK"
+
+
+@socketio.on("refresh_library")
+def refresh_library(filters):
+    """
+    Re-tags the library items whose metadata changed at their provider.
+
+    Args:
+        filters (dict): A dictionary with the following optional keys:
+            - "source" (str): Only refresh items from Spotify, Musicbrainz, Deezer or Genius.
+            - "album" (str): Only refresh items of this album.
+            - "date_from" (str), "date_to" (str): Only refresh items released in this period.
+    """
+    logger.info("Request to refresh the library metadata")
+    spotify = Config.get_spotify()
+    credentials = spotify.split(";") if spotify else None
+    start_task(LibraryRefresh.refresh, filters, credentials, Config.get_genius())
+    return "OK"
+
+
+@socketio.on("import_library")
+def import_library():
+    """Registers the files below the library roots that aren't in the database yet."""
+    logger.info("Request to import the library files")
+    start_task(Scanner.import_library)
+    return "OK"
+
+
+@socketio.on("auto_match_queue")
+def auto_match_queue():
+    return list(review_queue.values())
 
 
 @socketio.on("fetch_spotify_track")
@@ -271,6 +396,13 @@ def fetch_genius_song(input_id):
     genius = Genius(token)
     song = genius.fetch_song(input_id)
     sockets.found_genius_song(song)
+    lyrics.prefetch(input_id, token)
+
+
+@socketio.on("prefetch_lyrics")
+def prefetch_lyrics(song_id):
+    logger.info("Prefetching the lyrics of Genius song %s", song_id)
+    lyrics.prefetch(song_id)
 
 
 @socketio.on("fetch_genius_album")
@@ -286,12 +418,23 @@ def merge_data(metadata, filepath):
     release_id = metadata["release_id"]
     cover = metadata["cover"]
     source = metadata["metadata_source"]
+    info = youtube.downloaded.pop(filepath)
+
+    if not source and info is not None and MetaData.can_tag(filepath):
+        # No result was picked, match the download on its yt-dlp info instead
+        sources = Config.get_metadata_sources()
+        credentials = Config.get_spotify().split(";") if "spotify" in sources else None
+        start_task(
+            AutoMatch.match_download,
+            filepath,
+            info,
+            sources,
+            Config.get_max(),
+            credentials,
+        )
+        return
 
-    if (
-        Database.check_trackid(release_id) is None
-        and Database.check_trackid(metadata.get("trackid", "")) is None
-    ):
-
+    if Database.check_trackids(release_id, metadata.get("trackid")) is None:
         metadata_user = metadata
         cover_source = (
             cover
@@ -300,45 +443,26 @@ def merge_data(metadata, filepath):
         )
         extension = filepath.split(".")[len(filepath.split(".")) - 1].upper()
         if extension in env.META_EXTENSIONS:
-            if source == "Spotify":
-                cred = Config.get_spotify().split(";")
-                spotify = Spotify(cred[1], cred[0])
-                metadata_source = spotify.fetch_track(release_id)
-                data = MetaData.get_spotify_data(
-                    filepath, metadata_user, metadata_source
-                )
-            elif source == "Musicbrainz":
-                metadata_source = musicbrainz.search_id_release(release_id)
-                data = MetaData.get_musicbrainz_data(
-                    filepath, metadata_user, metadata_source, cover_source
-                )
-            elif source == "Deezer":
-                metadata_source = Deezer.search_id(release_id)
-                data = MetaData.get_deezer_data(
-                    filepath, metadata_user, metadata_source
-                )
-            elif source == "Genius":
-                token = Config.get_genius()
-                genius = Genius(token)
-                metadata_source = genius.fetch_song(release_id)
-                lyrics = genius.fetch_lyrics(metadata_source["song"]["url"])
-                data = MetaData.get_genius_data(
-                    filepath, metadata_user, metadata_source, lyrics
-                )
-            elif source == "Unavailable":
-                data = MetaData.only_userdata(filepath, metadata_user)
-            else:
+            credentials = (
+                Config.get_spotify().split(";") if source == "Spotify" else None
+            )
+            token = Config.get_genius() if source == "Genius" else None
+            data = MetaData.from_source(
+                source,
+                filepath,
+                metadata_user,
+                release_id,
+                cover_source,
+                credentials,
+                token,
+            )
+            if data is None:
                 return
             if data is not False:
-                data["goal"] = "add"
-                data["extension"] = extension
-                data["source"] = source
-                if extension in ["MP3", "OPUS", "FLAC", "OGG"]:
-                    MetaData.merge_audio_data(data)
-                elif extension in ["MP4", "M4A"]:
-                    MetaData.merge_video_data(data)
-                elif extension in ["WAV"]:
-                    MetaData.merge_id3_data(data)
+                data.goal = "add"
+                data.extension = extension
+                data.source = source
+                MetaData.merge(data)
         else:
             # The name will be the filename of the downloaded file without the extension
             filename = os.path.split(filepath)[1]
@@ -391,120 +515,91 @@ def update_item(data):
 
 @socketio.on("download_items")
 def download_items(items):
-    try:
-        output_string = "".join(
-            random.SystemRandom().choice(string.ascii_letters + string.digits)
-            for _ in range(5)
-        )
-        tmpdir = mkdtemp()
-        zip_filename = "items_" + output_string + ".zip"
-        zip_filepath = os.path.join(tmpdir, zip_filename)
-        zipfile = ZipFile(zip_filepath, "w")
-        for item in items:
-            filepath = Database.fetch_item(item).filepath
-            filename = os.path.split(filepath)[1]
-            if os.path.exists(filepath) and os.path.isfile(filepath):
-                zipfile.write(filepath, filename)
-        zipfile.close()
-        file = open(zip_filepath, "rb")
-        content = file.read()
-        file.close()
-        magic = Magic(mime=True)
-        mime = magic.from_file(zip_filepath)
-        sockets.overview(
-            {
-                "msg": "download_file",
-                "data": content,
-                "filename": zip_filename,
-                "mimetype": mime,
-            }
-        )
-    finally:
+    url = media.sign_items(items)
+    sockets.overview({"msg": "download_file", "url": url, "filename": "items.zip"})
+    return url
+
+
+def remove_files(paths) -> None:
+    for path in paths:
         try:
-            shutil.rmtree(tmpdir)
-        except OSError as e:
-            logger.error(
-                "An error occurred whilst deleting the temporary file: %s", str(e)
-            )
+            os.unlink(path)
+        except OSError:
+            pass
 
 
 @socketio.on("delete_item")
 def delete_item(items):
-    items = json.loads(items)
-    for id in items:
-        item = Database.fetch_item(id)
-        try:
-            os.unlink(item.filepath)
-        except Exception:
-            pass
-        item.delete()
-    socket_data = (
-        {"msg": "Item succesfully deleted!"}
-        if len(items) > 1
-        else {"msg": "delete_items"}
-    )
-    sockets.overview(socket_data)
+    rows = Database.delete_many(json.loads(items))
+    # Unlinking blocks on the file system, so it runs on a native thread
+    paths = [row.filepath for row in rows]
+    gevent.get_hub().threadpool.apply(remove_files, (paths,))
     return "OK"
 
 
-@socketio.on("download_item")
-def download_item(input):
+@bp.route("/media/<token>")
+def stream_item(token):
+    data = media.verify(token)
+    if data is None:
+        e = "This link is invalid or has expired"
+        return render_template("errors.html", e=e), 403
+    item = Database.fetch_item(data["id"])
+    if item is None or not os.path.isfile(item.filepath):
+        return render_template("errors.html", e="File not found"), 404
+    return media.send(item, data["download"])
+
+
+@bp.route("/media/items/<token>")
+def stream_items(token):
+    ids = media.verify(token, media.ARCHIVE_SALT)
+    if ids is None:
+        e = "This link is invalid or has expired"
+        return render_template("errors.html", e=e), 403
+    return media.send_items(Database.query.filter(Database.id.in_(ids)).all())
+
+
+def find_item(input):
     item = Database.fetch_item(input)
     if item is None:
         item = Database.check_file(input)
-        if item is None:
-            sockets.overview({"msg": "Filepath invalid"})
-            return False
-    path = item.filepath
-    if os.path.exists(path) and os.path.isfile(path):
-        if Database.check_file(path) is not None:
-            extension = path.split(".")[len(path.split(".")) - 1]
-            filename = str(item.name) + "." + str(extension)
-            magic = Magic(mime=True)
-            mimetype = magic.from_file(path)
-            with open(path, "rb") as file:
-                content = file.read()
-            sockets.overview(
-                {
-                    "msg": "download_file",
-                    "data": content,
-                    "filename": filename,
-                    "mimetype": mimetype,
-                }
-            )
-        else:
-            sockets.overview({"msg": "Filepath invalid"})
-    else:
+    if item is None or not os.path.isfile(item.filepath):
         sockets.overview({"msg": "Filepath invalid"})
+        return None
+    return item
+
+
+@socketio.on("download_item")
+def download_item(input):
+    item = find_item(input)
+    if item is None:
+        return False
+    extension = item.filepath.split(".")[-1]
+    url = media.sign(item.id, download=True)
+    sockets.overview(
+        {
+            "msg": "download_file",
+            "url": url,
+            "filename": str(item.name) + "." + str(extension),
+        }
+    )
+    return url
 
 
 @socketio.on("play_item")
 def play_item(input):
-    item = Database.fetch_item(input)
+    item = find_item(input)
     if item is None:
-        item = Database.check_file(input)
-        if item is None:
-            sockets.overview({"msg": "Filepath invalid"})
-            return False
-    path = item.filepath
-    if os.path.exists(path) and os.path.isfile(path):
-        if Database.check_file(path) is not None:
-            magic = Magic(mime=True)
-            mimetype = magic.from_file(path)
-            with open(path, "rb") as file:
-                content = file.read()
-            sockets.overview(
-                {
-                    "msg": "play_file",
-                    "data": content,
-                    "item_data": Database.item_to_dict(item),
-                    "mimetype": mimetype,
-                }
-            )
-        else:
-            sockets.overview({"msg": "Filepath invalid"})
-    else:
-        sockets.overview({"msg": "Filepath invalid"})
+        return False
+    url = media.sign(item.id)
+    sockets.overview(
+        {
+            "msg": "play_file",
+            "url": url,
+            "item_data": Database.item_to_dict(item),
+            "mimetype": mime.from_file(item.filepath),
+        }
+    )
+    return url
 
 
 @socketio.on("show_file_browser")
@@ -630,11 +725,7 @@ def edit_metadata(id):
     metadata["audio_id"] = item.audio_id
     metadata["item_id"] = item.id
     metadata["cover"] = item.cover
-    metadata_sources = Config.get_metadata_sources()
-    metadata_form = render_template(
-        "metadata_form.html", metadata_sources=metadata_sources
-    )
-    sockets.edit_metadata({"metadata": metadata, "metadata_view": metadata_form})
+    sockets.edit_metadata({"metadata": metadata, "metadata_view": metadata_form()})
 
 
 @socketio.on("edit_file")
@@ -669,23 +760,14 @@ def edit_file_request(filepath, id):
     if item is not None:
         extension = item.filepath.split(".")[len(item.filepath.split(".")) - 1].upper()
         new_extension = filepath.split(".")[len(item.filepath.split(".")) - 1].upper()
-        if item.cover != os.path.join(
-            env.BASE_DIR, "metatube/static/images/empty_cover.png"
-        ):
-            try:
-                response = requests.get(item.cover)
-                image = response.content
-                magic = Magic(mime=True)
-                mime_type = magic.from_buffer(image)
-            except Exception:
-                sockets.download_progress(
-                    {"status": "error", "message": "Cover URL is invalid!"}
-                )
-                return False
-        else:
-            file = open(item.cover, "rb")
-            image = file.read()
-            mime_type = "image/png"
+        cover = Cover(item.cover)
+        try:
+            cover.load()
+        except Exception:
+            sockets.download_progress(
+                {"status": "error", "message": "Cover URL is invalid!"}
+            )
+            return False
         if extension in ["MP3", "OPUS", "FLAC", "OGG"]:
             metadata_item = MetaData.read_audio_metadata(item.filepath)
 
@@ -694,19 +776,16 @@ def edit_file_request(filepath, id):
             metadata_item["barcode"] = ""
             metadata_item["language"] = ""
 
-        metadata_item["track_id"] = item.audio_id
-        metadata_item["cover_path"] = item.cover
-        metadata_item["cover_mime_type"] = mime_type
-        metadata_item["image"] = image
-        metadata_item["item_id"] = item.id
-        metadata_item["goal"] = "edit"
-        metadata_item["extension"] = new_extension
-        metadata_item["filename"] = filepath
-
-        if new_extension in ["MP3", "OPUS", "FLAC", "OGG"]:
-            MetaData.merge_audio_data(metadata_item)
-        elif new_extension in ["MP4", "M4A"]:
-            MetaData.merge_video_data(metadata_item)
+        track = TrackMetadata.from_dict(
+            metadata_item,
+            track_id=item.audio_id,
+            cover=cover,
+            item_id=item.id,
+            goal="edit",
+            extension=new_extension,
+            filename=filepath,
+        )
+        MetaData.merge(track)
         head, tail = os.path.split(filepath)
         move(filepath, os.path.join(head, tail[4 : len(tail)]))
         try:
@@ -723,24 +802,17 @@ def edit_metadata_request(metadata_user, filepath, id):
     extension = filepath.split(".")[len(filepath.split(".")) - 1].upper()
     data = MetaData.only_userdata(filepath, metadata_user)
     if data is not False:
-        data["goal"] = "edit"
-        data["item_id"] = id
-        data["extension"] = extension
-        data["source"] = metadata_user["source"]
-        if extension in ["MP3", "OPUS", "FLAC", "OGG"]:
-            MetaData.merge_audio_data(data)
-        elif extension in ["MP4", "M4A"]:
-            MetaData.merge_video_data(data)
-        elif extension in ["WAV"]:
-            MetaData.merge_id3_data(data)
-        else:
-            return False
+        data.goal = "edit"
+        data.item_id = id
+        data.extension = extension
+        data.source = metadata_user["source"]
+        return MetaData.merge(data)
 
 
 @bp.context_processor
 def utility_processor():
     def path_exists(path):
-        return os.path.exists(path)
+        return watcher.path_exists(path)
 
     def get_ext(filepath):
         return filepath.split(".")[len(filepath.split(".")) - 1].upper()
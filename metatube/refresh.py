@@ -0,0 +1,323 @@
+import json
+import re
+import time
+
+import gevent
+from dateutil import parser
+from gevent.pool import Pool
+
+import metatube.lyrics as lyrics_cache
+from metatube import Config as env
+from metatube import logger, sockets
+from metatube.cover import DEFAULT_COVER
+from metatube.database import Database, RefreshJob
+from metatube.metadata import NO_USERDATA, MetaData
+from metatube.tagwriter import TagWriter
+from metatube.tasks import bind
+
+# How the stored track IDs of every provider look, checked in this order
+ID_PATTERNS = (
+    (
+        "Musicbrainz",
+        re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"),
+    ),
+    ("Spotify", re.compile(r"^[0-9A-Za-z]{22}$")),
+    ("Deezer", re.compile(r"^[0-9]+$")),
+)
+
+# File tags that are compared next to the database columns
+TAG_FIELDS = ("genres", "isrc", "tracknr")
+
+# IDs of the refresh jobs that are running in this process
+running = set()
+
+
+class TokenBucket:
+    """
+    Limits the rate of requests to a provider.
+
+    The bucket holds up to `burst` tokens and gains `rate` tokens per second.
+    Every request takes a token, waiting (cooperatively) for one if the bucket
+    is empty.
+    """
+
+    def __init__(self, name, rate, burst=None) -> None:
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(burst or max(self.rate, 1.0))
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def take(self) -> float:
+        """Takes a token and returns how many seconds it had to wait for it."""
+        waited = 0.0
+        while True:
+            self.refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited
+            delay = (1 - self.tokens) / self.rate
+            gevent.sleep(delay)
+            waited += delay
+
+
+budgets: dict[str, TokenBucket] = {}
+
+
+def parse_rates(rates) -> dict:
+    """Parses rates like 'deezer:5;musicbrainz:1' into a dict keyed by provider name."""
+    parsed = {}
+    for pair in str(rates).split(";"):
+        name, _, rate = pair.partition(":")
+        try:
+            if float(rate) > 0:
+                parsed[name.strip().capitalize()] = float(rate)
+        except ValueError:
+            logger.warning("Ignoring invalid refresh rate '%s'", pair)
+    return parsed
+
+
+def get_budget(name) -> TokenBucket:
+    if name not in budgets:
+        rate = parse_rates(env.REFRESH_RATES).get(name, 1.0)
+        budgets[name] = TokenBucket(name, rate)
+    return budgets[name]
+
+
+class LibraryRefresh:
+    """
+    Re-tags library items with the current metadata of the track they were tagged with.
+
+    Items are walked in ID order in batches. Every item is looked up again by
+    its stored track ID, within the rate budget of its provider, and only the
+    files whose metadata changed are rewritten. Progress is stored after every
+    batch, so a refresh with the same filters resumes where it stopped.
+    """
+
+    def __init__(self, filters, spotify_credentials=None, genius_token=None) -> None:
+        self.source = filters.get("source") or None
+        self.album = filters.get("album") or None
+        self.date_from = LibraryRefresh.parse_date(filters.get("date_from"))
+        self.date_to = LibraryRefresh.parse_date(filters.get("date_to"))
+        self.filters = json.dumps(
+            {
+                "source": self.source,
+                "album": self.album,
+                "date_from": filters.get("date_from") or None,
+                "date_to": filters.get("date_to") or None,
+            },
+            sort_keys=True,
+        )
+        self.spotify_credentials = spotify_credentials
+        self.genius_token = genius_token
+
+    @staticmethod
+    def parse_date(value):
+        try:
+            return parser.parse(value) if value else None
+        except (ValueError, OverflowError):
+            logger.warning("Ignoring invalid refresh date '%s'", value)
+            return None
+
+    @staticmethod
+    def source_of(audio_id, source=None, tags=None):
+        """
+        Returns which provider a stored track ID belongs to, or None.
+
+        Deezer and Genius both use numeric IDs. Files tagged from Deezer carry
+        the ID in their deezer_trackid tag, other numeric IDs are only refreshed
+        when the source filter names their provider.
+        """
+        audio_id = str(audio_id or "")
+        for name, pattern in ID_PATTERNS:
+            if pattern.match(audio_id):
+                if name != "Deezer":
+                    return name
+                if str((tags or {}).get("deezer_trackid") or "") == audio_id:
+                    return "Deezer"
+                return source if source in ("Deezer", "Genius") else None
+        return None
+
+    @staticmethod
+    def changes(item, tags, track) -> dict:
+        """Returns the fields that differ between an item and its new metadata, as (old, new) pairs."""
+        row = track.row()
+        old = {
+            "name": item.name,
+            "artist": item.artist,
+            "album": item.album,
+            "image": item.cover,
+        }
+        new = {
+            "name": row["name"],
+            "artist": row["artist"],
+            "album": row["album"],
+            "image": row["image"],
+        }
+        # Without a release date the track gets today's date, which isn't a change
+        try:
+            new["date"] = parser.parse(track.release_date).date()
+            old["date"] = item.date.date() if item.date is not None else None
+        except (ValueError, OverflowError, TypeError):
+            pass
+        for key in TAG_FIELDS:
+            if tags is not None and key in tags:
+                old[key] = tags[key]
+                new[key] = getattr(track, key)
+        return {
+            key: (old[key], new[key])
+            for key in new
+            if str(old[key] or "") != str(new[key] or "")
+        }
+
+    def resolve(self, item, source):
+        """Fetches the current metadata of an item, or None if the lookup failed."""
+        get_budget(source).take()
+        try:
+            track = MetaData.from_source(
+                source,
+                item.filepath,
+                NO_USERDATA,
+                item.audio_id,
+                item.cover or DEFAULT_COVER,
+                self.spotify_credentials,
+                self.genius_token,
+            )
+        except Exception as e:
+            logger.error("Looking up %s %s failed: %s", source, item.audio_id, str(e))
+            return None
+        if not track:
+            return None
+        track.extension = item.filepath.split(".")[-1].upper()
+        track.source = source
+        track.goal = "edit"
+        track.item_id = item.id
+        return track
+
+    def check(self, job):
+        item, source, tags = job
+        track = self.resolve(item, source)
+        diff = LibraryRefresh.changes(item, tags, track) if track is not None else None
+        return item, track, diff
+
+    def select(self, items) -> list:
+        """Returns the items of a batch that match the source filter, with their provider and tags."""
+        candidates = [
+            item
+            for item in items
+            if MetaData.can_tag(item.filepath)
+            and any(p.match(str(item.audio_id or "")) for _, p in ID_PATTERNS)
+        ]
+        tags = MetaData.read_metadata_batch([item.filepath for item in candidates])
+        selected = []
+        for item in candidates:
+            item_tags = tags.get(item.filepath)
+            source = LibraryRefresh.source_of(item.audio_id, self.source, item_tags)
+            if source is None or (self.source is not None and source != self.source):
+                continue
+            selected.append((item, source, item_tags))
+        return selected
+
+    @staticmethod
+    def rewrite(changed) -> int:
+        """Rewrites the changed items and updates their rows, returns how many succeeded."""
+        tracks = []
+        for item, track in changed:
+            try:
+                track.cover.load()
+                tracks.append((item, track))
+            except Exception:
+                logger.error("Cover of %s is invalid, keeping its old tags", item.name)
+        written = TagWriter.write_many([track for _, track in tracks])
+        updates = []
+        for (item, track), ok in zip(tracks, written, strict=True):
+            track.cover.release()
+            if not ok:
+                continue
+            row = track.row()
+            if len(str(track.release_date or "")) < 1 and item.date is not None:
+                row["date"] = item.date
+            updates.append((item, row))
+            if track.lyrics is None and track.lyrics_id is not None:
+                lyrics_cache.write_later(track)
+        if len(updates) > 0:
+            Database.update_many(updates)
+        return len(updates)
+
+    def run(self, job=None):
+        job = job or RefreshJob.find(self.filters) or RefreshJob.start(self.filters)
+        if job.id in running:
+            sockets.overview({"msg": "This library refresh is running already"})
+            return job
+        running.add(job.id)
+        if job.last_id > 0:
+            logger.info("Resuming library refresh %d after item %d", job.id, job.last_id)
+        pool = Pool(int(env.REFRESH_CONCURRENCY))
+        # The lookups store ISRC mappings and read cached lyrics
+        check = bind(self.check)
+        try:
+            while True:
+                items = Database.filter_records(
+                    self.album,
+                    self.date_from,
+                    self.date_to,
+                    job.last_id,
+                    int(env.REFRESH_BATCH_SIZE),
+                )
+                if len(items) < 1:
+                    break
+                selected = self.select(items)
+                changed, failed = [], 0
+                for item, track, diff in pool.imap_unordered(check, selected):
+                    if track is None:
+                        failed += 1
+                    elif len(diff) > 0:
+                        logger.debug("%s changed: %s", item.name, ", ".join(diff))
+                        changed.append((item, track))
+                written = LibraryRefresh.rewrite(changed)
+                job.checkpoint(
+                    items[-1].id,
+                    len(selected),
+                    written,
+                    failed + len(changed) - written,
+                )
+                sockets.refresh_progress(
+                    {
+                        "job": job.id,
+                        "processed": job.processed,
+                        "changed": job.changed,
+                        "failed": job.failed,
+                        "finished": False,
+                    }
+                )
+            job.finish()
+            sockets.refresh_progress(
+                {
+                    "job": job.id,
+                    "processed": job.processed,
+                    "changed": job.changed,
+                    "failed": job.failed,
+                    "finished": True,
+                }
+            )
+        finally:
+            running.discard(job.id)
+        return job
+
+    @staticmethod
+    def refresh(filters, spotify_credentials=None, genius_token=None):
+        """Refreshes the matching items, resuming an interrupted refresh with the same filters."""
+        refresh = LibraryRefresh(filters, spotify_credentials, genius_token)
+        try:
+            return refresh.run()
+        except Exception as e:
+            logger.error("Library refresh has failed: %s", str(e))
+            sockets.overview(
+                {"msg": "Library refresh has failed, it resumes from its last checkpoint"}
+            )
+            return None
@@ -2,7 +2,7 @@ import json
 
 from flask import render_template
 
-from metatube import socketio
+from metatube import singleflight, socketio
 from metatube.database import Templates
 
 
@@ -32,5 +32,10 @@ def fetch_template(_id):
         socketio.emit("template", {"response": "Invalid ID"})
 
 
+@socketio.on("provider_stats")
+def provider_stats():
+    return singleflight.stats()
+
+
 def error(e):
     return render_template("errors.html", e=e)
@@ -0,0 +1,184 @@
+import os
+from datetime import datetime
+
+import gevent
+from dateutil import parser
+from sqlalchemy import delete, insert
+
+from metatube import Config as env
+from metatube import db, logger, sockets
+from metatube.database import Database, ScanIndex, Templates
+from metatube.metadata import MetaData
+from metatube.watcher import outermost
+
+# Cover the client shows for items without one
+EMPTY_COVER = "/static/images/empty_cover.png"
+# Missing parts of partial release dates, so '1987' becomes the 1st of January
+DATE_DEFAULT = datetime(2000, 1, 1)
+# Rows per statement when the index is updated
+CHUNK_SIZE = 500
+
+
+class Scanner:
+    """
+    Registers existing files below the library roots in the database.
+
+    Every scanned file is recorded with its size and mtime in the scan index,
+    so a re-scan only reads the tags of files that are new or changed and a
+    scan without changes only walks the directories.
+    """
+
+    @staticmethod
+    def roots() -> list:
+        if len(env.SCAN_ROOTS) > 0:
+            roots = env.SCAN_ROOTS.split(";")
+        else:
+            templates = Templates.fetch_all_templates()
+            roots = [template.output_folder for template in templates]
+            roots.append(env.DOWNLOADS)
+        # Nested roots would be walked twice
+        return outermost(roots)
+
+    @staticmethod
+    def extensions() -> set:
+        return set(env.AUDIO_EXTENSIONS) | set(env.VIDEO_EXTENSIONS)
+
+    @staticmethod
+    def walk(root, extensions) -> dict:
+        """Returns the (size, mtime) of every media file below a directory, by path."""
+        files = {}
+        stack = [root]
+        while len(stack) > 0:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError as e:
+                logger.warning("Can't scan %s: %s", root, str(e))
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.split(".")[-1].upper() in extensions:
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+        return files
+
+    @staticmethod
+    def walk_all(roots) -> dict:
+        extensions = Scanner.extensions()
+        files = {}
+        for root in roots:
+            files.update(Scanner.walk(root, extensions))
+        return files
+
+    @staticmethod
+    def row(filepath, tags, mtime) -> dict:
+        """Builds the database row of a file from its tags, or from its name."""
+        tags = tags or {}
+        name = tags.get("title") or os.path.splitext(os.path.basename(filepath))[0]
+        try:
+            date = parser.parse(str(tags.get("release_date")), default=DATE_DEFAULT)
+        except (ValueError, OverflowError):
+            date = datetime.fromtimestamp(mtime / 1e9)
+        try:
+            length = int(float(tags.get("length") or 0))
+        except (TypeError, ValueError):
+            length = 0
+        return {
+            "filepath": filepath,
+            "name": name,
+            "artist": tags.get("artists") or "Unknown",
+            "album": tags.get("album") or "Unknown",
+            "date": date,
+            "length": length,
+            "cover": EMPTY_COVER,
+            "audio_id": tags.get("mbp_releaseid") or None,
+        }
+
+    @staticmethod
+    def update_index(files, paths, removed) -> None:
+        """
+        Stores the (size, mtime) of the read paths and drops the removed ones,
+        without committing.
+        """
+        stale = list(paths) + list(removed)
+        for i in range(0, len(stale), CHUNK_SIZE):
+            db.session.execute(
+                delete(ScanIndex).where(ScanIndex.path.in_(stale[i : i + CHUNK_SIZE]))
+            )
+        entries = [
+            {"path": path, "size": files[path][0], "mtime": files[path][1]}
+            for path in paths
+        ]
+        if len(entries) > 0:
+            db.session.execute(insert(ScanIndex), entries)
+
+    @staticmethod
+    def scan(roots=None, workers=None) -> dict:
+        roots = roots or Scanner.roots()
+        # Walking blocks on the file system, so it runs on a native thread
+        files = gevent.get_hub().threadpool.apply(Scanner.walk_all, (roots,))
+        index = ScanIndex.load()
+        changed = [path for path, stat in files.items() if index.get(path) != stat]
+        removed = [
+            path
+            for path in index
+            if path not in files
+            and any(path.startswith(root + os.sep) for root in roots)
+        ]
+        logger.info(
+            "Scanned %d files, %d new or changed, %d removed",
+            len(files),
+            len(changed),
+            len(removed),
+        )
+        if len(changed) < 1 and len(removed) < 1:
+            return {"scanned": len(files), "inserted": [], "updated": 0}
+
+        tags = MetaData.read_metadata_batch(changed, workers)
+        rows = [Scanner.row(path, tags.get(path), files[path][1]) for path in changed]
+        existing = {
+            item.filepath: item
+            for i in range(0, len(changed), CHUNK_SIZE)
+            for item in Database.query.filter(
+                Database.filepath.in_(changed[i : i + CHUNK_SIZE])
+            )
+        }
+        new = [row for row in rows if row["filepath"] not in existing]
+        # Files that are in the library already only get their changed tags
+        updated = 0
+        for row in rows:
+            item = existing.get(row["filepath"])
+            if item is not None and tags.get(row["filepath"]) is not None:
+                item.name = row["name"]
+                item.artist = row["artist"]
+                item.album = row["album"]
+                item.date = row["date"]
+                item.length = row["length"]
+                updated += 1
+        Scanner.update_index(files, changed, removed)
+        # insert_many commits the new items, the updated ones and the index at once
+        inserted = Database.insert_many(new)
+        logger.info("Imported %d files, updated %d items", len(inserted), updated)
+        return {"scanned": len(files), "inserted": inserted, "updated": updated}
+
+    @staticmethod
+    def import_library(roots=None):
+        try:
+            result = Scanner.scan(roots)
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Scanning the library has failed: %s", str(e))
+            sockets.overview({"msg": "Scanning the library has failed"})
+            return None
+        sockets.overview(
+            {
+                "msg": "scanned_library",
+                "scanned": result["scanned"],
+                "inserted": len(result["inserted"]),
+                "updated": result["updated"],
+            }
+        )
+        return result
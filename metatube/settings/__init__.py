@@ -5,7 +5,7 @@ import sys
 from flask import Blueprint, render_template
 
 from metatube import Config as env
-from metatube import socketio, sockets
+from metatube import socketio, sockets, watcher
 from metatube.database import Config, Templates
 from metatube.ffmpeg import ffmpeg
 
@@ -155,6 +155,7 @@ def template(
                 sockets.change_template("Name is already in use")
                 return False
             data["id"] = Templates.add(data)
+            watcher.update_roots()
             sockets.template_settings(
                 {
                     "status": "new_template",
@@ -169,6 +170,7 @@ def template(
                 sockets.change_template("Template doesn't exist")
                 return False
             editing_template.edit(data)
+            watcher.update_roots()
             sockets.template_settings(
                 {
                     "status": "changed_template",
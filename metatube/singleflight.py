@@ -0,0 +1,107 @@
+from functools import wraps
+from threading import Event, Lock
+
+from metatube import logger
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Makes concurrent calls with the same key share a single execution.
+
+    The first caller for a key runs the function, every caller that arrives
+    while that call is still in flight waits for it and receives the same
+    result (or exception). Nothing is cached once the call has finished.
+    """
+
+    def __init__(self, name) -> None:
+        self.name = name
+        self._lock = Lock()
+        self._calls: dict = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            logger.debug("Coalesced %s call for %s", self.name, key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+groups: dict[str, SingleFlight] = {}
+
+
+def group(name) -> SingleFlight:
+    if name not in groups:
+        groups[name] = SingleFlight(name)
+    return groups[name]
+
+
+def coalesce(name, key=None):
+    """
+    Decorator that routes calls of a function through the `name` group.
+
+    By default the call is keyed on all positional and keyword arguments; pass
+    `key` to build the key yourself, for instance to leave out `self`.
+    """
+
+    def decorator(fn):
+        flight = group(name)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            call_key = (
+                key(*args, **kwargs)
+                if key is not None
+                else (args, tuple(sorted(kwargs.items())))
+            )
+            return flight.do(call_key, fn, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def stats() -> dict:
+    return {name: flight.stats() for name, flight in groups.items()}
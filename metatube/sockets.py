@@ -25,6 +25,10 @@ def musicbrainz_results(data) -> None:
     socketio.emit("mbp_response", data)
 
 
+def metadata_results(data) -> None:
+    socketio.emit("metadata_results", data)
+
+
 def youtube_results(data, download_form, metadata_form) -> None:
     socketio.emit("ytdl_response", (data, download_form, metadata_form))
 
@@ -73,6 +77,18 @@ def found_spotify_track(data) -> None:
     socketio.emit("spotify_track", data)
 
 
+def found_spotify_album(data) -> None:
+    socketio.emit("spotify_album", data)
+
+
+def auto_match_review(data) -> None:
+    socketio.emit("auto_match_review", data)
+
+
+def refresh_progress(data) -> None:
+    socketio.emit("refresh_progress", data)
+
+
 def deezer_search(data) -> None:
     socketio.emit("deezer_response", data)
 
@@ -4,6 +4,7 @@ import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOauthError
 
 from metatube import logger, sockets
+from metatube.singleflight import coalesce
 
 
 class SpotifyMetadata:
@@ -42,15 +43,30 @@ class SpotifyMetadata:
         Returns:
             bool: True if the search was successful, False otherwise.
         """
-        search_results = self.spotify.search(f"track:{data['title']}", data["max"])
+        search_results = self.find(data)
         # If no results are found return False
+        if search_results is None:
+            return False
+        sockets.spotify_search(search_results)
+        return True
+
+    def find(self, data):
+        """
+        Searches Spotify for a track without emitting the results.
+
+        Args:
+            data (dict): A dictionary containing the track title and maximum number of results.
+
+        Returns:
+            dict | None: The search results with the original query attached, or None if nothing was found.
+        """
+        search_results = self.spotify.search(f"track:{data['title']}", data["max"])
         if search_results is None or search_results["tracks"]["total"] == 0:
             logging.info("No results found for %s", data["title"])
-            return False
+            return None
         search_results["query"] = data["title"]
-        sockets.spotify_search(search_results)
         logger.info("Searched Spotify for track '%s' ", data["title"])
-        return True
+        return search_results
 
     def sockets_track(self, track_id: str) -> None:
         """
@@ -62,8 +78,9 @@ class SpotifyMetadata:
         Returns:
             None
         """
-        sockets.found_spotify_track(self.spotify.track(track_id))
+        sockets.found_spotify_track(self.fetch_track(track_id))
 
+    @coalesce("spotify.track", key=lambda self, track_id: track_id)
     def fetch_track(self, track_id):
         """
         Fetches a track from Spotify based on the given track ID.
@@ -76,6 +93,60 @@ class SpotifyMetadata:
         """
         return self.spotify.track(track_id)
 
+    @coalesce("spotify.isrc", key=lambda self, isrc: isrc)
+    def find_isrc(self, isrc):
+        """
+        Searches Spotify for the track with the given ISRC.
+
+        Args:
+            isrc (str): The ISRC of the track.
+
+        Returns:
+            dict | None: The track, or None if Spotify doesn't know the ISRC.
+        """
+        results = self.spotify.search(f"isrc:{isrc}", limit=1, type="track")
+        items = results["tracks"]["items"] if results is not None else []
+        return items[0] if len(items) > 0 else None
+
+    def sockets_album(self, album_id: str) -> None:
+        """
+        Retrieves a Spotify album using the provided album ID and passes it to the `found_spotify_album` method of the `sockets` module.
+
+        Args:
+            album_id (str): The ID of the Spotify album.
+
+        Returns:
+            None
+        """
+        sockets.found_spotify_album(self.fetch_album(album_id))
+
+    @coalesce("spotify.album", key=lambda self, album_id: album_id)
+    def fetch_album(self, album_id):
+        """
+        Fetches an album from Spotify with all of its tracks.
+
+        The tracks in an album response lack their ISRCs, so they are replaced
+        by the full track objects, which are fetched 50 at a time.
+
+        Args:
+            album_id (str): The ID of the album to fetch.
+
+        Returns:
+            dict: A dictionary containing the album information.
+        """
+        album = self.spotify.album(album_id)
+        page = album["tracks"]
+        items = list(page["items"])
+        while page["next"]:
+            page = self.spotify.next(page)
+            items.extend(page["items"])
+        ids = [item["id"] for item in items]
+        tracks = []
+        for start in range(0, len(ids), 50):
+            tracks.extend(self.spotify.tracks(ids[start : start + 50])["tracks"])
+        album["tracks"]["items"] = tracks
+        return album
+
     @staticmethod
     def search_spotify(query: str, credentials: tuple) -> None:
         """
@@ -552,6 +552,46 @@ $(document).ready(function () {
     create_dropdown_menu(item_data["id"], item_data["ytid"]);
   }
 
+  // Keyset pagination state of the item table; the first page is rendered by the server
+  let listing = {
+    sort: "id",
+    cursor: $("#record_stable").attr("data-cursor") || null,
+    loading: false,
+    searching: false,
+  };
+
+  function load_items(reset) {
+    if (reset) {
+      listing.cursor = null;
+      listing.searching = false;
+    } else if (listing.cursor == null || listing.searching) {
+      return;
+    }
+    if (listing.loading) {
+      return;
+    }
+    listing.loading = true;
+    let params = { sort: listing.sort };
+    if (listing.cursor != null) {
+      params.after = listing.cursor;
+    }
+    let url = $("#record_stable").attr("data-items-url") + "?" + $.param(params);
+    fetch(url)
+      .then((response) => response.json())
+      .then((page) => {
+        if (reset) {
+          $("#record_stable").children("tbody").empty();
+        }
+        for (let i = 0; i < page.items.length; i++) {
+          add_item({ data: page.items[i] });
+        }
+        listing.cursor = page.next;
+      })
+      .finally(() => {
+        listing.loading = false;
+      });
+  }
+
   function downloadURI(uri, name) {
     var link = document.createElement("a");
     link.download = name;
@@ -1163,6 +1203,14 @@ $(document).ready(function () {
     }
   });
 
+  $(document).on("change", ".audio_col-checkbox", function () {
+    // Start scraping the lyrics as soon as a Genius result is selected
+    let item = $(this).parents("li");
+    if (item.find("span.metadata_source").text() == "Genius") {
+      socket.emit("prefetch_lyrics", item.attr("id"));
+    }
+  });
+
   $(document).on("click", "#fetch_genius_album", function () {
     let album_id = $(this).parent().siblings("input").val();
     if (album_id.length > 0) {
@@ -1545,6 +1593,45 @@ $(document).ready(function () {
     socket.emit("download_items", items);
   });
 
+  $("#auto_match_items").on("click", function () {
+    let items = [];
+    for (let i = 0; i < $(".select_item:checked").length; i++) {
+      items.push($($(".select_item:checked")[i]).parents("tr").attr("id"));
+    }
+    socket.emit("auto_match", items);
+    $("#overview_log").text("Searching metadata for " + items.length + " items...");
+  });
+
+  $("#tag_album_form").on("submit", function (e) {
+    e.preventDefault();
+    let items = [];
+    for (let i = 0; i < $(".select_item:checked").length; i++) {
+      items.push($($(".select_item:checked")[i]).parents("tr").attr("id"));
+    }
+    socket.emit("tag_album", {
+      source: $("#tag_album_source").val(),
+      album_id: $("#tag_album_id").val().trim(),
+      items: items,
+    });
+    $("#overview_log").text("Tagging " + items.length + " items...");
+  });
+
+  $("#refresh_library_form").on("submit", function (e) {
+    e.preventDefault();
+    socket.emit("refresh_library", {
+      source: $("#refresh_source").val(),
+      album: $("#refresh_album").val().trim(),
+      date_from: $("#refresh_date_from").val(),
+      date_to: $("#refresh_date_to").val(),
+    });
+    $("#overview_log").text("Refreshing library metadata...");
+  });
+
+  $("#import_library").on("click", function () {
+    socket.emit("import_library");
+    $("#overview_log").text("Scanning the library for new files...");
+  });
+
   $("#delete_items").on("click", function () {
     let items = [];
     for (let i = 0; i < $(".select_item:checked").length; i++) {
@@ -1681,14 +1768,27 @@ $(document).ready(function () {
   });
 
   $("#search_item").on("keyup", function () {
-    var table = $("#record_stable").children("tbody").clone(true, true);
     if ($(this).val().length > 2) {
+      listing.searching = true;
       socket.emit("search_item", $(this).val());
-    } else if ($(this).val() == "") {
-      socket.emit("fetch_all_items");
+    } else if ($(this).val() == "" && listing.searching) {
+      load_items(true);
     }
   });
 
+  $("#record_stable").parent().on("scroll", function () {
+    if (this.scrollTop + this.clientHeight >= this.scrollHeight - 300) {
+      load_items(false);
+    }
+  });
+
+  $(".sort_items").on("click", function () {
+    let sort = $(this).attr("data-sort");
+    listing.sort = listing.sort == sort ? "-" + sort : sort;
+    $("#search_item").val("");
+    load_items(true);
+  });
+
   $("#add_video").on("click", function () {
     if ($("#progress").text() == "100%") {
       $("#default_view, #download_btn").removeClass("d-none");
@@ -1933,6 +2033,17 @@ $(document).ready(function () {
     }
   });
 
+  socket.on("metadata_results", (data) => {
+    console.info("Finished searching metadata providers", data.providers);
+    if (data.results.length < 1 && $("#audio_col").children().length < 1) {
+      $("#default_view").children(".spinner-border").remove();
+      $("#next_btn, #otherp").addClass("d-none");
+      $(
+        "#404p, #search_video_modal_footer, #edit_metadata, #reset_view_btn, #genius_btn",
+      ).removeClass("d-none");
+    }
+  });
+
   socket.on("template", (response) => {
     data = response;
     response = JSON.parse(response);
@@ -2133,25 +2244,68 @@ $(document).ready(function () {
     $("#download_modal").animate({ scrollTop: 0 }, "fast");
   });
 
+  function update_row(item) {
+    let tr = $("tr#" + item.item_id);
+    tr.find("img").attr("src", item.image);
+    tr.find("img").siblings("span").text(item.name);
+    tr.find(".td_artist").text(item.artist);
+    tr.find(".td_album").text(item.album);
+    tr.find(".td_date").text(item.date);
+    tr.find(".td_filepath").text(item.filepath.split(".")[item.filepath.split(".").length - 1]);
+  }
+
+  socket.on("auto_match_review", (data) => {
+    let names = [];
+    for (let i = 0; i < data.length; i++) {
+      if (data[i].filepath !== undefined) {
+        names.push(data[i].filepath.split(/[\\/]/).pop());
+      } else {
+        names.push($("tr#" + data[i].item_id).find("img").siblings("span").text());
+      }
+    }
+    $("#overview_log").text("No confident match found for: " + names.join(", "));
+  });
+
+  socket.on("refresh_progress", (data) => {
+    $("#overview_log").text(
+      (data.finished ? "Library refresh finished: " : "Refreshing library metadata: ") +
+        data.processed +
+        " items checked, " +
+        data.changed +
+        " changed, " +
+        data.failed +
+        " failed",
+    );
+  });
+
   socket.on("overview", (data) => {
     if (data.msg == "inserted_song") {
       $("#overview_log").empty();
       add_item(data);
+    } else if (data.msg == "inserted_songs") {
+      for (let i = 0; i < data.data.length; i++) {
+        add_item({ data: data.data[i] });
+      }
+      $("#overview_log").text("Imported " + data.data.length + " items");
+    } else if (data.msg == "scanned_library") {
+      $("#overview_log").text(
+        "Scanned " +
+          data.scanned +
+          " files: imported " +
+          data.inserted +
+          " and updated " +
+          data.updated +
+          " items",
+      );
     } else if (data.msg == "download_file") {
-      file_data = data.data;
-      let blob = new Blob([file_data], { type: data.mimetype });
-      let uri = URL.createObjectURL(blob);
-      downloadURI(uri, data.filename);
+      downloadURI(data.url, data.filename);
     } else if (data.msg == "play_file") {
-      let file_data = data.data;
       let item_data = data.item_data;
-      let blob = new Blob([file_data], { type: data.mimetype });
-      let uri = URL.createObjectURL(blob);
       ap.list.add([
         {
           name: item_data["name"],
           artist: item_data["artist"],
-          url: uri,
+          url: data.url,
           cover: item_data["cover"],
         },
       ]);
@@ -2161,19 +2315,18 @@ $(document).ready(function () {
     } else if (data.msg == "changed_metadata") {
       socket.emit("update_item", data.data);
     } else if (data.msg == "changed_metadata_db") {
-      let tr = $("tr#" + data.data.item_id);
-      tr.find("img").attr("src", data.data.image);
-      tr.find("img").siblings("span").text(data.data.name);
-      tr.find(".td_artist").text(data.data.artist);
-      tr.find(".td_album").text(data.data.album);
-      tr.find(".td_date").text(data.data.date);
-      tr.find(".td_filepath").text(
-        data.data.filepath.split(".")[data.data.filepath.split(".").length - 1],
-      );
+      update_row(data.data);
       $("#overview_log").text("Item metadata has been changed!");
       $("#edit_item_modal").modal("hide");
+    } else if (data.msg == "changed_metadata_items") {
+      for (let i = 0; i < data.data.length; i++) {
+        update_row(data.data[i]);
+      }
+      $("#overview_log").text("Metadata of " + data.data.length + " items has been changed!");
     } else if (data.msg == "delete_items") {
-      $(".select_item:checked").parents("tr").remove();
+      for (let i = 0; i < data.items.length; i++) {
+        $("tr#" + data.items[i]).remove();
+      }
       $("#bulk_actions_row").css("visibility", "hidden");
       $("#select_all").prop("checked", false);
       $("#overview_log").text(data.data);
@@ -2211,6 +2364,13 @@ $(document).ready(function () {
       $("#file_browser_title").children("span").text(data.directory);
       $("#file_browser_modal").attr("item", data.id);
       $("#file_browser_modal").modal("show");
+    } else if (data.msg == "updated_filepaths") {
+      for (let i = 0; i < data.data.length; i++) {
+        let filepath = data.data[i].filepath;
+        $("tr#" + data.data[i].item)
+          .find(".td_ext")
+          .text(filepath.split(".")[filepath.split(".").length - 1].toUpperCase());
+      }
     } else if (data.msg == "updated_filepath") {
       $("#file_browser_modal").modal("hide");
       $("#overview_log").text("File location succesfully updated to " + data["filepath"]);
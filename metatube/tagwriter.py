@@ -0,0 +1,264 @@
+import base64
+from datetime import datetime
+
+from gevent.threadpool import ThreadPoolExecutor
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import (  # Meaning of the various frames: https://mutagen.readthedocs.io/en/latest/api/id3_frames.html
+    APIC,
+    ID3,
+    TALB,
+    TCON,
+    TDRC,
+    TIT2,
+    TLAN,
+    TPE1,
+    TRCK,
+    TSRC,
+    TXXX,
+    USLT,
+    ID3NoHeaderError,
+)
+from mutagen.mp4 import MP4, MP4Cover
+from mutagen.oggopus import OggOpus
+from mutagen.oggvorbis import OggVorbis
+from mutagen.wave import WAVE
+
+from metatube import Config, logger
+
+# Text frames for the EasyID3 / Vorbis comment keys we write
+ID3_TEXT_FRAMES = {
+    "album": TALB,
+    "artist": TPE1,
+    "language": TLAN,
+    "tracknumber": TRCK,
+    "title": TIT2,
+    "date": TDRC,
+    "genre": TCON,
+    "isrc": TSRC,
+}
+
+# TXXX descriptions, identical to the ones EasyID3 uses so the tags can be read back with it
+ID3_TXXX_DESCS = {
+    "barcode": "BARCODE",
+    "musicbrainz_releasetrackid": "MusicBrainz Release Track Id",
+    "musicbrainz_releasegroupid": "MusicBrainz Release Group Id",
+    "musicbrainz_albumid": "MusicBrainz Album Id",
+    "spotify_trackid": "spotify_trackid",
+    "spotify_albumid": "spotify_albumid",
+    "deezer_trackid": "deezer_trackid",
+    "deezer_albumid": "deezer_albumid",
+}
+
+
+def keep_padding(info) -> int:
+    """
+    Padding callback for mutagen's save methods.
+
+    Reuses all of the existing padding whenever the new tags fit in it, so the
+    audio data never has to be moved. Mutagen's default would shrink large
+    padding, which also rewrites the whole file.
+    """
+    if info.padding >= 0:
+        return info.padding
+    return info.get_default_padding()
+
+
+class TagWriter:
+    """
+    Writes the text tags and the cover of a file in a single save.
+
+    Every writer loads the file once, builds all frames / comments and the
+    picture on that one object and saves it once with `keep_padding`.
+    """
+
+    @staticmethod
+    def fields(track) -> dict:
+        """Maps the track metadata onto EasyID3 / Vorbis comment keys."""
+        fields = {
+            "album": track.album,
+            "artist": track.artists,
+            "barcode": track.barcode,
+            "language": track.language,
+            "tracknumber": str(track.tracknr),
+            "title": track.title,
+            "date": track.release_date,
+            "genre": track.genres,
+        }
+        if len(track.isrc or "") > 0:
+            fields["isrc"] = track.isrc
+        if track.source == "Musicbrainz":
+            fields["musicbrainz_releasetrackid"] = track.track_id
+            fields["musicbrainz_releasegroupid"] = track.album_id
+            fields["musicbrainz_albumid"] = track.album_id
+        elif track.source == "Spotify":
+            fields["spotify_trackid"] = track.track_id
+            fields["spotify_albumid"] = track.album_id
+        elif track.source == "Deezer":
+            fields["deezer_trackid"] = track.track_id
+            fields["deezer_albumid"] = track.album_id
+        if track.lyrics is not None:
+            fields["lyrics"] = track.lyrics
+        return {key: value for key, value in fields.items() if value is not None}
+
+    @staticmethod
+    def picture(track) -> Picture:
+        cover = Picture()
+        cover.data = track.cover.data
+        cover.type = 3
+        cover.mime = track.cover.mime
+        cover.desc = "Front cover"
+        return cover
+
+    @staticmethod
+    def apply_id3(tags, track) -> None:
+        for key, value in TagWriter.fields(track).items():
+            if key in ID3_TEXT_FRAMES:
+                tags.add(ID3_TEXT_FRAMES[key](encoding=3, text=value))
+            elif key in ID3_TXXX_DESCS:
+                tags.add(TXXX(encoding=3, desc=ID3_TXXX_DESCS[key], text=value))
+            elif key == "lyrics":
+                tags.delall("USLT")
+                tags.add(USLT(encoding=3, lang="eng", desc="", text=value))
+        tags.delall("APIC")
+        tags.add(
+            APIC(
+                encoding=3,
+                mime=track.cover.mime,
+                type=3,
+                desc="Cover",
+                data=track.cover.data,
+            )
+        )
+
+    @staticmethod
+    def write_mp3(track) -> None:
+        try:
+            tags = ID3(track.filename)
+        except ID3NoHeaderError:
+            tags = ID3()
+        TagWriter.apply_id3(tags, track)
+        tags.save(track.filename, padding=keep_padding)
+
+    @staticmethod
+    def write_wav(track) -> None:
+        audio = WAVE(track.filename)
+        if audio.tags is None:
+            audio.add_tags()
+        TagWriter.apply_id3(audio.tags, track)
+        audio.save(track.filename, padding=keep_padding)
+
+    @staticmethod
+    def write_vorbis(track) -> None:
+        filetypes = {"FLAC": FLAC, "OPUS": OggOpus, "OGG": OggVorbis}
+        audio = filetypes[track.extension](track.filename)
+        for key, value in TagWriter.fields(track).items():
+            audio[key] = value
+        cover = TagWriter.picture(track)
+        if track.extension == "FLAC":
+            audio.clear_pictures()
+            audio.add_picture(cover)
+        else:
+            audio["metadata_block_picture"] = [
+                base64.b64encode(cover.write()).decode("ascii")
+            ]
+        audio.save(track.filename, padding=keep_padding)
+
+    @staticmethod
+    def write_mp4(track) -> None:
+        video = MP4(track.filename)
+        dateobj = (
+            datetime.strptime(track.release_date, "%Y-%m-%d")
+            if len(track.release_date) > 0
+            else datetime.now().date()
+        )
+        # iTunes metadata list / key values: https://mutagen.readthedocs.io/en/latest/api/mp4.html?highlight=M4A#mutagen.mp4.MP4Tags
+        video["\xa9nam"] = track.title
+        video["\xa9alb"] = track.album
+        video["\xa9ART"] = track.artists
+        video["\xa9gen"] = track.genres
+        video["\xa9day"] = str(dateobj.year)
+        try:
+            video["trkn"] = [(int(track.tracknr), int(track.total_tracks))]
+        except Exception:
+            pass
+        imageformat = (
+            MP4Cover.FORMAT_PNG
+            if "png" in track.cover.mime
+            else MP4Cover.FORMAT_JPEG
+        )
+        video["covr"] = [MP4Cover(track.cover.data, imageformat)]
+        if track.lyrics is not None:
+            video["\xa9lyr"] = track.lyrics
+        video.save(track.filename, padding=keep_padding)
+
+    @staticmethod
+    def write(track) -> bool:
+        writers = {
+            "MP3": TagWriter.write_mp3,
+            "FLAC": TagWriter.write_vorbis,
+            "OPUS": TagWriter.write_vorbis,
+            "OGG": TagWriter.write_vorbis,
+            "MP4": TagWriter.write_mp4,
+            "M4A": TagWriter.write_mp4,
+            "WAV": TagWriter.write_wav,
+        }
+        if track.extension not in writers:
+            logger.error("Writing tags to %s files is not supported", track.extension)
+            return False
+        writers[track.extension](track)
+        return True
+
+    @staticmethod
+    def write_lyrics(track) -> bool:
+        """
+        Writes only the lyrics of a track, leaving all other tags untouched.
+
+        Used when the lyrics arrive after the rest of the tags were written.
+        """
+        if track.extension in ("MP3", "WAV"):
+            if track.extension == "MP3":
+                try:
+                    audio = tags = ID3(track.filename)
+                except ID3NoHeaderError:
+                    audio = tags = ID3()
+            else:
+                audio = WAVE(track.filename)
+                if audio.tags is None:
+                    audio.add_tags()
+                tags = audio.tags
+            tags.delall("USLT")
+            tags.add(USLT(encoding=3, lang="eng", desc="", text=track.lyrics))
+            audio.save(track.filename, padding=keep_padding)
+        elif track.extension in ("FLAC", "OPUS", "OGG"):
+            filetypes = {"FLAC": FLAC, "OPUS": OggOpus, "OGG": OggVorbis}
+            audio = filetypes[track.extension](track.filename)
+            audio["lyrics"] = track.lyrics
+            audio.save(track.filename, padding=keep_padding)
+        elif track.extension in ("MP4", "M4A"):
+            video = MP4(track.filename)
+            video["\xa9lyr"] = track.lyrics
+            video.save(track.filename, padding=keep_padding)
+        else:
+            logger.error("Writing tags to %s files is not supported", track.extension)
+            return False
+        return True
+
+    @staticmethod
+    def try_write(track) -> bool:
+        try:
+            return TagWriter.write(track)
+        except Exception as e:
+            logger.error("Writing tags to %s failed: %s", track.filename, str(e))
+            return False
+
+    @staticmethod
+    def write_many(tracks, workers=None) -> list:
+        """
+        Writes the tags of many files on a pool of native threads.
+
+        The covers have to be loaded beforehand. Returns whether every write
+        succeeded, in the order of `tracks`.
+        """
+        workers = int(workers or Config.TAG_WRITE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(TagWriter.try_write, tracks))
@@ -0,0 +1,20 @@
+from flask import current_app
+
+from metatube import socketio
+
+
+def bind(target):
+    """Returns `target` wrapped to run inside the application context of the caller."""
+    # Greenlets don't share the application context of the one starting them
+    app = current_app._get_current_object()  # type: ignore
+
+    def run(*args):
+        with app.app_context():
+            return target(*args)
+
+    return run
+
+
+def start_task(target, *args):
+    """Starts a background task inside the application context of the caller."""
+    return socketio.start_background_task(bind(target), *args)
@@ -0,0 +1,105 @@
+import os
+from datetime import datetime
+
+from dateutil import parser
+
+from metatube import Config
+from metatube.cover import Cover
+
+DEFAULTS = {
+    "language": "Unknown",
+    "tracknr": "1",
+    "total_tracks": "1",
+    "goal": "add",
+    "item_id": None,
+    "lyrics": None,
+    "lyrics_id": None,
+    "cover": None,
+}
+
+
+class TrackMetadata:
+    """
+    Metadata of a single track, as built by the providers and consumed by the tag writers.
+
+    Uses `__slots__` so every job only carries the fields below, and a lazily
+    loaded `Cover` instead of the raw image bytes.
+    """
+
+    __slots__ = (
+        "filename",
+        "extension",
+        "source",
+        "goal",
+        "item_id",
+        "title",
+        "artists",
+        "album",
+        "album_id",
+        "track_id",
+        "mbp_trackid",
+        "barcode",
+        "language",
+        "release_date",
+        "tracknr",
+        "total_tracks",
+        "isrc",
+        "length",
+        "genres",
+        "lyrics",
+        # Genius song whose lyrics are still being fetched, see metatube.lyrics
+        "lyrics_id",
+        "cover",
+    )
+
+    def __init__(self, **fields) -> None:
+        for name in self.__slots__:
+            setattr(self, name, fields.pop(name, DEFAULTS.get(name, "")))
+        if len(fields) > 0:
+            raise TypeError(f"Unknown track metadata fields: {', '.join(fields)}")
+        if self.cover is None:
+            self.cover = Cover()
+
+    @staticmethod
+    def from_dict(data, **fields) -> "TrackMetadata":
+        """Builds track metadata from a dict like the ones `MetaData.read_*_metadata` return."""
+        known = {
+            key: value
+            for key, value in data.items()
+            if key in TrackMetadata.__slots__ and key not in fields
+        }
+        known.update(fields)
+        return TrackMetadata(**known)
+
+    def response(self) -> dict:
+        return {
+            "filepath": os.path.join(Config.BASE_DIR, self.filename),
+            "name": self.title,
+            "artist": self.artists,
+            "album": self.album,
+            "date": self.release_date,
+            "length": self.length,
+            "image": self.cover.path,
+            "track_id": self.track_id,
+        }
+
+    def row(self) -> dict:
+        """The response with the values as they are stored in the database."""
+        try:
+            date = parser.parse(self.release_date)
+        except Exception:
+            date = datetime.now()
+        response = self.response()
+        response.update(
+            artist=(
+                "; ".join(self.artists)
+                if isinstance(self.artists, list)
+                else self.artists
+            ),
+            date=date,
+            length=int(float(self.length or 0)),
+        )
+        return response
+
+    def __repr__(self) -> str:
+        return f"<TrackMetadata {self.title!r} ({self.source or 'no source'})>"
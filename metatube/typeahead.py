@@ -0,0 +1,154 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from metatube import db, logger
+from metatube.database import CHANGED_ITEMS, Database
+
+# Score of a word in every indexed field, an exact word scores one more
+WEIGHTS = {"name": 6, "artist": 4, "album": 2}
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text) -> list:
+    """Splits text into lowercase words without diacritics."""
+    if not text:
+        return []
+    text = str(text)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    return WORD.findall(text.casefold())
+
+
+class PrefixIndex:
+    """
+    Finds items by the beginnings of the words in their name, artist and album.
+
+    The distinct words are kept in a sorted list, so the words starting with a
+    prefix are one bisection away. Every word maps onto the items containing
+    it, with the weight of the best field it appears in.
+    """
+
+    def __init__(self) -> None:
+        self.words: list[str] = []
+        self.postings: dict[str, dict[int, int]] = {}
+        # The words of every item, so it can be removed again
+        self.items: dict[int, dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @staticmethod
+    def terms(name, artist, album) -> dict:
+        terms: dict[str, int] = {}
+        for field, text in zip(WEIGHTS, (name, artist, album), strict=True):
+            for word in tokenize(text):
+                terms[word] = max(terms.get(word, 0), WEIGHTS[field])
+        return terms
+
+    def add(self, id, name, artist, album) -> None:
+        self.remove(id)
+        terms = self.terms(name, artist, album)
+        self.items[id] = terms
+        for word, weight in terms.items():
+            postings = self.postings.get(word)
+            if postings is None:
+                postings = self.postings[word] = {}
+                insort(self.words, word)
+            postings[id] = weight
+
+    def load(self, rows) -> None:
+        """Indexes (id, name, artist, album) rows, sorting the words only once."""
+        for id, name, artist, album in rows:
+            terms = self.terms(name, artist, album)
+            self.items[id] = terms
+            for word, weight in terms.items():
+                self.postings.setdefault(word, {})[id] = weight
+        self.words = sorted(self.postings)
+
+    def remove(self, id) -> None:
+        terms = self.items.pop(id, None)
+        if terms is None:
+            return
+        for word in terms:
+            postings = self.postings[word]
+            del postings[id]
+            if len(postings) < 1:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+
+    def matches(self, prefix) -> dict:
+        """Returns the score of every item with a word starting with the prefix."""
+        scores: dict[int, int] = {}
+        for i in range(bisect_left(self.words, prefix), len(self.words)):
+            word = self.words[i]
+            if not word.startswith(prefix):
+                break
+            bonus = 1 if word == prefix else 0
+            for id, weight in self.postings[word].items():
+                if weight + bonus > scores.get(id, 0):
+                    scores[id] = weight + bonus
+        return scores
+
+    def score(self, id, prefix) -> int:
+        """Returns the score of one item for a prefix, 0 when it doesn't match."""
+        return max(
+            (
+                weight + (1 if word == prefix else 0)
+                for word, weight in self.items[id].items()
+                if word.startswith(prefix)
+            ),
+            default=0,
+        )
+
+    def search(self, query, limit=50) -> list:
+        """Returns the IDs of the best items matching every word of the query."""
+        words = sorted(set(tokenize(query)), key=len, reverse=True)
+        if len(words) < 1:
+            return []
+        # The longest prefix has the fewest matches, the others only filter them
+        scores = self.matches(words[0])
+        for word in words[1:]:
+            scores = {
+                id: total + score
+                for id, total in scores.items()
+                if (score := self.score(id, word)) > 0
+            }
+        return heapq.nlargest(limit, scores, key=lambda id: (scores[id], -id))
+
+
+index: PrefixIndex | None = None
+
+
+def build() -> None:
+    global index
+    rows = db.session.execute(
+        select(Database.id, Database.name, Database.artist, Database.album)
+    )
+    new = PrefixIndex()
+    new.load(rows)
+    index = new
+    logger.info("Indexed %d items for the library search", len(new))
+
+
+def search(query, limit=50):
+    """Returns the IDs of the best matches, or None before the index is built."""
+    return index.search(query, limit) if index is not None else None
+
+
+@event.listens_for(Session, "after_commit")
+def apply_changes(session) -> None:
+    # Changes only reach the index once they're committed
+    changes = session.info.pop(CHANGED_ITEMS, None)
+    if changes is None or index is None:
+        return
+    for id, fields in changes.items():
+        if fields is None:
+            index.remove(id)
+        else:
+            index.add(id, *fields)
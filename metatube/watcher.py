@@ -0,0 +1,352 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import time
+
+import gevent
+from flask import current_app
+from gevent.socket import wait_read
+
+from metatube import Config as env
+from metatube import logger
+from metatube.database import Database, Templates
+
+# inotify(7) event masks
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+# struct inotify_event without its trailing name: wd, mask, cookie, len
+EVENT = struct.Struct("iIII")
+
+
+def outermost(paths) -> list:
+    """Returns the absolute paths without the ones inside another path of the list."""
+    paths = sorted({os.path.abspath(path) for path in paths if path})
+    return [
+        path
+        for i, path in enumerate(paths)
+        if not any(path.startswith(parent + os.sep) for parent in paths[:i])
+    ]
+
+
+class Inotify:
+    """Minimal ctypes binding of the Linux inotify API, read through the gevent hub."""
+
+    def __init__(self) -> None:
+        name = ctypes.util.find_library("c")
+        if name is None:
+            raise OSError("The C library can't be found")
+        self.libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify isn't supported on this system")
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 has failed")
+
+    def add_watch(self, path) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def read(self) -> list:
+        """Waits for events and returns them as (wd, mask, cookie, name) tuples."""
+        wait_read(self.fd)
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, cookie, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Watcher:
+    """
+    Keeps the file paths in the database in sync with the template output folders.
+
+    Changes are picked up with inotify where available and by comparing
+    periodic snapshots otherwise. Renames are collected and written to the
+    database in one transaction per flush. The existence of every file below
+    the folders is tracked in memory, so templates don't have to stat them.
+    """
+
+    def __init__(self, roots) -> None:
+        self.roots = outermost(roots)
+        # Whether a path below the roots exists, for the paths that were asked for
+        self.exists: dict[str, bool] = {}
+        # Renamed files and directories that aren't in the database yet, old -> new
+        self.renames: dict[str, str] = {}
+        self.dir_renames: dict[str, str] = {}
+        # inotify: watched directory by descriptor and unpaired IN_MOVED_FROM events
+        self.inotify = None
+        self.dirs: dict[int, str] = {}
+        self.moves: dict[int, tuple] = {}
+        # Polling: the last snapshot, (dev, inode) by path
+        self.snapshot: dict[str, tuple] = {}
+        self.running = False
+        self.greenlets: list = []
+
+    def watched(self, path) -> bool:
+        return any(
+            path == root or path.startswith(root + os.sep) for root in self.roots
+        )
+
+    def path_exists(self, path) -> bool:
+        path = os.path.abspath(path)
+        if not self.running or not self.watched(path):
+            return os.path.exists(path)
+        if path not in self.exists:
+            self.exists[path] = os.path.exists(path)
+        return self.exists[path]
+
+    def created(self, path) -> None:
+        self.exists[path] = True
+
+    def deleted(self, path, is_dir=False) -> None:
+        self.exists[path] = False
+        if is_dir:
+            for known in self.exists:
+                if known.startswith(path + os.sep):
+                    self.exists[known] = False
+
+    def moved(self, old, new, is_dir=False) -> None:
+        self.exists[old] = False
+        self.exists[new] = True
+        if is_dir:
+            prefix = old + os.sep
+            for known in [known for known in self.exists if known.startswith(prefix)]:
+                self.exists[new + known[len(old) :]] = self.exists.pop(known)
+            self.dir_renames[old] = new
+            return
+        # A file renamed twice before a flush only needs its final path
+        for source, target in self.renames.items():
+            if target == old:
+                self.renames[source] = new
+                return
+        self.renames[old] = new
+
+    def flush(self) -> None:
+        """Writes the collected renames to the database."""
+        renames, self.renames = self.renames, {}
+        dir_renames, self.dir_renames = self.dir_renames, {}
+        for old, new in dir_renames.items():
+            query = Database.query.filter(
+                Database.filepath.startswith(old + os.sep, autoescape=True)
+            )
+            for item in query:
+                renames[item.filepath] = new + item.filepath[len(old) :]
+        if len(renames) > 0:
+            try:
+                Database.update_filepaths(renames)
+            except Exception as e:
+                logger.error("Updating the moved files has failed: %s", str(e))
+
+    def flush_loop(self) -> None:
+        while self.running:
+            interval = float(env.WATCH_FLUSH_INTERVAL)
+            gevent.sleep(interval)
+            # Moves out of the watched folders never get their IN_MOVED_TO
+            now = time.monotonic()
+            for cookie, (old, is_dir, stamp) in list(self.moves.items()):
+                if now - stamp >= interval:
+                    del self.moves[cookie]
+                    self.deleted(old, is_dir)
+            self.flush()
+
+    def add_tree(self, root) -> None:
+        stack = [root]
+        while len(stack) > 0:
+            directory = stack.pop()
+            try:
+                self.dirs[self.inotify.add_watch(directory)] = directory
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise
+                logger.warning("Can't watch %s: %s", directory, str(e))
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+
+    def handle(self, wd, mask, cookie, name) -> None:
+        if mask & IN_Q_OVERFLOW:
+            # Events were dropped, so everything known has to be checked again
+            logger.warning("The file watcher has missed events")
+            self.exists.clear()
+            return
+        directory = self.dirs.get(wd)
+        if directory is None:
+            return
+        if mask & IN_IGNORED:
+            self.dirs.pop(wd, None)
+            return
+        path = os.path.join(directory, name) if name else directory
+        is_dir = bool(mask & IN_ISDIR)
+        if mask & IN_MOVED_FROM:
+            self.moves[cookie] = (path, is_dir, time.monotonic())
+        elif mask & IN_MOVED_TO:
+            if cookie in self.moves:
+                old, _, _ = self.moves.pop(cookie)
+                self.moved(old, path, is_dir)
+                if is_dir:
+                    for key, value in list(self.dirs.items()):
+                        if value == old or value.startswith(old + os.sep):
+                            self.dirs[key] = path + value[len(old) :]
+            else:
+                self.created(path)
+                if is_dir:
+                    self.add_tree(path)
+        elif mask & IN_CREATE:
+            self.created(path)
+            if is_dir:
+                self.add_tree(path)
+        elif mask & (IN_DELETE | IN_DELETE_SELF):
+            self.deleted(path, is_dir or bool(mask & IN_DELETE_SELF))
+
+    def run_inotify(self) -> None:
+        try:
+            while self.running:
+                for event in self.inotify.read():
+                    self.handle(*event)
+        except Exception as e:
+            # Closing the descriptor in `stop` ends the read as well
+            if self.running:
+                logger.error("The file watcher has stopped: %s", str(e))
+
+    def prime(self) -> None:
+        """Checks once which files of the library exist, on a native thread."""
+        items = Database.get_records()
+        paths = [
+            path
+            for path in (os.path.abspath(item.filepath) for item in items)
+            if self.watched(path)
+        ]
+        exists = gevent.get_hub().threadpool.apply(
+            lambda: {path: os.path.exists(path) for path in paths}
+        )
+        self.exists.update(exists)
+
+    def scan(self) -> dict:
+        files = {}
+        stack = list(self.roots)
+        while len(stack) > 0:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        stat = entry.stat(follow_symlinks=False)
+                        files[entry.path] = (stat.st_dev, stat.st_ino)
+                except OSError:
+                    continue
+        return files
+
+    def poll(self) -> None:
+        """Compares a new snapshot with the last one, matching moved files by inode."""
+        snapshot = gevent.get_hub().threadpool.apply(self.scan)
+        appeared = {
+            inode: path for path, inode in snapshot.items() if path not in self.snapshot
+        }
+        for path, inode in self.snapshot.items():
+            if path in snapshot:
+                continue
+            if inode in appeared:
+                self.moved(path, appeared.pop(inode))
+            else:
+                self.deleted(path)
+        for path in appeared.values():
+            self.created(path)
+        self.snapshot = snapshot
+
+    def run_polling(self) -> None:
+        while self.running:
+            gevent.sleep(float(env.WATCH_POLL_INTERVAL))
+            self.poll()
+
+    def spawn(self, loop) -> None:
+        # Greenlets don't share the application context of the one starting them
+        app = current_app._get_current_object()  # type: ignore
+
+        def run():
+            with app.app_context():
+                loop()
+
+        self.greenlets.append(gevent.spawn(run))
+
+    def start(self, polling=False) -> None:
+        self.running = True
+        self.prime()
+        try:
+            if polling:
+                raise OSError("polling was requested")
+            self.inotify = Inotify()
+            for root in self.roots:
+                self.add_tree(root)
+            logger.info("Watching %s with inotify", ", ".join(self.roots))
+            self.spawn(self.run_inotify)
+        except OSError as e:
+            if self.inotify is not None:
+                self.inotify.close()
+                self.inotify = None
+            self.dirs.clear()
+            logger.info("Polling %s for changes (%s)", ", ".join(self.roots), str(e))
+            self.snapshot = gevent.get_hub().threadpool.apply(self.scan)
+            self.spawn(self.run_polling)
+        self.spawn(self.flush_loop)
+
+    def stop(self) -> None:
+        self.running = False
+        gevent.killall(self.greenlets)
+        self.greenlets = []
+        self.flush()
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+
+watcher = None
+
+
+def roots() -> list:
+    return [template.output_folder for template in Templates.fetch_all_templates()]
+
+
+def start() -> None:
+    global watcher
+    watcher = Watcher(roots())
+    watcher.start()
+
+
+def update_roots() -> None:
+    """Restarts the watcher when the output folders of the templates changed."""
+    if watcher is not None and outermost(roots()) != watcher.roots:
+        watcher.stop()
+        start()
+
+
+def path_exists(path) -> bool:
+    return watcher.path_exists(path) if watcher is not None else os.path.exists(path)
@@ -15,8 +15,15 @@ from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessorError
 from yt_dlp.utils import DownloadError, ExtractorError, PostProcessingError
 
 from metatube import logger, sockets
+from metatube.cache import LRUCache
 from metatube.sponsorblock import segments as find_segments
 
+# Fields of the yt-dlp info dict a download is auto-matched on
+INFO_FIELDS = ("track", "title", "artist", "creator", "uploader", "duration", "isrc")
+
+# The info of the latest downloads, keyed by the path of their file
+downloaded = LRUCache(64)
+
 
 class YouTube:
     @staticmethod
@@ -138,9 +145,11 @@ class YouTube:
         if d["status"] == "processing":
             sockets.postprocessing(d["postprocessor"])
         elif d["status"] == "finished":
-            sockets.finished_postprocessor(
-                d["postprocessor"], d["info_dict"]["filepath"]
-            )
+            info = d["info_dict"]
+            if d["postprocessor"] == "MoveFiles":
+                fields = {key: info[key] for key in INFO_FIELDS if info.get(key)}
+                downloaded.put(info["filepath"], fields)
+            sockets.finished_postprocessor(d["postprocessor"], info["filepath"])
 
     @staticmethod
     def get_options(
@@ -0,0 +1,69 @@
+import unittest
+from types import SimpleNamespace
+
+from metatube.albumtagger import AlbumTagger
+from metatube.metadata import MetaData
+
+
+class TestAlbumTagger(unittest.TestCase):
+    def setUp(self):
+        self.tracks = MetaData.get_deezer_album_data(
+            {
+                "id": 115068722,
+                "title": "Whenever You Need Somebody",
+                "release_date": "1987-11-12",
+                "cover_xl": "https://example.com/cover.jpg",
+                "genres": [{"name": "Pop"}],
+                "tracks": [
+                    {
+                        "id": 781592622,
+                        "title": "Never Gonna Give You Up",
+                        "isrc": "GBARL9300135",
+                        "duration": 213,
+                        "artist": {"name": "Rick Astley"},
+                    },
+                    {
+                        "id": 781592632,
+                        "title": "Whenever You Need Somebody",
+                        "duration": 234,
+                        "artist": {"name": "Rick Astley"},
+                    },
+                    {
+                        "id": 781592642,
+                        "title": "Together Forever",
+                        "duration": 205,
+                        "artist": {"name": "Rick Astley"},
+                    },
+                ],
+            }
+        )
+
+    def item(self, _id, name):
+        return SimpleNamespace(id=_id, name=name, filepath=f"/music/{_id}.mp3")
+
+    def testAlbumData(self):
+        self.assertEqual([track.tracknr for track in self.tracks], ["1", "2", "3"])
+        self.assertEqual(self.tracks[0].total_tracks, 3)
+        self.assertEqual(self.tracks[0].genres, "Pop")
+        self.assertIs(self.tracks[0].cover, self.tracks[2].cover)
+
+    def testMatch(self):
+        items = [
+            self.item(1, "Rick Astley - Together Forever (Official Video)"),
+            self.item(2, "untitled"),
+            self.item(3, "Rick Astley - Whenever You Need Somebody (Official Video)"),
+            self.item(4, "Rick Roll"),
+        ]
+        tags = {
+            "/music/2.mp3": {"isrc": "GBARL9300135", "length": 212.9},
+            "/music/4.mp3": {"title": "Never Gonna Give You Up"},
+        }
+        pairs, unmatched = AlbumTagger.match(self.tracks, items, tags)
+        matched = {item.id: track.tracknr for track, item in pairs}
+        self.assertEqual(matched, {1: "3", 2: "1", 3: "2"})
+        # The ISRC wins, so the second file with the same title is left alone
+        self.assertEqual([item.id for item in unmatched], [4])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,183 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from mutagen.flac import FLAC
+
+from metatube import automatch, create_app, db, youtube
+from metatube.automatch import AutoMatch, Query
+from metatube.cover import DEFAULT_COVER
+from metatube.database import Database, IsrcMapping
+from metatube.fanout import candidate
+from metatube.youtube import YouTube
+from tests.test_database import TestConfig
+from tests.test_tagwriter import flac_header
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.candidates = [
+            candidate("Deezer", 1, "Never Gonna Give You Up", ["Rick Astley"], duration=213),
+            candidate("Deezer", 2, "Never Gonna Give You Up", ["Rick Astley"], duration=280),
+            candidate("Deezer", 3, "Together Forever", ["Rick Astley"], duration=205),
+            candidate("Spotify", 4, "Never Gonna Stop", ["Someone Else"], duration=212),
+        ]
+
+    def testFromInfo(self):
+        query = Query.from_info(
+            {
+                "title": "Rick Astley - Never Gonna Give You Up (Official Music Video)",
+                "uploader": "Rick Astley",
+                "duration": 212,
+            }
+        )
+        self.assertEqual(query.artist, "Rick Astley")
+        self.assertEqual(query.title, "Never Gonna Give You Up (Official Music Video)")
+
+        query = Query.from_info(
+            {"title": "Never Gonna Give You Up", "uploader": "Rick Astley - Topic"}
+        )
+        self.assertEqual(query.artist, "Rick Astley")
+
+    def testBest(self):
+        query = Query("Never Gonna Give You Up (Official Video)", "Rick Astley", 212)
+        best, score = query.best(self.candidates)
+        self.assertEqual(best["id"], "1")
+        self.assertGreater(score, 0.95)
+        # The same title with a very different duration scores lower
+        self.assertLess(query.score(self.candidates[1]), 0.85)
+
+    def testISRC(self):
+        query = Query("Something else entirely", isrc="GBARL9300135")
+        match = dict(self.candidates[2], isrc="GBARL9300135")
+        self.assertEqual(query.score(match), 1.0)
+
+    def testPruningKeepsTheBest(self):
+        query = Query("Together Forever", "Rick Astley", 205)
+        pruned = query.best(self.candidates)
+        scores = [query.score(item) for item in self.candidates]
+        self.assertEqual(pruned[1], max(scores))
+
+
+class TestAutoMatch(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.directory = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.directory, "Never Gonna Give You Up.flac")
+        with open(self.filepath, "wb") as file:
+            file.write(flac_header())
+        audio = FLAC(self.filepath)
+        audio.update(
+            {
+                "title": "Never Gonna Give You Up",
+                "artist": "Rick Astley",
+                "isrc": "GBARL9300135",
+            }
+        )
+        audio.save()
+        self.item = Database(
+            filepath=self.filepath,
+            name="Never Gonna Give You Up",
+            artist="Unknown",
+            album="Unknown",
+            cover=DEFAULT_COVER,
+            youtube_id="dQw4w9WgXcQ",
+        )  # type: ignore
+        db.session.add(self.item)
+        db.session.commit()
+        mock.patch("metatube.database.sockets").start()
+        self.sockets = mock.patch.object(automatch, "sockets").start()
+        mock.patch.dict(automatch.review_queue, clear=True).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        shutil.rmtree(self.directory)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    @staticmethod
+    def deezer_track(_id):
+        title = "Together Forever" if int(_id) == 781592623 else "Never Gonna Give You Up"
+        track = mock.Mock()
+        track.as_dict.return_value = {
+            "id": int(_id),
+            "title": title,
+            "isrc": "GBARL9300135",
+            "release_date": "1987-11-12",
+            "duration": 213,
+            "track_position": 1,
+            "album": {"id": 1, "title": "Whenever You Need Somebody"},
+            "contributors": [{"name": "Rick Astley", "type": "artist"}],
+        }
+        return track
+
+    def testMatchISRC(self):
+        # The ISRC is resolved in a pool greenlet, which needs the application context
+        with mock.patch(
+            "deezer.Client.request", return_value=self.deezer_track(781592622)
+        ), mock.patch("deezer.Client.get_track", side_effect=self.deezer_track):
+            updates, review = AutoMatch.match_items([self.item.id], "deezer", 5)
+        self.assertEqual((len(updates), len(review)), (1, 0))
+        self.assertEqual(IsrcMapping.lookup("GBARL9300135", "Deezer"), "781592622")
+        self.assertEqual(
+            Database.fetch_item(self.item.id).album, "Whenever You Need Somebody"
+        )
+        self.assertEqual(FLAC(self.filepath)["album"], ["Whenever You Need Somebody"])
+
+    def testMatchDownload(self):
+        filepath = os.path.join(self.directory, "dQw4w9WgXcQ.flac")
+        with open(filepath, "wb") as file:
+            file.write(flac_header())
+        info = {
+            "title": "Rick Astley - Together Forever (Official Video)",
+            "duration": 205,
+            "filepath": filepath,
+            "formats": [],
+        }
+        with mock.patch.object(youtube, "sockets"):
+            YouTube.postprocessor_hook(
+                {"status": "finished", "postprocessor": "MoveFiles", "info_dict": info}
+            )
+        # Only the fields a download is matched on are kept
+        info = youtube.downloaded.pop(filepath)
+        self.assertEqual(set(info), {"title", "duration"})
+
+        found = [
+            candidate(
+                "Deezer", 1, "Never Gonna Give You Up", ["Rick Astley"], duration=213
+            ),
+            candidate(
+                "Deezer", 781592623, "Together Forever", ["Rick Astley"], duration=205
+            ),
+        ]
+        with mock.patch.object(AutoMatch, "search", return_value=found), mock.patch(
+            "deezer.Client.get_track", side_effect=self.deezer_track
+        ), mock.patch("metatube.metadata.sockets") as sockets:
+            track = AutoMatch.match_download(filepath, info, "deezer", 5)
+        self.assertEqual(track.track_id, "781592623")
+        sockets.finished_metadata.assert_called_once()
+        self.assertEqual(FLAC(filepath)["title"], ["Together Forever"])
+
+    def testReviewDownload(self):
+        info = {"title": "Something else entirely", "duration": 100}
+        found = [candidate("Deezer", 1, "Never Gonna Give You Up", ["Rick Astley"])]
+        with mock.patch.object(
+            AutoMatch, "search", return_value=found
+        ), mock.patch.object(automatch.Config, "AUTO_MATCH_REVIEW_SIZE", 1):
+            AutoMatch.queue(self.item, Query("Never Gonna"), [], None, 0.0)
+            self.assertIsNone(
+                AutoMatch.match_download(self.filepath, info, "deezer", 5)
+            )
+        # Only the latest entry is kept
+        self.assertEqual(list(automatch.review_queue), [self.filepath])
+        self.sockets.auto_match_review.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,34 @@
+import unittest
+
+from metatube.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def testEvictsLeastRecentlyUsed(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def testBoundedByBytes(self):
+        cache = LRUCache(10, maxbytes=10, sizeof=len)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.put("c", b"123")
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.bytes, 8)
+        # Values larger than the whole cache are never stored
+        cache.put("d", b"x" * 11)
+        self.assertNotIn("d", cache)
+        self.assertEqual(cache.pop("b"), b"12345")
+        self.assertEqual(cache.bytes, 3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
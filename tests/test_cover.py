@@ -0,0 +1,67 @@
+import unittest
+from io import BytesIO
+from unittest import mock
+
+from metatube import Config, cover
+from metatube.cover import Image, normalize
+
+
+def encode(size, format):
+    output = BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(output, format)
+    return output.getvalue()
+
+
+@unittest.skipIf(Image is None, "Pillow is not installed")
+class TestCover(unittest.TestCase):
+    def testScalesDownLargeCovers(self):
+        image = encode((3000, 2000), "PNG")
+        data, mime = normalize(image, "image/png")
+        self.assertEqual(mime, "image/jpeg")
+        picture = Image.open(BytesIO(data))
+        self.assertEqual(max(picture.size), int(Config.COVER_MAX_SIZE))
+        self.assertEqual(picture.size[0] / picture.size[1], 1.5)
+
+    def testKeepsSmallJPEGs(self):
+        image = encode((500, 500), "JPEG")
+        self.assertEqual(normalize(image, "image/jpeg"), (image, "image/jpeg"))
+
+    def testKeepsTransparency(self):
+        output = BytesIO()
+        Image.new("RGBA", (2000, 2000), (0, 0, 0, 0)).save(output, "PNG")
+        data, mime = normalize(output.getvalue(), "image/png")
+        self.assertEqual(mime, "image/png")
+        self.assertEqual(Image.open(BytesIO(data)).mode, "RGBA")
+
+    def testKeepsInvalidImages(self):
+        self.assertEqual(
+            normalize(b"not an image", "text/plain"), (b"not an image", "text/plain")
+        )
+
+
+class TestCoverCache(unittest.TestCase):
+    def setUp(self):
+        cover.cover_cache.clear()
+        mock.patch.object(cover.cover_cache, "maxbytes", 1000).start()
+        # Covers that can't be normalized are cached as they are
+        mock.patch.object(Config, "COVER_MAX_SIZE", 0).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        cover.cover_cache.clear()
+
+    def testBoundedInBytes(self):
+        sizes = {"a": 600, "b": 800, "c": 1200}
+        images = {url: (b"\xff" * size, "image/jpeg") for url, size in sizes.items()}
+        with mock.patch.object(cover, "download", side_effect=images.get):
+            for url in images:
+                self.assertEqual(cover.load(url), images[url])
+        # Only the latest cover fits, the one above the limit isn't cached at all
+        self.assertNotIn("a", cover.cover_cache)
+        self.assertIn("b", cover.cover_cache)
+        self.assertNotIn("c", cover.cover_cache)
+        self.assertLessEqual(cover.cover_cache.bytes, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
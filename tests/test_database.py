@@ -1,9 +1,15 @@
+import base64
+import dataclasses
+import json
 import os
 import unittest
 from datetime import datetime
+from unittest import mock
+
+from sqlalchemy import event, text
 
 from config import Config
-from metatube import create_app, db
+from metatube import create_app, db, typeahead
 from metatube.database import Config as env
 from metatube.database import Database, Templates
 from metatube.init import Default
@@ -92,6 +98,39 @@ class TestDatabase(unittest.TestCase):
         self.assertEqual(config.get_max(), 10)
         self.assertEqual(config.get_hwt(), "VAAPI")
 
+    def testConfigSnapshot(self):
+        self.assertEqual(env.snapshot().version, 0)
+        config = env(amount=5, metadata_sources="deezer")  # type: ignore
+        db.session.add(config)
+        db.session.commit()
+        snapshot = env.snapshot()
+        self.assertEqual(snapshot.amount, 5)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.amount = 10  # type: ignore
+
+        # The getters don't query the database once the row was read
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            self.assertIs(env.snapshot(), snapshot)
+            self.assertEqual(env.get_max(), 5)
+            self.assertEqual(env.get_metadata_sources(), "deezer")
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+        self.assertEqual(statements, [])
+
+        # Uncommitted changes stay invisible
+        config.amount = 20
+        db.session.flush()
+        db.session.rollback()
+        self.assertIs(env.snapshot(), snapshot)
+
+        config.set_amount(10)
+        self.assertEqual(env.get_max(), 10)
+        self.assertGreater(env.snapshot().version, snapshot.version)
+        self.assertEqual(snapshot.amount, 5)
+
     def testTemplatesTable(self):
         defaultTemplate = Templates(  # type: ignore
             id=0,
@@ -265,6 +304,118 @@ class TestDatabase(unittest.TestCase):
             },
         )
 
+    def testPage(self):
+        names = ["Together Forever", "Never Gonna Give You Up", None, "Hold Me"]
+        for i, name in enumerate(names):
+            db.session.add(
+                Database(
+                    filepath=f"/music/{i}.mp3",
+                    name=name,
+                    date=datetime(1987 + i % 2, 1, 1),
+                )
+            )
+        db.session.commit()
+
+        def walk(sort, limit=3, **kwargs):
+            items, cursor = Database.page(sort, None, limit, **kwargs)
+            while cursor is not None:
+                page, cursor = Database.page(sort, cursor, limit, **kwargs)
+                items += page
+            return items
+
+        self.assertEqual([item["id"] for item in walk("id", 1)], [1, 2, 3, 4])
+        self.assertEqual(
+            [item["name"] for item in walk("name", fields=["name"])],
+            [None, "Hold Me", "Never Gonna Give You Up", "Together Forever"],
+        )
+        self.assertEqual(
+            [item["name"] for item in walk("-name", 1, fields=["name"])],
+            ["Together Forever", "Never Gonna Give You Up", "Hold Me", None],
+        )
+        self.assertEqual([item["id"] for item in walk("-date", 1)], [4, 2, 3, 1])
+        self.assertEqual(set(walk("name", 2, fields=["name"])[0]), {"id", "name"})
+
+        _, cursor = Database.page("name", None, 1)
+        with self.assertRaises(ValueError):
+            Database.page("artist", cursor)
+        with self.assertRaises(ValueError):
+            Database.page("name", None, 1, ["auth_password"])
+        # Malformed cursors are rejected like invalid ones
+        malformed = [5, ["date", 5, 1], ["date", "1987", "1"], "x"]
+        for value in malformed:
+            cursor = base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+            with self.assertRaises(ValueError):
+                Database.page("date", cursor)
+        with self.assertRaises(ValueError):
+            Database.page("date", "not base64!")
+        self.assertEqual([item["id"] for item in walk("date", 1)], [1, 3, 2, 4])
+
+    def testSearch(self):
+        rows = [
+            ("Never Gonna Give You Up", "Rick Astley", "Whenever You Need Somebody"),
+            ("Together Forever", "Rick Astley", "Whenever You Need Somebody"),
+            ("Hold Me in Your Arms", "Rick Astley", "Never Give Up"),
+        ]
+        for i, (name, artist, album) in enumerate(rows):
+            db.session.add(
+                Database(filepath=f"/music/{i}.mp3", name=name, artist=artist, album=album)
+            )
+        db.session.commit()
+
+        def search(query):
+            return [item.name for item in Database.search_records(query)]
+
+        self.assertEqual(search("rick forev"), ["Together Forever"])
+        # Matches in the name rank above matches in the album
+        self.assertEqual(
+            search("give"), ["Never Gonna Give You Up", "Hold Me in Your Arms"]
+        )
+        self.assertEqual(search("\"*"), [])
+
+        # Triggers keep the index in sync
+        item = Database.check_file("/music/1.mp3")
+        item.name = "Cry for Help"
+        db.session.commit()
+        self.assertEqual(search("forever"), [])
+        self.assertEqual(search("cry"), ["Cry for Help"])
+        db.session.delete(item)
+        db.session.commit()
+        self.assertEqual(search("cry"), [])
+
+        # Without the index, the search falls back to LIKE
+        db.session.execute(text("DROP TABLE database_fts"))
+        self.assertEqual(search("rick gonna"), ["Never Gonna Give You Up"])
+
+    def testBulk(self):
+        typeahead.build()
+        rows = [
+            {"filepath": f"/music/{i}.mp3", "name": name, "date": datetime(1987, 1, 1)}
+            for i, name in enumerate(["Never Gonna Give You Up", "Together Forever"])
+        ]
+        with mock.patch("metatube.database.sockets.overview") as overview:
+            inserted = Database.insert_many(rows)
+            self.assertEqual([row["id"] for row in inserted], [1, 2])
+            self.assertEqual(overview.call_count, 1)
+            self.assertEqual(overview.call_args[0][0]["data"][0]["date"], "1987-01-01")
+            self.assertEqual(typeahead.search("forever"), [2])
+
+            items = Database.fetch_items(["2", 3, 1])
+            self.assertEqual([item.id for item in items], [2, 1])
+
+            moved = Database.update_filepaths({"/music/0.mp3": "/moved/0.mp3"})
+            self.assertEqual(moved, [{"item": 1, "filepath": "/moved/0.mp3"}])
+            db.session.expire_all()
+            self.assertEqual(Database.fetch_item(1).filepath, "/moved/0.mp3")
+
+            overview.reset_mock()
+            deleted = Database.delete_many([1, 2, 3])
+            self.assertEqual([tuple(row) for row in deleted], [(1, "/moved/0.mp3"), (2, "/music/1.mp3")])
+            self.assertEqual(overview.call_count, 1)
+            self.assertEqual(overview.call_args[0][0]["items"], [1, 2])
+        self.assertEqual(Database.query.count(), 0)
+        self.assertEqual(typeahead.search("forever"), [])
+        typeahead.index = None
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,39 @@
+import unittest
+from unittest import mock
+
+import deezer
+
+from metatube.deezer import Deezer
+
+RESULT = {
+    "id": 781592622,
+    "title": "Never Gonna Give You Up",
+    "link": "https://www.deezer.com/track/781592622",
+    "duration": 213,
+    "artist": {"id": 1, "name": "Rick Astley", "type": "artist"},
+    "album": {
+        "id": 2,
+        "title": "Whenever You Need Somebody",
+        "cover_medium": "https://e-cdns-images.dzcdn.net/cover.jpg",
+        "type": "album",
+    },
+    "type": "track",
+}
+
+
+class TestDeezer(unittest.TestCase):
+    def testProject(self):
+        client = deezer.Client()
+        track = client._process_json(dict(RESULT))
+        with mock.patch.object(deezer.Client, "request") as request:
+            projected = Deezer.project(track)
+        # Fields missing from a search result don't fetch the track
+        request.assert_not_called()
+        self.assertEqual(projected["isrc"], "")
+        self.assertEqual(projected["artist"], {"name": "Rick Astley"})
+        self.assertEqual(projected["album"]["title"], "Whenever You Need Somebody")
+        self.assertEqual(projected["duration"], 213)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
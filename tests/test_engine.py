@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import gevent
+from sqlalchemy import create_engine, text
+
+from metatube import engine
+
+CONFIG = {
+    "DATABASE_BUSY_TIMEOUT": 200,
+    "DATABASE_MMAP_SIZE": 1024 * 1024,
+    "DATABASE_POOL_SIZE": 4,
+    "DATABASE_POOL_TIMEOUT": 5,
+    "DATABASE_POOL_RECYCLE": 600,
+}
+
+
+class TestEngine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.url = "sqlite:///" + os.path.join(self.directory, "test.db")
+        config = {**CONFIG, "SQLALCHEMY_DATABASE_URI": self.url}
+        self.engine = create_engine(self.url, **engine.engine_options(config))
+        self.lock = engine.install(self.engine, config)
+        with self.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.directory)
+
+    def testOptions(self):
+        options = engine.engine_options({**CONFIG, "SQLALCHEMY_DATABASE_URI": self.url})
+        self.assertEqual(options, {"pool_size": 4, "pool_timeout": 5})
+        memory = {**CONFIG, "SQLALCHEMY_DATABASE_URI": "sqlite://"}
+        self.assertEqual(engine.engine_options(memory), {})
+        server = {**CONFIG, "SQLALCHEMY_DATABASE_URI": "postgresql://db/metatube"}
+        self.assertTrue(engine.engine_options(server)["pool_pre_ping"])
+        self.assertEqual(engine.engine_options(server)["pool_recycle"], 600)
+
+    def testPragmas(self):
+        with self.engine.connect() as connection:
+            pragma = lambda name: connection.exec_driver_sql(  # noqa: E731
+                f"PRAGMA {name}"
+            ).scalar()
+            self.assertEqual(pragma("journal_mode"), "wal")
+            # NORMAL
+            self.assertEqual(pragma("synchronous"), 1)
+            self.assertEqual(pragma("busy_timeout"), 200)
+            self.assertEqual(pragma("mmap_size"), 1024 * 1024)
+
+    def testConcurrentWrites(self):
+        errors = []
+
+        def write():
+            for _ in range(5):
+                try:
+                    with self.engine.begin() as connection:
+                        connection.execute(text("INSERT INTO item DEFAULT VALUES"))
+                        # Other greenlets run while the transaction is open
+                        gevent.sleep(0.01)
+                        connection.execute(text("SELECT count(*) FROM item"))
+                except Exception as e:
+                    errors.append(e)
+
+        gevent.joinall([gevent.spawn(write) for _ in range(4)], raise_error=True)
+        self.assertEqual(errors, [])
+        with self.engine.connect() as connection:
+            count = connection.execute(text("SELECT count(*) FROM item")).scalar()
+        self.assertEqual(count, 20)
+
+    def testRelease(self):
+        # Rolled back and abandoned transactions don't keep other writers waiting
+        with self.assertRaises(RuntimeError):
+            with self.engine.begin() as connection:
+                connection.execute(text("INSERT INTO item DEFAULT VALUES"))
+                raise RuntimeError("roll back")
+        self.assertIsNone(self.lock.owner)
+        connection = self.engine.connect()
+        connection.execute(text("INSERT INTO item DEFAULT VALUES"))
+        self.assertIs(self.lock.owner, gevent.getcurrent())
+        connection.close()
+        self.assertIsNone(self.lock.owner)
+        self.assertEqual(self.lock.count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,45 @@
+import unittest
+from unittest import mock
+
+from metatube.fanout import CircuitBreaker, rank
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def testOpensAfterThreshold(self):
+        breaker = CircuitBreaker("test", 2, 60)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+    def testHalfOpenTrial(self):
+        breaker = CircuitBreaker("test", 1, 60)
+        with mock.patch("metatube.fanout.time.monotonic", return_value=100):
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+        with mock.patch("metatube.fanout.time.monotonic", return_value=161):
+            self.assertEqual(breaker.state, "half-open")
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, "open")
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+
+class TestRanking(unittest.TestCase):
+    def testRank(self):
+        candidates = [
+            {"title": "Together Forever", "artists": ["Rick Astley"]},
+            {"title": "Never Gonna Give You Up (Remastered)", "artists": ["Rick Astley"]},
+            {"title": "Never Gonna Give You Up", "artists": ["Someone Else"]},
+        ]
+        ranked = rank(candidates, "Never Gonna Give You Up", "Rick Astley")
+        self.assertEqual(ranked[0]["title"], "Never Gonna Give You Up (Remastered)")
+        self.assertEqual(ranked[0]["score"], 1.0)
+        self.assertEqual(ranked[-1]["title"], "Together Forever")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from mutagen.flac import FLAC
+
+import fixtags
+from tests.test_tagwriter import flac_header
+
+
+class TestFixTags(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.directory, "album", "disc 1"))
+        self.broken = self.create(
+            os.path.join("album", "disc 1", "broken.flac"),
+            artist=["Rick Astley; Pete Waterman"],
+            title=[" Never Gonna Give You Up "],
+            tracknumber=["03/12"],
+        )
+        self.clean = self.create(
+            "clean.flac",
+            artist=["Rick Astley"],
+            title=["Together Forever"],
+            tracknumber=["1"],
+        )
+        open(os.path.join(self.directory, "notes.txt"), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create(self, name, **tags):
+        filename = os.path.join(self.directory, name)
+        with open(filename, "wb") as file:
+            file.write(flac_header())
+        audio = FLAC(filename)
+        for key, values in tags.items():
+            audio[key] = values
+        audio.save()
+        return filename
+
+    def testPlan(self):
+        tags = {"artist": [" A; B"], "tracknumber": ["3.0"]}
+        changes = fixtags.plan(tags, list(fixtags.FIXES.values()))
+        self.assertEqual(changes, {"artist": ["A", "B"], "tracknumber": ["3"]})
+
+    def testDryRun(self):
+        before = os.stat(self.broken).st_mtime_ns
+        fixes = list(fixtags.FIXES.values())
+        report = fixtags.run([self.directory], fixes, dry_run=True)
+        counts = (report["scanned"], report["changed"], report["saved"])
+        self.assertEqual(counts, (2, 1, 0))
+        self.assertEqual(os.stat(self.broken).st_mtime_ns, before)
+        self.assertEqual(
+            report["files"][0]["changes"]["tracknumber"], [["03/12"], ["3/12"]]
+        )
+
+    def testFix(self):
+        clean = os.stat(self.clean).st_mtime_ns
+        fixes = list(fixtags.FIXES.values())
+        report = fixtags.run([self.directory], fixes, verbose=False)
+        self.assertEqual((report["changed"], report["saved"]), (1, 1))
+        audio = FLAC(self.broken)
+        self.assertEqual(audio["artist"], ["Rick Astley", "Pete Waterman"])
+        self.assertEqual(audio["title"], ["Never Gonna Give You Up"])
+        self.assertEqual(audio["tracknumber"], ["3/12"])
+        # Files that don't need fixing are never saved
+        self.assertEqual(os.stat(self.clean).st_mtime_ns, clean)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+
+import gevent
+from sqlalchemy.exc import OperationalError
+
+from metatube import create_app, db, logger
+from metatube import isrc
+from metatube.database import IsrcMapping
+from metatube.tasks import start_task
+from tests.test_database import TestConfig
+
+
+class TestIsrc(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def testClean(self):
+        self.assertEqual(isrc.clean("gb-arl-93-00135"), "GBARL9300135")
+        self.assertIsNone(isrc.clean("GBARL9300135GBARL9300136"))
+        self.assertIsNone(isrc.clean(""))
+
+    def testRemember(self):
+        isrc.remember("Spotify", {"GBARL9300135": "4cOdK2wGLETKBW3PvgPWqT", "": "x"})
+        isrc.remember("Deezer", {"GBARL9300135": 781592622})
+        row = IsrcMapping.fetch("GBARL9300135")
+        self.assertEqual(row.spotify_id, "4cOdK2wGLETKBW3PvgPWqT")
+        self.assertEqual(row.deezer_id, "781592622")
+        self.assertEqual(IsrcMapping.query.count(), 1)
+
+    def testRememberInBackground(self):
+        # Searches store their IDs from a background task
+        start_task(isrc.remember, "Deezer", {"GBARL9300135": 781592622}).join()
+        self.assertEqual(IsrcMapping.lookup("GBARL9300135", "Deezer"), "781592622")
+        with mock.patch.object(IsrcMapping, "record", side_effect=RuntimeError("x")):
+            with self.assertLogs(logger, "WARNING"):
+                isrc.remember("Spotify", {"GBARL9300135": "4cOdK2wGLETKBW3PvgPWqT"})
+
+    def testRememberWithoutContext(self):
+        # Storing is best effort, a greenlet without an application context only logs
+        with self.assertLogs(logger, "WARNING"):
+            gevent.spawn(isrc.remember, "Deezer", {"GBARL9300135": 781592622}).get()
+        self.assertIsNone(IsrcMapping.fetch("GBARL9300135"))
+
+    def testRememberRollsBack(self):
+        locked = OperationalError("COMMIT", {}, Exception("database is locked"))
+        with mock.patch.object(db.session, "commit", side_effect=locked):
+            with self.assertLogs(logger, "WARNING"):
+                isrc.remember("Deezer", {"GBARL9300135": 781592622})
+        # The failed row doesn't linger in the session
+        self.assertIsNone(IsrcMapping.lookup("GBARL9300135", "Deezer"))
+
+    def testResolve(self):
+        with mock.patch.object(isrc, "fetch_id", return_value=781592622) as fetch:
+            self.assertEqual(isrc.resolve("GBARL9300135", "Deezer"), "781592622")
+            self.assertEqual(isrc.resolve("GBARL9300135", "Deezer"), "781592622")
+        # The second call is answered from the mapping table
+        fetch.assert_called_once()
+
+        with mock.patch.object(isrc, "fetch_id", side_effect=Exception("404")):
+            self.assertIsNone(isrc.resolve("USRC17607839", "Deezer"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from mutagen.id3 import ID3
+
+from metatube import create_app, db
+from metatube import lyrics
+from metatube.cover import Cover
+from metatube.database import Lyrics
+from metatube.tagwriter import TagWriter
+from metatube.track import TrackMetadata
+from tests.test_database import TestConfig
+
+
+class TestLyrics(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "file.mp3")
+        open(self.filename, "wb").close()
+        self.track = TrackMetadata(
+            filename=self.filename,
+            extension="MP3",
+            title="Never Gonna Give You Up",
+            artists=["Rick Astley"],
+            source="Genius",
+            lyrics_id="84851",
+            cover=Cover("cover.png", b"\x89PNG\r\n\x1a\n", "image/png"),
+        )
+        TagWriter.write(self.track)
+
+    def tearDown(self):
+        lyrics.waiting.clear()
+        shutil.rmtree(self.directory)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def testWriteLater(self):
+        # The tags were written before the lyrics arrived, so the file waits for them
+        with mock.patch.object(lyrics, "prefetch") as prefetch:
+            lyrics.write_later(self.track)
+        prefetch.assert_called_once_with("84851")
+        self.assertEqual(len(lyrics.waiting["84851"]), 1)
+
+        genius = mock.MagicMock()
+        genius.fetch_song.return_value = {"song": {"url": "https://genius.com/x"}}
+        genius.fetch_lyrics.return_value = "We're no strangers to love"
+        with mock.patch.object(lyrics, "Genius", return_value=genius):
+            lyrics.fetch("84851", "token")
+
+        self.assertEqual(Lyrics.fetch("84851"), "We're no strangers to love")
+        self.assertNotIn("84851", lyrics.waiting)
+        tags = ID3(self.filename)
+        self.assertEqual(tags.getall("USLT")[0].text, "We're no strangers to love")
+        self.assertEqual(tags["TIT2"].text, ["Never Gonna Give You Up"])
+
+    def testCached(self):
+        Lyrics.store("84851", "You know the rules and so do I")
+        with mock.patch.object(lyrics, "prefetch") as prefetch:
+            lyrics.write_later(self.track)
+        prefetch.assert_not_called()
+        tags = ID3(self.filename)
+        self.assertEqual(tags.getall("USLT")[0].text, "You know the rules and so do I")
+
+    def testPrefetch(self):
+        genius = mock.patch.object(lyrics, "Genius").start().return_value
+        self.addCleanup(mock.patch.stopall)
+        genius.fetch_song.return_value = {"song": {"url": "https://genius.com/84851"}}
+        genius.fetch_lyrics.return_value = "Never gonna give you up"
+        # The lyrics are stored from a background task with its own context
+        lyrics.prefetch("84851", "token").join()
+        self.assertEqual(lyrics.cached("84851"), "Never gonna give you up")
+        self.assertIsNone(lyrics.prefetch("84851", "token"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,114 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+from zipfile import ZIP_STORED, ZipFile
+
+from metatube import create_app, db, media
+from metatube.database import Database
+from tests.test_database import TestConfig
+
+
+class TestMedia(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.directory = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.directory, "song.mp3")
+        with open(self.filepath, "wb") as file:
+            file.write(bytes(range(256)) * 4)
+        item = Database(
+            filepath=self.filepath,
+            name="Never Gonna Give You Up",
+            artist="Rick Astley",
+            album="Whenever You Need Somebody",
+            date=datetime(1987, 7, 27),
+            length=213,
+            cover="",
+        )
+        db.session.add(item)
+        db.session.commit()
+        self.id = item.id
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def url(self, download=False):
+        with self.app.test_request_context():
+            return media.sign(self.id, download)
+
+    def testStream(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1024)
+        self.assertEqual(response.headers["Accept-Ranges"], "bytes")
+        self.assertIsNotNone(response.headers.get("Last-Modified"))
+        etag = response.headers["ETag"]
+        response.close()
+
+        response = self.client.get(self.url(), headers={"Range": "bytes=256-511"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["Content-Range"], "bytes 256-511/1024")
+        self.assertEqual(response.data, bytes(range(256)))
+        response.close()
+
+        response = self.client.get(self.url(), headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        response.close()
+
+    def testDownload(self):
+        response = self.client.get(self.url(download=True))
+        disposition = response.headers["Content-Disposition"]
+        self.assertTrue(disposition.startswith("attachment"))
+        self.assertIn("Never Gonna Give You Up.mp3", disposition)
+        response.close()
+
+    def testInvalid(self):
+        url = self.url()
+        response = self.client.get(url.rsplit("/", 1)[0] + "/eyJpZCI6MX0.forged")
+        self.assertEqual(response.status_code, 403)
+        # Links stop working once they expire
+        with mock.patch("itsdangerous.timed.time.time", return_value=2**40):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+        os.remove(self.filepath)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def testArchive(self):
+        other = os.path.join(self.directory, "other")
+        os.makedirs(other)
+        filepath = os.path.join(other, "song.mp3")
+        with open(filepath, "wb") as file:
+            file.write(b"\xff" * 300 * 1024)
+        item = Database(filepath=filepath, name="Together Forever", cover="")
+        db.session.add(item)
+        db.session.commit()
+        with self.app.test_request_context():
+            url = media.sign_items([self.id, item.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/zip")
+        with ZipFile(io.BytesIO(response.data)) as archive:
+            self.assertEqual(archive.namelist(), ["song.mp3", "song (2).mp3"])
+            self.assertEqual(archive.read("song (2).mp3"), b"\xff" * 300 * 1024)
+            compression = {info.compress_type for info in archive.infolist()}
+            self.assertEqual(compression, {ZIP_STORED})
+        # The archive is never held in memory as a whole
+        chunks = list(media.zip_stream([filepath]))
+        self.assertLessEqual(max(len(chunk) for chunk in chunks), media.CHUNK_SIZE)
+        # An item URL can't be used for an archive
+        url = url.replace("/media/items/", "/media/")
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from mutagen.flac import FLAC
+
+from metatube import metadata
+from metatube.cache import LRUCache
+from metatube.metadata import MetaData
+from tests.test_tagwriter import flac_header
+
+
+class TestMetaData(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.flac = os.path.join(self.directory, "file.flac")
+        with open(self.flac, "wb") as file:
+            file.write(flac_header())
+        self.tag("Never Gonna Give You Up")
+        # An MP3 without any audio frames can't be read
+        self.mp3 = os.path.join(self.directory, "file.mp3")
+        open(self.mp3, "wb").close()
+        mock.patch.object(metadata, "tag_cache", LRUCache(16)).start()
+        self.parse = mock.patch.object(
+            MetaData, "parse_audio_metadata", wraps=MetaData.parse_audio_metadata
+        ).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        shutil.rmtree(self.directory)
+
+    def tag(self, title) -> None:
+        audio = FLAC(self.flac)
+        audio["title"] = title
+        # Without padding every change of the title changes the file size
+        audio.save(padding=lambda info: 0)
+
+    def testReadCached(self):
+        tags = MetaData.read_audio_metadata(self.flac)
+        self.assertEqual(tags["title"], "Never Gonna Give You Up")
+        # Callers get a copy they can change
+        tags["title"] = "Changed"
+        self.assertEqual(
+            MetaData.read_audio_metadata(self.flac)["title"], "Never Gonna Give You Up"
+        )
+        self.assertEqual(self.parse.call_count, 1)
+
+    def testSizeChange(self):
+        MetaData.read_audio_metadata(self.flac)
+        stat = os.stat(self.flac)
+        self.tag("Together Forever")
+        os.utime(self.flac, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertNotEqual(os.path.getsize(self.flac), stat.st_size)
+        self.assertEqual(
+            MetaData.read_audio_metadata(self.flac)["title"], "Together Forever"
+        )
+        self.assertEqual(self.parse.call_count, 2)
+
+    def testMtimeChange(self):
+        MetaData.read_audio_metadata(self.flac)
+        stat = os.stat(self.flac)
+        self.tag("Never Gonna Say Goodbye")
+        os.utime(self.flac, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        self.assertEqual(os.path.getsize(self.flac), stat.st_size)
+        self.assertEqual(
+            MetaData.read_audio_metadata(self.flac)["title"], "Never Gonna Say Goodbye"
+        )
+        self.assertEqual(self.parse.call_count, 2)
+
+    def testReadMetadataBatch(self):
+        missing = os.path.join(self.directory, "missing.flac")
+        filenames = [self.mp3, self.flac, missing]
+        tags = MetaData.read_metadata_batch(filenames, workers=2)
+        self.assertEqual(list(tags), filenames)
+        self.assertEqual(tags[self.flac]["title"], "Never Gonna Give You Up")
+        self.assertEqual(tags[self.flac]["filename"], self.flac)
+        # Unreadable and missing files are None instead of failing the batch
+        self.assertIsNone(tags[self.mp3])
+        self.assertIsNone(tags[missing])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
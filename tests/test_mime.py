@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from metatube import mime
+
+
+class TestMime(unittest.TestCase):
+    def testSniff(self):
+        self.assertEqual(mime.sniff(b"\x89PNG\r\n\x1a\n\x00\x00"), "image/png")
+        self.assertEqual(mime.sniff(b"\xff\xd8\xff\xe0\x00\x10JFIF"), "image/jpeg")
+        self.assertEqual(mime.sniff(b"ID3\x04\x00"), "audio/mpeg")
+        self.assertEqual(mime.sniff(b"\xff\xfb\x90\x64"), "audio/mpeg")
+        # ADTS AAC has the same frame sync as MPEG audio
+        self.assertEqual(mime.sniff(b"\xff\xf1\x50\x80"), "audio/aac")
+        self.assertEqual(mime.sniff(b"\xff\xf9\x50\x80"), "audio/aac")
+        self.assertIsNone(mime.sniff(b"\xff\xe1\x50\x80"))
+        self.assertEqual(mime.sniff(b"RIFF\x24\x00\x00\x00WAVEfmt "), "audio/x-wav")
+        self.assertEqual(mime.sniff(b"\x00\x00\x00\x20ftypM4A \x00"), "audio/x-m4a")
+        self.assertEqual(mime.sniff(b"\x00\x00\x00\x20ftypisom\x00"), "video/mp4")
+        self.assertIsNone(mime.sniff(b"plain text"))
+
+    def testFromFileIsCached(self):
+        with tempfile.NamedTemporaryFile(suffix=".flac", delete=False) as file:
+            file.write(b"fLaC" + b"\x00" * 60)
+        try:
+            self.assertEqual(mime.from_file(file.name), "audio/flac")
+            with mock.patch("builtins.open") as opener:
+                self.assertEqual(mime.from_file(file.name), "audio/flac")
+            opener.assert_not_called()
+        finally:
+            os.unlink(file.name)
+
+    def testFallsBackToLibmagic(self):
+        self.assertEqual(mime.from_buffer(b"just some text\n"), "text/plain")
+        self.assertIs(mime.libmagic(), mime.libmagic())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,160 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from mutagen.easyid3 import EasyID3
+
+from metatube import create_app, db
+from metatube import refresh
+from metatube.cover import DEFAULT_COVER, Cover
+from metatube.database import Database, IsrcMapping, RefreshJob
+from metatube.refresh import LibraryRefresh, TokenBucket
+from metatube.track import TrackMetadata
+from tests.test_database import TestConfig
+
+
+class TestTokenBucket(unittest.TestCase):
+    def testTake(self):
+        bucket = TokenBucket("Test", 50, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.take()
+        # Two tokens are available right away, the other two take 1/50th of a second each
+        self.assertGreaterEqual(time.monotonic() - start, 0.035)
+
+    def testParseRates(self):
+        self.assertEqual(
+            refresh.parse_rates("deezer:5;musicbrainz:1;spotify:x"),
+            {"Deezer": 5.0, "Musicbrainz": 1.0},
+        )
+
+
+class TestLibraryRefresh(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.directory = tempfile.mkdtemp()
+        for i, name in enumerate(["Never Gonna Give You Up", "Together Forever"]):
+            filepath = os.path.join(self.directory, f"{i}.mp3")
+            open(filepath, "wb").close()
+            db.session.add(
+                Database(
+                    filepath=filepath,
+                    name=name,
+                    artist="Rick Astley",
+                    album="Whenever You Need Somebody",
+                    date=datetime(1987, 11, 12),
+                    cover=DEFAULT_COVER,
+                    audio_id=str(781592622 + i),
+                    youtube_id=f"yt{i}",
+                )  # type: ignore
+            )
+        db.session.commit()
+        self.sockets = mock.patch("metatube.database.sockets").start()
+        mock.patch.object(refresh, "sockets").start()
+        mock.patch.dict(refresh.budgets, {"Deezer": TokenBucket("Deezer", 1000)}).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        shutil.rmtree(self.directory)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    @staticmethod
+    def lookup(source, filename, metadata_user, release_id, cover, *args):
+        changed = release_id == "781592623"
+        title = "Together 4ever" if changed else "Never Gonna Give You Up"
+        return TrackMetadata(
+            filename=filename,
+            title=title,
+            artists="Rick Astley",
+            album="Whenever You Need Somebody",
+            release_date="1987-11-12",
+            track_id=release_id,
+            cover=Cover(cover),
+        )
+
+    def testSourceOf(self):
+        # Numeric IDs are Deezer tracks or Genius songs
+        self.assertIsNone(LibraryRefresh.source_of("781592622"))
+        tags = {"deezer_trackid": "781592622"}
+        self.assertEqual(LibraryRefresh.source_of("781592622", None, tags), "Deezer")
+        self.assertEqual(LibraryRefresh.source_of("781592622", "Deezer"), "Deezer")
+        self.assertEqual(LibraryRefresh.source_of("781592622", "Genius"), "Genius")
+        self.assertEqual(LibraryRefresh.source_of("4cOdK2wGLETKBW3PvgPWqT"), "Spotify")
+        self.assertEqual(
+            LibraryRefresh.source_of("b1a9c0e9-d987-4042-ae91-78d6a3267d69"),
+            "Musicbrainz",
+        )
+        self.assertIsNone(LibraryRefresh.source_of(""))
+
+    def testRefresh(self):
+        with mock.patch.object(
+            refresh.MetaData, "from_source", side_effect=self.lookup
+        ) as lookup:
+            job = LibraryRefresh.refresh({"source": "Deezer"})
+        self.assertEqual(lookup.call_count, 2)
+        self.assertTrue(job.finished)
+        self.assertEqual((job.processed, job.changed, job.failed), (2, 1, 0))
+
+        # Only the item whose title changed was rewritten
+        changed = Database.check_trackid("781592623")
+        self.assertEqual(changed.name, "Together 4ever")
+        self.assertEqual(EasyID3(changed.filepath)["title"], ["Together 4ever"])
+        unchanged = Database.check_trackid("781592622")
+        self.assertEqual(os.path.getsize(unchanged.filepath), 0)
+        self.sockets.overview.assert_called_once()
+
+    @staticmethod
+    def deezer_track(_id):
+        _id = int(_id)
+        track = mock.Mock()
+        track.as_dict.return_value = {
+            "id": _id,
+            "title": "Together 4ever" if _id == 781592623 else "Never Gonna Give You Up",
+            "isrc": f"GBARL93{_id - 781592622:05d}",
+            "release_date": "1987-11-12",
+            "duration": 213,
+            "track_position": 1,
+            "album": {"id": 1, "title": "Whenever You Need Somebody"},
+            "contributors": [{"name": "Rick Astley", "type": "artist"}],
+        }
+        return track
+
+    def testRefreshFromDeezer(self):
+        # The lookups run in pool greenlets and store the ISRC of every track
+        with mock.patch("deezer.Client.get_track", side_effect=self.deezer_track):
+            job = LibraryRefresh.refresh({"source": "Deezer"})
+        self.assertEqual((job.processed, job.changed, job.failed), (2, 1, 0))
+        self.assertEqual(IsrcMapping.lookup("GBARL9300001", "Deezer"), "781592623")
+
+    def testResume(self):
+        filters = {"source": "Deezer", "album": "Whenever You Need Somebody"}
+        job = RefreshJob.start(LibraryRefresh(filters).filters)
+        job.checkpoint(Database.check_trackid("781592622").id, 1, 0, 0)
+        with mock.patch.object(
+            refresh.MetaData, "from_source", side_effect=self.lookup
+        ) as lookup:
+            resumed = LibraryRefresh.refresh(filters)
+        # The refresh continues after the checkpoint, with the same job
+        self.assertEqual(resumed.id, job.id)
+        self.assertEqual(lookup.call_count, 1)
+        self.assertEqual(resumed.processed, 2)
+
+    def testAllSources(self):
+        # Without a deezer_trackid tag a numeric ID could be a Genius song
+        with mock.patch.object(refresh.MetaData, "from_source") as lookup:
+            job = LibraryRefresh.refresh({})
+        lookup.assert_not_called()
+        self.assertEqual(job.processed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
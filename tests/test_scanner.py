@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from mutagen.flac import FLAC
+
+from metatube import create_app, db
+from metatube import scanner
+from metatube.database import Database, ScanIndex
+from metatube.scanner import Scanner
+from metatube.tasks import start_task
+from tests.test_database import TestConfig
+from tests.test_tagwriter import flac_header
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.directory, "Rick Astley"))
+        self.flac = os.path.join(self.directory, "Rick Astley", "song.flac")
+        with open(self.flac, "wb") as file:
+            file.write(flac_header())
+        self.tag(title="Never Gonna Give You Up", date="1987")
+        self.wav = os.path.join(self.directory, "Together Forever.wav")
+        open(self.wav, "wb").close()
+        open(os.path.join(self.directory, "cover.jpg"), "wb").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def tag(self, **tags):
+        audio = FLAC(self.flac)
+        audio.update(artist="Rick Astley", **tags)
+        audio.save()
+
+    def testScan(self):
+        result = Scanner.scan([self.directory])
+        self.assertEqual(result["scanned"], 2)
+        self.assertEqual(len(result["inserted"]), 2)
+        self.assertEqual(ScanIndex.query.count(), 2)
+        song = Database.check_file(self.flac)
+        self.assertEqual(song.name, "Never Gonna Give You Up")
+        self.assertEqual(song.date.year, 1987)
+        # Files without readable tags are named after the file
+        self.assertEqual(Database.check_file(self.wav).name, "Together Forever")
+
+    def testRescan(self):
+        Scanner.scan([self.directory])
+        # Nothing changed, so no tags are read
+        with mock.patch.object(scanner.MetaData, "read_metadata_batch") as read:
+            result = Scanner.scan([self.directory])
+        read.assert_not_called()
+        self.assertEqual(result["inserted"], [])
+
+        self.tag(title="Never Gonna Give You Up (Remastered)")
+        os.remove(self.wav)
+        result = Scanner.scan([self.directory])
+        self.assertEqual((len(result["inserted"]), result["updated"]), (0, 1))
+        # Nothing was inserted, the update and the index were committed anyway
+        db.session.rollback()
+        self.assertEqual(
+            Database.check_file(self.flac).name, "Never Gonna Give You Up (Remastered)"
+        )
+        self.assertEqual(list(ScanIndex.load()), [self.flac])
+
+    def testBackgroundImport(self):
+        # Background tasks don't inherit the context of the handler starting them
+        with mock.patch("metatube.scanner.sockets.overview") as overview:
+            task = start_task(Scanner.import_library, [self.directory])
+            task.join()
+        self.assertEqual(len(task.value["inserted"]), 2)
+        self.assertEqual(overview.call_args[0][0]["msg"], "scanned_library")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
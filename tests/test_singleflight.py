@@ -0,0 +1,47 @@
+import unittest
+
+import gevent
+
+from metatube.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def testCoalescesConcurrentCalls(self):
+        flight = SingleFlight("test")
+        executions = []
+
+        def fetch(key):
+            executions.append(key)
+            gevent.sleep(0.05)
+            return {"id": key}
+
+        jobs = [gevent.spawn(flight.do, "a", fetch, "a") for _ in range(5)]
+        jobs.append(gevent.spawn(flight.do, "b", fetch, "b"))
+        gevent.joinall(jobs)
+
+        self.assertEqual(sorted(executions), ["a", "b"])
+        self.assertTrue(all(job.value == {"id": "a"} for job in jobs[:5]))
+        self.assertEqual(
+            flight.stats(),
+            {"calls": 6, "executions": 2, "coalesced": 4, "in_flight": 0},
+        )
+
+    def testSharesExceptions(self):
+        flight = SingleFlight("test")
+
+        def fail():
+            gevent.sleep(0.05)
+            raise ValueError("provider down")
+
+        jobs = [gevent.spawn(flight.do, "a", fail) for _ in range(3)]
+        gevent.joinall(jobs)
+        self.assertTrue(all(isinstance(job.exception, ValueError) for job in jobs))
+        self.assertEqual(flight.stats()["executions"], 1)
+
+        # Nothing is cached after the call has finished
+        self.assertRaises(ValueError, flight.do, "a", fail)
+        self.assertEqual(flight.stats()["executions"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from mutagen.easyid3 import EasyID3
+from mutagen.flac import FLAC
+from mutagen.id3 import ID3
+
+from metatube.cover import Cover
+from metatube.metadata import MetaData
+from metatube.tagwriter import TagWriter
+from metatube.track import TrackMetadata
+
+
+def flac_header() -> bytes:
+    # A STREAMINFO block (44.1 kHz, stereo, 16 bit) without any audio frames
+    info = struct.pack(">HH", 4096, 4096) + b"\x00" * 6
+    info += ((44100 << 44) | (1 << 41) | (15 << 36)).to_bytes(8, "big")
+    info += b"\x00" * 16
+    return b"fLaC" + b"\x80" + len(info).to_bytes(3, "big") + info
+
+
+class TestTagWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.image = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+        self.track = TrackMetadata(
+            album="Whenever You Need Somebody",
+            artists=["Rick Astley"],
+            barcode="",
+            language="eng",
+            tracknr="1",
+            total_tracks="10",
+            title="Never Gonna Give You Up",
+            release_date="1987-11-12",
+            genres="Pop",
+            isrc="GBARL9300135",
+            source="Deezer",
+            track_id="781592622",
+            album_id="115068722",
+            cover=Cover("cover.png", self.image, "image/png"),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testMP3(self):
+        filename = os.path.join(self.directory, "file.mp3")
+        open(filename, "wb").close()
+        self.track.filename, self.track.extension = filename, "MP3"
+        self.assertTrue(TagWriter.write(self.track))
+
+        audio = EasyID3(filename)
+        self.assertEqual(audio["title"], ["Never Gonna Give You Up"])
+        self.assertEqual(audio["artist"], ["Rick Astley"])
+        self.assertEqual(audio["date"], ["1987-11-12"])
+        self.assertEqual(audio["isrc"], ["GBARL9300135"])
+        tags = ID3(filename)
+        self.assertEqual(tags["TXXX:deezer_trackid"].text, ["781592622"])
+        self.assertEqual(tags.getall("APIC")[0].data, self.image)
+
+        # Writing the same tags again reuses the padding instead of growing the file
+        size = os.path.getsize(filename)
+        TagWriter.write(self.track)
+        self.assertEqual(os.path.getsize(filename), size)
+
+    def testFLAC(self):
+        filename = os.path.join(self.directory, "file.flac")
+        with open(filename, "wb") as file:
+            file.write(flac_header())
+        self.track.filename, self.track.extension = filename, "FLAC"
+        TagWriter.write(self.track)
+        TagWriter.write(self.track)
+
+        audio = FLAC(filename)
+        self.assertEqual(audio["title"], ["Never Gonna Give You Up"])
+        self.assertEqual(audio["deezer_albumid"], ["115068722"])
+        self.assertEqual(len(audio.pictures), 1)
+        self.assertEqual(audio.pictures[0].data, self.image)
+
+    def testUnsupported(self):
+        self.track.filename, self.track.extension = "file.aac", "AAC"
+        self.assertFalse(TagWriter.write(self.track))
+
+    def testMergeReleasesCover(self):
+        # The cover bytes are dropped even when writing the file fails
+        with mock.patch.object(TagWriter, "write", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                MetaData.merge(self.track)
+        self.assertIsNone(self.track.cover._data)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
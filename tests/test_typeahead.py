@@ -0,0 +1,73 @@
+import unittest
+
+from metatube import create_app, db, typeahead
+from metatube.database import Database
+from metatube.typeahead import PrefixIndex
+from tests.test_database import TestConfig
+
+
+class TestTypeahead(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        typeahead.index = None
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def testTokenize(self):
+        self.assertEqual(typeahead.tokenize("Beyoncé - Déjà Vu"), ["beyonce", "deja", "vu"])
+        self.assertEqual(typeahead.tokenize(None), [])
+
+    def testPrefixIndex(self):
+        index = PrefixIndex()
+        index.load(
+            [
+                (1, "Never Gonna Give You Up", "Rick Astley", "Whenever You Need Somebody"),
+                (2, "Hold Me in Your Arms", "Rick Astley", "Never Give Up"),
+            ]
+        )
+        index.add(3, "Nevermind", "Nirvana", "Nevermind")
+        # Names outweigh albums, whole words outweigh prefixes
+        self.assertEqual(index.search("never"), [1, 3, 2])
+        self.assertEqual(index.search("rick give"), [1, 2])
+        self.assertEqual(index.search("never", limit=1), [1])
+        self.assertEqual(index.search("!"), [])
+
+        index.add(3, "Smells Like Teen Spirit", "Nirvana", "Nevermind")
+        self.assertEqual(index.search("smells"), [3])
+        index.remove(3)
+        self.assertEqual(index.search("nirv"), [])
+        self.assertNotIn("nirvana", index.words)
+
+    def testSync(self):
+        self.assertIsNone(typeahead.search("never"))
+        item = Database(filepath="/music/1.mp3", name="Never Gonna Give You Up")
+        db.session.add(item)
+        db.session.commit()
+        typeahead.build()
+        self.assertEqual(typeahead.search("never"), [item.id])
+
+        item.name = "Together Forever"
+        db.session.commit()
+        self.assertEqual(typeahead.search("never"), [])
+        self.assertEqual(typeahead.search("forever"), [item.id])
+
+        # Changes that are rolled back never reach the index
+        item.name = "Cry for Help"
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual(typeahead.search("cry"), [])
+
+        db.session.delete(item)
+        db.session.commit()
+        self.assertEqual(typeahead.search("forever"), [])
+        self.assertEqual(len(typeahead.index), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
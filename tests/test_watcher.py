@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import gevent
+
+from metatube import create_app, db
+from metatube import watcher
+from metatube.database import Database
+from metatube.watcher import Watcher
+from tests.test_database import TestConfig
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.directory = os.path.realpath(tempfile.mkdtemp())
+        os.makedirs(os.path.join(self.directory, "album"))
+        self.song = os.path.join(self.directory, "album", "song.mp3")
+        open(self.song, "wb").close()
+        db.session.add(Database(filepath=self.song, name="Song"))  # type: ignore
+        db.session.commit()
+        self.sockets = mock.patch("metatube.database.sockets").start()
+        mock.patch.object(watcher.env, "WATCH_FLUSH_INTERVAL", 0.05).start()
+        mock.patch.object(watcher.env, "WATCH_POLL_INTERVAL", 0.05).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        shutil.rmtree(self.directory)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def wait_for(self, condition):
+        for _ in range(100):
+            if condition():
+                return True
+            gevent.sleep(0.02)
+        return False
+
+    def filepath(self):
+        # The watcher commits from its own application context and session
+        db.session.expire_all()
+        return Database.query.one().filepath
+
+    def check_sync(self, polling):
+        files = Watcher([self.directory])
+        files.start(polling=polling)
+        try:
+            self.assertEqual(files.inotify is None, polling)
+            self.assertTrue(files.path_exists(self.song))
+
+            # Moving the directory moves the item along with it
+            moved = os.path.join(self.directory, "moved")
+            os.rename(os.path.join(self.directory, "album"), moved)
+            new = os.path.join(moved, "song.mp3")
+            self.assertTrue(self.wait_for(lambda: self.filepath() == new))
+            self.assertFalse(files.path_exists(self.song))
+            self.assertTrue(files.path_exists(new))
+            self.sockets.overview.assert_called_once()
+
+            os.remove(new)
+            self.assertTrue(self.wait_for(lambda: not files.path_exists(new)))
+        finally:
+            files.stop()
+
+    def testInotify(self):
+        self.check_sync(polling=False)
+
+    def testPolling(self):
+        self.check_sync(polling=True)
+
+    def testOutermost(self):
+        self.assertEqual(
+            watcher.outermost(["/music/a", "/music", "/musical", "", "/music/"]),
+            ["/music", "/musical"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)